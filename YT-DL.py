@@ -1,12 +1,18 @@
+import concurrent.futures
+import contextlib
+import gc
 import json
+import multiprocessing
 import os
 import platform
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
-from typing import Optional
+from typing import List, Optional
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 import yt_dlp
@@ -17,11 +23,39 @@ except Exception:
     qdarkstyle = None
 
 from language import texts
+import api_server
+import audio_filters
+import cassette
+import clips
+import encoding
+import extractor_cache
+import job_store
+import media_cache
+import naming
+import process_pool
+import progress_model
+import route_pool
+import scheduler
+import stream_encode
+import telemetry
+import thumbnails
+import transcode
 import utils
+import verify
 
 
 SETTINGS_FILE = os.path.join(os.path.expanduser("~"), ".brejax_settings.json")
+CACHE_DIR = os.path.join(os.path.dirname(SETTINGS_FILE), ".brejax_cache")
 SETTINGS_RECOVERED = False
+SETTINGS_SAVE_DELAY = 1.0
+TRANSFER_RENDER_INTERVAL_MS = 250
+# yt-dlp reports every chunk; samples closer together than this are dropped before they reach the UI
+TRANSFER_EMIT_INTERVAL = 0.1
+JOB_PROGRESS_INTERVAL = 0.25
+FINISHED_JOBS_KEPT = 200
+VERIFY_RETRIES = 1
+# stream URLs that expire sooner than this are resolved again before their download starts
+STREAM_EXPIRY_MARGIN = 600
 
 APP_VERSION = "1.7.0"
 APP_DEVELOPER = "Rico"
@@ -58,12 +92,70 @@ SETTINGS_DEFAULTS = {
     "save_thumbnail": True,
     "auto_open": False,
     "resolution": "Auto (best)",
+    "stream_playlist": False,
+    "encoding_preset": "balanced",
+    "encoder_threads": 0,
+    "extra_formats": [],
+    "media_cache": False,
+    "media_cache_dir": "",
+    "media_cache_max_mb": 2048,
+    "thumbnail_max_size": 1280,
+    "name_template": naming.DEFAULT_TEMPLATE,
+    "max_concurrent_jobs": 1,
+    "preemption": False,
+    "api_enabled": False,
+    "api_port": 8765,
+    "api_token": "",
+    "api_max_queue": 100,
+    "process_workers": False,
+    "memory_budget": False,
+    "log_max_lines": 5000,
+    "verify_outputs": "fast",
+    "loudnorm": False,
+    "loudnorm_target": audio_filters.DEFAULT_LOUDNESS,
+    "trim_silence": False,
+    "sample_rate": 0,
+    "transcode_workers": 0,
+    "clip_precise": False,
+    "match_source_bitrate": True,
+    "extractor_cache": True,
+    "extractor_cache_max_mb": 64,
+    "extractor_cache_warmup": False,
+    "pipe_encode": False,
+    "scratch_dir": "",
+    "cassette_mode": "off",
+    "cassette_dir": "",
+    "shared_store": "",
+    "shared_store_lease": 60,
+    "shared_store_wal": True,
+    "routes": [],
+    "route_strategy": "least-loaded",
+    "route_scope": "job",
+    "route_min_speed_kb": 0,
+    "route_cooldown": 120,
+    "route_probe_url": route_pool.DEFAULT_PROBE_URL,
 }
 
 
+ANSI_ESCAPE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
+
+
 def strip_ansi_codes(text: str) -> str:
-    ansi_escape = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
-    return ansi_escape.sub("", str(text))
+    return ANSI_ESCAPE.sub("", str(text))
+
+
+def format_transfer(title: str, downloaded: float, total: float, speed: float, eta: float) -> str:
+    """Render one structured progress sample as a status line."""
+    parts = []
+    if title:
+        parts.append(f"Downloading: {title}")
+    if total:
+        parts.append(f"{min(100.0, downloaded * 100.0 / total):.1f}%")
+    if speed:
+        parts.append(f"@ {utils.format_bytes(speed)}/s")
+    if eta:
+        parts.append(f"ETA {utils.format_duration(eta)}")
+    return " | ".join(parts)
 
 
 def load_settings() -> dict:
@@ -100,10 +192,108 @@ def load_settings() -> dict:
         merged["format"] = SETTINGS_DEFAULTS["format"]
     if merged.get("resolution") not in RESOLUTION_OPTIONS:
         merged["resolution"] = SETTINGS_DEFAULTS["resolution"]
+    if merged.get("encoding_preset") not in encoding.ENCODING_PRESETS:
+        merged["encoding_preset"] = SETTINGS_DEFAULTS["encoding_preset"]
+    if merged.get("verify_outputs") not in verify.VERIFY_MODES:
+        merged["verify_outputs"] = SETTINGS_DEFAULTS["verify_outputs"]
+    if merged.get("cassette_mode") not in cassette.CASSETTE_MODES:
+        merged["cassette_mode"] = SETTINGS_DEFAULTS["cassette_mode"]
+    if merged.get("route_strategy") not in route_pool.ROUTE_STRATEGIES:
+        merged["route_strategy"] = SETTINGS_DEFAULTS["route_strategy"]
+    if merged.get("route_scope") not in route_pool.ROUTE_SCOPES:
+        merged["route_scope"] = SETTINGS_DEFAULTS["route_scope"]
+    try:
+        merged["encoder_threads"] = max(0, int(merged.get("encoder_threads") or 0))
+    except Exception:
+        merged["encoder_threads"] = SETTINGS_DEFAULTS["encoder_threads"]
+    extra_formats = merged.get("extra_formats")
+    if not isinstance(extra_formats, list):
+        extra_formats = []
+    merged["extra_formats"] = [item for item in extra_formats if item in FORMAT_OPTIONS]
+    routes = merged.get("routes")
+    if not isinstance(routes, list):
+        routes = []
+    merged["routes"] = [item.strip() for item in routes if route_pool.valid_route(item)]
     if not os.path.isdir(str(merged.get("last_folder", ""))):
         merged["last_folder"] = SETTINGS_DEFAULTS["last_folder"]
 
-    for key in ("playlist", "embed_metadata", "save_thumbnail", "auto_open"):
+    try:
+        merged["media_cache_max_mb"] = max(0, int(merged.get("media_cache_max_mb") or 0))
+    except Exception:
+        merged["media_cache_max_mb"] = SETTINGS_DEFAULTS["media_cache_max_mb"]
+    try:
+        merged["max_concurrent_jobs"] = max(1, int(merged.get("max_concurrent_jobs") or 1))
+    except Exception:
+        merged["max_concurrent_jobs"] = SETTINGS_DEFAULTS["max_concurrent_jobs"]
+    try:
+        merged["thumbnail_max_size"] = max(0, int(merged.get("thumbnail_max_size") or 0))
+    except Exception:
+        merged["thumbnail_max_size"] = SETTINGS_DEFAULTS["thumbnail_max_size"]
+    try:
+        merged["api_port"] = int(merged.get("api_port"))
+        if not 0 < merged["api_port"] < 65536:
+            raise ValueError("Port out of range.")
+    except Exception:
+        merged["api_port"] = SETTINGS_DEFAULTS["api_port"]
+    try:
+        merged["api_max_queue"] = max(1, int(merged.get("api_max_queue") or 1))
+    except Exception:
+        merged["api_max_queue"] = SETTINGS_DEFAULTS["api_max_queue"]
+    try:
+        merged["log_max_lines"] = max(0, int(merged.get("log_max_lines") or 0))
+    except Exception:
+        merged["log_max_lines"] = SETTINGS_DEFAULTS["log_max_lines"]
+    try:
+        merged["loudnorm_target"] = min(-5.0, max(-70.0, float(merged.get("loudnorm_target"))))
+    except Exception:
+        merged["loudnorm_target"] = SETTINGS_DEFAULTS["loudnorm_target"]
+    try:
+        merged["shared_store_lease"] = max(5, int(merged.get("shared_store_lease") or 0))
+    except Exception:
+        merged["shared_store_lease"] = SETTINGS_DEFAULTS["shared_store_lease"]
+    try:
+        merged["route_cooldown"] = max(1, int(merged.get("route_cooldown") or 0))
+    except Exception:
+        merged["route_cooldown"] = SETTINGS_DEFAULTS["route_cooldown"]
+    for key in ("sample_rate", "transcode_workers", "extractor_cache_max_mb", "route_min_speed_kb"):
+        try:
+            merged[key] = max(0, int(merged.get(key) or 0))
+        except Exception:
+            merged[key] = SETTINGS_DEFAULTS[key]
+    for key in (
+        "media_cache_dir",
+        "name_template",
+        "api_token",
+        "scratch_dir",
+        "cassette_dir",
+        "shared_store",
+        "route_probe_url",
+    ):
+        if not isinstance(merged.get(key), str):
+            merged[key] = SETTINGS_DEFAULTS[key]
+    if not merged["name_template"].strip():
+        merged["name_template"] = SETTINGS_DEFAULTS["name_template"]
+
+    for key in (
+        "playlist",
+        "embed_metadata",
+        "save_thumbnail",
+        "auto_open",
+        "stream_playlist",
+        "media_cache",
+        "preemption",
+        "api_enabled",
+        "process_workers",
+        "memory_budget",
+        "loudnorm",
+        "trim_silence",
+        "clip_precise",
+        "match_source_bitrate",
+        "extractor_cache",
+        "extractor_cache_warmup",
+        "pipe_encode",
+        "shared_store_wal",
+    ):
         merged[key] = bool(merged.get(key))
 
     return merged
@@ -136,11 +326,100 @@ def save_settings(data: dict) -> None:
         pass
 
 
+class SettingsStore:
+    """In-memory settings that are written to disk by a background thread.
+
+    Updates are merged into the pending state and written with save_settings
+    once no further change arrived for SETTINGS_SAVE_DELAY seconds, so bursts
+    of changes (e.g. one per queued job) cost a single file write.
+    """
+
+    def __init__(self, data: dict, delay: float = SETTINGS_SAVE_DELAY):
+        self._data = dict(data)
+        self._delay = delay
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._deadline = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="settings-writer", daemon=True)
+        self._thread.start()
+
+    def get(self, key: str, default=None):
+        with self._cond:
+            return self._data.get(key, default)
+
+    def __getitem__(self, key: str):
+        with self._cond:
+            return self._data[key]
+
+    def __setitem__(self, key: str, value) -> None:
+        self.update({key: value})
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return dict(self._data)
+
+    def update(self, changes: dict) -> None:
+        with self._cond:
+            self._data.update(changes)
+            self._dirty = True
+            self._deadline = time.monotonic() + self._delay
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Write pending changes now, on the calling thread."""
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                data = dict(self._data)
+            save_settings(data)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=2)
+        self.flush()
+
+    def _writer(self) -> None:
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    # more changes may arrive; wait for the debounce window to pass
+                    self._cond.wait(remaining)
+                    continue
+            self.flush()
+
+
+class BrejaxHookPP(yt_dlp.postprocessor.PostProcessor):
+    """Run a worker callback as a step of the yt-dlp postprocessor chain."""
+
+    def __init__(self, callback, downloader=None):
+        super().__init__(downloader)
+        self._callback = callback
+
+    def run(self, info):
+        return self._callback(info)
+
+
 class BrejaxWorker(QtCore.QObject):
     progress = QtCore.pyqtSignal(str)
     progress_value = QtCore.pyqtSignal(int)
+    # title, downloaded bytes, total bytes, speed (bytes/s), eta (s); 0 = unknown
+    transfer = QtCore.pyqtSignal(str, float, float, float, float)
+    # progress_model.JobProgress.snapshot() of the whole job
+    job_progress = QtCore.pyqtSignal(dict)
     finished = QtCore.pyqtSignal()
     error = QtCore.pyqtSignal(str)
+    stats = QtCore.pyqtSignal(dict)
 
     def __init__(
         self,
@@ -155,10 +434,36 @@ class BrejaxWorker(QtCore.QObject):
         resolution_label: str = "Auto (best)",
         ffmpeg_path: Optional[str] = None,
         lang: str = "en",
+        stream_playlist: bool = False,
+        encoding_preset: str = "balanced",
+        encoder_threads: int = 1,
+        output_formats: Optional[List[str]] = None,
+        media_cache: Optional[media_cache.MediaCache] = None,
+        thumbnail_cache: Optional[thumbnails.ThumbnailCache] = None,
+        name_template: str = naming.DEFAULT_TEMPLATE,
+        resume_state: Optional[dict] = None,
+        memory_budget: bool = False,
+        verify_outputs: str = "off",
+        audio_filter: str = "",
+        trim_silence: bool = False,
+        transcode_workers: int = 0,
+        clip: str = "",
+        clip_precise: bool = False,
+        match_source_bitrate: bool = False,
+        cachedir: Optional[str] = None,
+        pipe_encode: bool = False,
+        scratch_dir: str = "",
+        cassette_mode: str = "off",
+        cassette_dir: str = "",
+        route_pool: Optional[route_pool.RoutePool] = None,
+        route_hint: str = "",
     ):
         super().__init__()
         self.url = url
         self.out_folder = out_folder
+        self.scratch_dir = scratch_dir or ""
+        # where downloads and conversions happen; finished files are published to out_folder
+        self.work_folder = out_folder
         self.quality = quality
         self.playlist = playlist
         self.format_type = format_type
@@ -167,7 +472,63 @@ class BrejaxWorker(QtCore.QObject):
         self.resolution_label = resolution_label
         self.ffmpeg_path = ffmpeg_path
         self.lang = lang
+        self.stream_playlist = stream_playlist
+        self.encoding_preset = encoding.normalize_preset(encoding_preset)
+        self.encoder_threads = max(1, int(encoder_threads or 1))
+        self.output_formats = []
+        for item in [format_type] + list(output_formats or []):
+            item = (item or "").lower().strip()
+            if item in transcode.OUTPUT_TARGETS and item not in self.output_formats:
+                self.output_formats.append(item)
+        self.source_target: Optional[str] = None
+        self.media_cache = media_cache
+        self._cache_pending = {}
+        self.cassette_mode = cassette_mode if cassette_mode in cassette.CASSETTE_MODES else "off"
+        self.cassette_dir = cassette_dir
+        # artwork from the disk cache would skip requests the cassette has (or needs)
+        self.thumbnail_cache = thumbnail_cache if self.cassette_mode == "off" else None
+        self._thumbnail_jobs = {}
+        self.name_template = name_template or naming.DEFAULT_TEMPLATE
+        self.namer = naming.get_namer(out_folder)
+        # shared with later runs of the same job (e.g. after preemption)
+        self.resume_state = resume_state if resume_state is not None else {}
+        self.resume_state.setdefault("names", {})
+        self.resume_state.setdefault("completed", [])
+        self.resume_state.setdefault("bytes_saved", 0.0)
+        self.memory_budget = memory_budget
+        self.telemetry: Optional[telemetry.JobTelemetry] = None
+        self.verify_outputs = verify_outputs if verify_outputs in verify.VERIFY_MODES else "off"
+        self.verifier: Optional[verify.Verifier] = None
+        self._verifications = []
+        self.audio_filter = audio_filter or ""
+        self.trim_silence = trim_silence
+        self.transcode_workers = max(0, int(transcode_workers or 0))
+        self._transcodes = []
+        # set when the job stops, so ffmpeg runs still working on its entries are killed
+        self._transcode_cancel = threading.Event()
+        self.clip_ranges, self.clip_chapters = clips.parse_clip(clip)
+        self.clip_precise = clip_precise
+        self.match_source_bitrate = match_source_bitrate
+        self.source_matched = False
+        self.cachedir = cachedir
+        self.pipe_encode = pipe_encode
+        # output target encoded straight from the download pipe, None when the normal path is used
+        self.stream_target: Optional[str] = None
+        self.cache_counters = extractor_cache.CacheCounters()
+        self.route_pool = route_pool
+        # route chosen by the parent process for process workers
+        self.route_hint = route_hint
+        # route_pool.Route of this run
+        self.route = None
+        # bytes, seconds and throttles per route spec, measured for this job
+        self.route_usage = {}
+        self.progress_model = progress_model.JobProgress()
+        self._progress_emitted = 0.0
+        self._transfer_emitted = 0.0
+        self._download_finished_at = 0.0
+        self.multi_output = False
         self._is_running = True
+        self._pause_requested = False
 
     def t(self, key: str, fallback: str = "") -> str:
         return texts.get(self.lang, texts["en"]).get(key, fallback or key)
@@ -175,25 +536,177 @@ class BrejaxWorker(QtCore.QObject):
     def stop(self) -> None:
         self._is_running = False
 
+    def pause(self) -> None:
+        self._pause_requested = True
+
+    def check_interrupt(self) -> None:
+        if not self._is_running:
+            raise yt_dlp.utils.DownloadError("Download stopped by user")
+        if self._pause_requested:
+            raise yt_dlp.utils.DownloadError("Download paused by user")
+
+    def format_label(self) -> str:
+        return " + ".join(item.upper() for item in self.output_formats) or self.format_type.upper()
+
     def run(self) -> None:
-        outtmpl = os.path.join(self.out_folder, "%(title)s.%(ext)s")
+        self.telemetry = telemetry.JobTelemetry()
+        try:
+            self.execute()
+        finally:
+            if self.verifier is not None:
+                self.verifier.shutdown()
+            if not self.resume_state.get("paused"):
+                self.remove_scratch()
+            if self.route_pool is not None:
+                self.route_pool.release(self.route)
+                self.route = None
+            if self.memory_budget:
+                gc.collect()
+            stats = self.telemetry.finish()
+            stats["bytes_saved"] = int(self.resume_state.get("bytes_saved") or 0)
+            stats.update(self.cache_counters.as_dict())
+            if self.route_usage:
+                stats["routes"] = self.route_usage
+            self.stats.emit(stats)
+
+    @property
+    def clipping(self) -> bool:
+        return bool(self.clip_ranges or self.clip_chapters)
+
+    def prepare_scratch(self) -> str:
+        if not self.scratch_dir:
+            return self.out_folder
+        work = self.resume_state.get("scratch")
+        if work and os.path.isdir(work):
+            # a paused job continues from the .part files it left there
+            return work
+        try:
+            os.makedirs(self.scratch_dir, exist_ok=True)
+            work = tempfile.mkdtemp(prefix="job-", dir=self.scratch_dir)
+        except OSError as exc:
+            self.progress.emit(self.t("scratch_unavailable").format(error=exc))
+            return self.out_folder
+        self.resume_state["scratch"] = work
+        return work
+
+    def remove_scratch(self) -> None:
+        work = self.resume_state.pop("scratch", None)
+        if work:
+            shutil.rmtree(work, ignore_errors=True)
+
+    def publish(self, path: str) -> str:
+        """Move a finished file from the scratch folder to the same relative place in out_folder."""
+        if not path or self.work_folder == self.out_folder:
+            return path
+        relative = os.path.relpath(path, self.work_folder)
+        if relative.startswith(os.pardir) or not os.path.exists(path):
+            return path
+        target = relative
+        stem, ext = os.path.splitext(relative)
+        renamed = None
+        try:
+            while True:
+                try:
+                    published = utils.publish_file(path, os.path.join(self.out_folder, target))
+                    break
+                except FileExistsError:
+                    # another instance wrote this name without a claim we could see; take the next free one
+                    if renamed is not None:
+                        self.namer.release_claim(renamed)
+                    renamed = self.namer.reserve(stem, rescan=True)
+                    target = renamed + ext
+        finally:
+            if renamed is not None:
+                self.namer.release_claim(renamed)
+        if renamed is not None:
+            self.progress.emit(self.t("name_taken").format(name=relative, renamed=target))
+        return published
+
+    def publish_outputs(self, info: dict):
+        for path in list(info.get("__files_to_move") or {}):
+            self.publish(path)
+        # already in place; yt-dlp's own move step has nothing left to do
+        info["__files_to_move"] = {}
+        if info.get("filepath"):
+            info["filepath"] = self.publish(info["filepath"])
+            # the move step runs next and would otherwise move the file back to the folder it was downloaded to
+            info["__finaldir"] = os.path.dirname(info["filepath"])
+        return [], info
+
+    def space_available(self, needed: float) -> bool:
+        folders = [self.out_folder]
+        if self.work_folder != self.out_folder and not utils.same_filesystem(self.work_folder, self.out_folder):
+            # sources and intermediates live in scratch, finished files in out_folder
+            folders.append(self.work_folder)
+        for folder in folders:
+            free_space = utils.bytes_free(folder)
+            if free_space and needed > free_space * 0.95:
+                return False
+        return True
+
+    def execute(self) -> None:
+        self.work_folder = self.prepare_scratch()
+        outtmpl = os.path.join(self.work_folder, "%(title)s" + self.section_suffix() + ".%(ext)s")
         options = {
-            "outtmpl": outtmpl,
+            "outtmpl": {"default": outtmpl},
             "quiet": True,
             "noplaylist": not self.playlist,
             "progress_hooks": [self.progress_hook],
             "no_warnings": True,
-            "writethumbnail": bool(self.save_thumbnail),
         }
+        use_thumbnail_cache = bool(self.save_thumbnail) and self.thumbnail_cache is not None
+        # the thumbnail cache fetches artwork itself, in parallel with the download
+        options["writethumbnail"] = bool(self.save_thumbnail) and not use_thumbnail_cache
 
         format_choice = (self.format_type or "").lower().strip()
         postprocessors = []
         need_ffmpeg_for_merge = False
+        audio_codec = None
+        # audio processing runs inside the single transcode pass, so it implies the multi-output path
+        processed = bool(self.audio_filter or self.trim_silence) and any(
+            transcode.OUTPUT_TARGETS[item]["codec"] and not transcode.OUTPUT_TARGETS[item].get("video")
+            for item in self.output_formats
+        )
+        multi_output = len(self.output_formats) > 1 or processed
+        self.multi_output = multi_output
+        self.source_target = None
+        # lossy audio outputs gain nothing from a source above their bitrate
+        self.source_matched = self.match_source_bitrate and all(
+            transcode.OUTPUT_TARGETS[item]["bitrate"] and not transcode.OUTPUT_TARGETS[item].get("video")
+            for item in self.output_formats
+        ) and bool(self.output_formats)
+        audio_source = (
+            utils.get_audio_source_format(self.quality) if self.source_matched else "bestaudio/best"
+        )
+        if self.source_matched:
+            options["format_sort"] = utils.get_audio_source_sort(self.quality)
 
         if self.ffmpeg_path:
             options["ffmpeg_location"] = self.ffmpeg_path
-
-        if format_choice == "mp4":
+        if self.cachedir:
+            options["cachedir"] = self.cachedir
+        if self.cassette_mode != "off":
+            # a warm extractor cache would skip requests the cassette has (or needs)
+            options["cachedir"] = False
+        if self.route_pool is not None and self.cassette_mode in ("off", "record"):
+            # a replay is answered by a local server, which no route can reach
+            self.route = self.route_pool.acquire(prefer=self.route_hint)
+            if self.route is not None:
+                options.update(self.route.ydl_options())
+                self.progress.emit(self.t("route_assigned").format(route=self.route.spec))
+
+        if multi_output:
+            # download one source and derive every output from it after the download
+            if "mp4" in self.output_formats:
+                options["format"] = utils.get_video_format(self.resolution_label)
+                options["merge_output_format"] = "mp4"
+                self.source_target = "mp4"
+            else:
+                options["format"] = audio_source
+                if "best audio (no convert)" in self.output_formats:
+                    self.source_target = "best audio (no convert)"
+            need_ffmpeg_for_merge = True
+        elif format_choice == "mp4":
             options["format"] = utils.get_video_format(self.resolution_label)
             options["merge_output_format"] = "mp4"
             need_ffmpeg_for_merge = True
@@ -208,35 +721,110 @@ class BrejaxWorker(QtCore.QObject):
                 "alac": "alac",
                 "ogg": "vorbis",
             }
-            options["format"] = "bestaudio/best"
+            options["format"] = audio_source
+            audio_codec = codec_map.get(format_choice, "mp3")
             postprocessors.append(
                 {
                     "key": "FFmpegExtractAudio",
-                    "preferredcodec": codec_map.get(format_choice, "mp3"),
+                    "preferredcodec": audio_codec,
                     "preferredquality": str(self.quality),
                 }
             )
         else:
             options["format"] = "bestaudio/best"
 
+        self.stream_target = None
+        if (
+            self.pipe_encode
+            and audio_codec is not None
+            and not self.clipping
+            and self.media_cache is None
+            and (not self.save_thumbnail or use_thumbnail_cache)
+        ):
+            # single-stream sources skip the full source file; the extract step stays as the fallback
+            self.stream_target = format_choice
+
         if self.embed_metadata:
             postprocessors.append({"key": "FFmpegMetadata"})
 
-        if self.save_thumbnail and format_choice != "mp4":
+        embed_thumbnail = self.save_thumbnail and format_choice != "mp4" and not multi_output
+        if embed_thumbnail and not use_thumbnail_cache:
             postprocessors.append({"key": "EmbedThumbnail"})
 
         if postprocessors:
             options["postprocessors"] = postprocessors
 
+        if postprocessors or need_ffmpeg_for_merge:
+            options["postprocessor_args"] = encoding.postprocessor_args(
+                audio_codec,
+                self.encoding_preset,
+                self.encoder_threads,
+            )
+
+        if self.clipping:
+            # only the selected sections are fetched (yt-dlp hands them to ffmpeg with seek offsets)
+            options["download_ranges"] = yt_dlp.utils.download_range_func(self.clip_chapters, self.clip_ranges)
+            # re-encode around the cut points for exact boundaries; otherwise cut at keyframes with stream copy
+            options["force_keyframes_at_cuts"] = self.clip_precise
+            need_ffmpeg_for_merge = True
+
         need_ffmpeg = bool(postprocessors) or need_ffmpeg_for_merge
+        self.progress_model = progress_model.JobProgress(
+            "+".join(self.output_formats),
+            converts=need_ffmpeg,
+            clip=(self.clip_ranges, self.clip_chapters) if self.clipping else None,
+        )
         if need_ffmpeg and not self.ffmpeg_path:
             self.error.emit(self.t("msg_ffmpeg_required"))
             return
 
+        if self.verify_outputs != "off":
+            ffprobe = verify.find_ffprobe(self.ffmpeg_path)
+            if self.ffmpeg_path and ffprobe:
+                self.verifier = verify.Verifier(
+                    self.ffmpeg_path,
+                    ffprobe,
+                    full_decode=self.verify_outputs == "full",
+                )
+            else:
+                self.progress.emit(self.t("verify_unavailable"))
+
         try:
-            with yt_dlp.YoutubeDL(options) as ydl:
+            with yt_dlp.YoutubeDL(options) as ydl, self.cassette_session(ydl):
+                self.cache_counters.attach(ydl)
+                if self.route is not None:
+                    self.route_pool.attach(ydl, self.route, self.route_usage)
+                if use_thumbnail_cache:
+                    ydl.add_post_processor(BrejaxHookPP(self.attach_thumbnail, ydl), when="post_process")
+                if multi_output:
+                    ydl.add_post_processor(BrejaxHookPP(self.produce_outputs, ydl), when="post_process")
+                if use_thumbnail_cache and embed_thumbnail:
+                    ydl.add_post_processor(
+                        yt_dlp.postprocessor.EmbedThumbnailPP(ydl),
+                        when="post_process",
+                    )
+                if self.work_folder != self.out_folder and not multi_output:
+                    # transcoded outputs are published by transcode_entry
+                    ydl.add_post_processor(BrejaxHookPP(self.publish_outputs, ydl), when="post_process")
+                if self.verifier is not None and not multi_output:
+                    # last in the chain, so it sees the final files (transcoded outputs are checked by transcode_entry)
+                    ydl.add_post_processor(BrejaxHookPP(self.queue_verification, ydl), when="post_process")
+
+                if self.resume_state.pop("paused", False) and self.resume_download(ydl):
+                    self.complete()
+                    return
+
+                if self.playlist and self.stream_playlist:
+                    self.download_streaming(ydl)
+                    self.complete()
+                    return
+
+                info = None
+                entries = None
                 try:
                     info = ydl.extract_info(self.url, download=False)
+                    if info and self.memory_budget:
+                        utils.prune_info(info)
                     if info:
                         if info.get("entries"):
                             entries = [entry for entry in info.get("entries") if entry is not None]
@@ -248,10 +836,13 @@ class BrejaxWorker(QtCore.QObject):
                                 )
                             )
                             total_size = utils.estimate_total_size_from_entries(entries)
-                            free_space = utils.bytes_free(self.out_folder)
-                            if total_size and free_space and total_size > free_space * 0.95:
+                            if total_size and not self.space_available(total_size):
                                 self.error.emit(self.t("disk_space_error"))
                                 return
+                            if self.memory_budget:
+                                # with thumbnails, they are still needed until each entry is downloaded
+                                for entry in entries:
+                                    self.prune_resolved(entry, drop_thumbnails=not self.save_thumbnail)
                         else:
                             self.progress.emit(
                                 self.t("title_loaded").format(
@@ -259,59 +850,587 @@ class BrejaxWorker(QtCore.QObject):
                                 )
                             )
                 except Exception as exc:
+                    info = None
                     self.progress.emit(self.t("prefetch_failed").format(error=str(exc)))
 
                 self.progress.emit(
-                    self.t("download_starting").format(format=self.format_type.upper())
+                    self.t("download_starting").format(format=self.format_label())
                 )
-                ydl.download([self.url])
-
-            self.progress_value.emit(100)
-            self.finished.emit()
+                if not info:
+                    ydl.download([self.url])
+                else:
+                    # resolved entries are kept so a paused job can continue without extracting again
+                    self.resume_state["entries"] = entries if entries is not None else [info]
+                    self.progress_model.plan(self.resume_state["entries"], self.resume_state["completed"])
+                    self.download_pending(ydl)
+
+            self.complete()
         except yt_dlp.utils.DownloadError as exc:
             message = str(exc).strip()
+            paused = "Download paused by user" in message
+            # entries handed to the transcode pool already count as completed; a pause lets them finish
+            self.settle_transcodes(cancel=not paused)
             if "Download stopped by user" in message:
                 self.error.emit("__STOPPED__")
+            elif paused:
+                self.resume_state["paused"] = True
+                self.error.emit("__PAUSED__")
             else:
                 self.error.emit(message or self.t("msg_error"))
         except Exception as exc:
+            self.settle_transcodes(cancel=True)
             self.error.emit(str(exc) if str(exc) else self.t("msg_error"))
 
+    def settle_transcodes(self, cancel: bool) -> None:
+        """Wait for (or with cancel, kill) the job's pending transcodes before its scratch folder goes."""
+        if cancel:
+            self._transcode_cancel.set()
+            for future in self._transcodes:
+                future.cancel()
+        elif not all(future.done() for future in self._transcodes):
+            self.progress.emit(self.t("transcode_waiting"))
+        for future in self._transcodes:
+            try:
+                future.result()
+            except Exception:
+                # cancelled, or failed on the way out; the job reports its own outcome
+                pass
+        self._transcodes = []
+
+    def cassette_session(self, ydl: yt_dlp.YoutubeDL):
+        if self.cassette_mode == "off":
+            return contextlib.nullcontext()
+        path = cassette.cassette_file(self.cassette_dir, self.url)
+        if self.cassette_mode != "record" and not os.path.isfile(path):
+            raise FileNotFoundError(self.t("cassette_missing").format(path=path))
+        self.progress.emit(self.t("cassette_active").format(mode=self.cassette_mode, path=path))
+        return cassette.session(ydl, self.cassette_mode, path)
+
+    def complete(self) -> None:
+        if self._transcodes:
+            pending = [future for future in self._transcodes if not future.done()]
+            if pending:
+                self.progress.emit(self.t("transcode_waiting"))
+            while pending:
+                # stop and pause still apply while the last entries convert
+                self.check_interrupt()
+                pending = list(concurrent.futures.wait(pending, timeout=transcode.CANCEL_POLL_SECONDS).not_done)
+            for future in self._transcodes:
+                future.result()
+            self._transcodes = []
+        self.emit_job_progress(force=True)
+        lookups = self.cache_counters.hits + self.cache_counters.misses
+        if lookups:
+            self.progress.emit(
+                self.t("extractor_cache_stats").format(hits=self.cache_counters.hits, lookups=lookups)
+            )
+        if self.resume_state.get("bytes_saved"):
+            self.progress.emit(
+                self.t("source_saved").format(size=utils.format_bytes(self.resume_state["bytes_saved"]))
+            )
+        if self._verifications:
+            self.progress.emit(self.t("verify_waiting").format(count=len(self._verifications)))
+            failed = []
+            for future in self._verifications:
+                result = future.result()
+                if not result.ok:
+                    failed.append(result)
+                    self.progress.emit(
+                        self.t("verify_failed").format(
+                            file=os.path.basename(result.path),
+                            reason=result.reason,
+                        )
+                    )
+            self.progress.emit(
+                self.t("verify_done").format(
+                    ok=len(self._verifications) - len(failed),
+                    total=len(self._verifications),
+                )
+            )
+            self._verifications = []
+            self.discard_failed(failed)
+        self.progress_value.emit(100)
+        self.finished.emit()
+
+    def discard_failed(self, failed: List[verify.VerifyResult]) -> None:
+        """Delete broken outputs and forget their entries, so a rerun of the job downloads them again."""
+        retry = []
+        for result in failed:
+            try:
+                if os.path.exists(result.path):
+                    os.remove(result.path)
+            except Exception:
+                pass
+            entry_id = result.entry_id
+            if entry_id is None or entry_id in retry:
+                continue
+            retry.append(entry_id)
+            if entry_id in self.resume_state["completed"]:
+                self.resume_state["completed"].remove(entry_id)
+            relative = self.resume_state["names"].pop(entry_id, None)
+            if relative is not None:
+                self.namer.release(relative)
+        if retry:
+            self.resume_state["retry"] = retry
+
+    def resume_download(self, ydl: yt_dlp.YoutubeDL) -> bool:
+        current = self.resume_state.get("current")
+        entries = self.resume_state.get("entries")
+        streaming = self.playlist and self.stream_playlist
+        if current is None and entries is None and not streaming:
+            return False
+
+        self.progress.emit(self.t("job_resuming"))
+        self.progress_model.plan(
+            [item for item in [current] + list(entries or []) if item],
+            self.resume_state["completed"],
+        )
+        if current is not None:
+            self.download_entry(ydl, current, resumed=True)
+        if entries is not None:
+            self.download_pending(ydl)
+        elif streaming:
+            # list the playlist again (flat, cheap); finished entries are skipped
+            self.download_streaming(ydl)
+        return True
+
+    def download_pending(self, ydl: yt_dlp.YoutubeDL) -> None:
+        entries = self.resume_state.get("entries") or []
+        for index, entry in enumerate(entries):
+            if entry is None:
+                continue
+            self.download_entry(ydl, entry)
+            if self.memory_budget:
+                # finished entries are skipped by ID on resume; their formats are not needed again
+                entries[index] = None
+
+    def download_streaming(self, ydl: yt_dlp.YoutubeDL) -> None:
+        # unprocessed, the entries are a lazy listing of bare URLs; download_entry resolves each one
+        # right before its download (with extract_flat set, yt-dlp would hand playlist entries back unresolved)
+        info = ydl.extract_info(self.url, download=False, process=False)
+        if not info or info.get("_type") not in ("playlist", "multi_video"):
+            self.progress.emit(
+                self.t("title_loaded").format(title=(info or {}).get("title", "Unknown title"))
+            )
+            self.progress.emit(
+                self.t("download_starting").format(format=self.format_label())
+            )
+            if info:
+                self.download_entry(ydl, info)
+            return
+
+        playlist_title = info.get("title", "Playlist")
+        self.progress.emit(self.t("playlist_streaming").format(title=playlist_title))
+        self.progress.emit(self.t("download_starting").format(format=self.format_label()))
+
+        index = 0
+        for entry in utils.iter_playlist_entries(info.get("entries")):
+            self.check_interrupt()
+            if not entry:
+                continue
+            index += 1
+            self.progress.emit(
+                self.t("playlist_entry").format(
+                    index=index,
+                    title=entry.get("title") or entry.get("url") or "?",
+                )
+            )
+            self.download_entry(
+                ydl,
+                entry,
+                extra_info={
+                    "playlist": playlist_title,
+                    "playlist_id": info.get("id"),
+                    "playlist_title": playlist_title,
+                    "playlist_index": index,
+                },
+            )
+
+    def download_entry(
+        self,
+        ydl: yt_dlp.YoutubeDL,
+        entry: dict,
+        extra_info: Optional[dict] = None,
+        *,
+        resumed: bool = False,
+    ) -> None:
+        self.check_interrupt()
+        if entry.get("id") and entry.get("id") in self.resume_state["completed"]:
+            return
+
+        info = entry
+        if not (entry.get("_type", "video") == "video" and entry.get("format_id")):
+            # flat or unprocessed entry: resolve formats before anything touches the disk
+            info = ydl.process_ie_result(entry, download=False, extra_info=extra_info)
+            if not info:
+                return
+
+        if info.get("_type", "video") == "video":
+            saved = info.pop("_bytes_saved", None)
+            if self.source_matched and not resumed and not self.clipping:
+                # counted once per entry, also across pauses (the resumed entry was counted before)
+                self.resume_state["bytes_saved"] += saved if saved is not None else utils.source_bytes_saved(info)
+            self.progress_model.start_entry(info)
+            self.reserve_output_name(ydl, info)
+            if self.media_cache is not None and not self.clipping:
+                # a section is not the whole source stream, so it can neither come from nor go into the cache
+                self.restore_cached_source(ydl, info)
+            if self.save_thumbnail and self.thumbnail_cache is not None:
+                thumbnail_urls = thumbnails.thumbnail_urls(info)
+                if thumbnail_urls:
+                    self._thumbnail_jobs[info.get("id")] = self.thumbnail_cache.submit(
+                        thumbnail_urls,
+                        opener=lambda url: self.fetch_bytes(ydl, url),
+                    )
+            if self.memory_budget:
+                self.prune_resolved(info, drop_thumbnails=not ydl.params.get("writethumbnail"))
+
+        expires = utils.stream_expiry(info) if info.get("_type", "video") == "video" else None
+        if expires is not None and expires < time.time() + STREAM_EXPIRY_MARGIN:
+            # resolved long ago (prefetched playlist, pause): the stream URL would run out during the download
+            info = self.refresh_entry(ydl, info)
+        self.resume_state["current"] = info
+        try:
+            if not self.stream_source(ydl, info):
+                ydl.process_ie_result(info, download=True)
+        except yt_dlp.utils.DownloadError as exc:
+            if "HTTP Error 403" not in str(exc):
+                raise
+            # the stream URL expired (or carried no expiry); resolve it again and continue from the .part file
+            fresh = self.refresh_entry(ydl, info)
+            if fresh is info:
+                raise
+            info = fresh
+            self.resume_state["current"] = info
+            ydl.process_ie_result(info, download=True)
+        self.resume_state["current"] = None
+        self._thumbnail_jobs.pop(info.get("id"), None)
+        if self.multi_output:
+            # converted later on the transcode pool
+            self.progress_model.entry_downloaded(info.get("id"))
+        else:
+            self.progress_model.entry_converted(
+                info.get("id"),
+                time.monotonic() - self._download_finished_at if self._download_finished_at else 0.0,
+            )
+        self.emit_job_progress(force=True)
+        if info.get("id"):
+            self.resume_state["completed"].append(info["id"])
+            relative = self.resume_state["names"].get(info["id"])
+            if relative is not None and not self.multi_output:
+                # published by now (transcoded outputs release theirs in transcode_entry)
+                self.namer.release_claim(relative)
+            if self.memory_budget:
+                self.resume_state["names"].pop(info["id"], None)
+        if self.telemetry is not None:
+            self.telemetry.sample()
+
+    def refresh_entry(self, ydl: yt_dlp.YoutubeDL, info: dict) -> dict:
+        """Resolve an entry again for fresh stream URLs, keeping its playlist fields; info itself if it cannot be."""
+        page_url = info.get("webpage_url") or info.get("original_url")
+        if not page_url:
+            return info
+        self.progress.emit(self.t("resume_refresh"))
+        extra_info = {key: value for key, value in info.items() if key.startswith("playlist")}
+        fresh = ydl.extract_info(page_url, download=False, extra_info=extra_info)
+        if fresh and self.memory_budget:
+            utils.prune_info(fresh)
+            self.prune_resolved(fresh, drop_thumbnails=not ydl.params.get("writethumbnail"))
+        return fresh or info
+
+    def prune_resolved(self, info: dict, drop_thumbnails: bool = True) -> None:
+        """memory_budget: drop the formats that were not selected (and the thumbnails) from a resolved entry."""
+        if self.source_matched and "_bytes_saved" not in info and info.get("formats"):
+            # measured against the formats that are about to be dropped
+            info["_bytes_saved"] = utils.source_bytes_saved(info)
+        utils.prune_resolved(info, drop_thumbnails)
+
+    def stream_source(self, ydl: yt_dlp.YoutubeDL, info: dict) -> bool:
+        """Encode the entry while it downloads; False if it has to take the normal download path."""
+        if (
+            self.stream_target is None
+            or info.get("_type", "video") != "video"
+            or not stream_encode.can_stream(info)
+        ):
+            return False
+        spec = transcode.OUTPUT_TARGETS[self.stream_target]
+        path = os.path.splitext(ydl.prepare_filename(info))[0] + "." + spec["ext"]
+        thumbnail = None
+        future = self._thumbnail_jobs.get(info.get("id"))
+        if future is not None and spec["cover"]:
+            # the cover goes into the same ffmpeg run, so it is needed before the first byte
+            try:
+                thumbnail = future.result(timeout=30)
+            except Exception:
+                thumbnail = None
+
+        def on_progress(downloaded: float, total: float, speed: float) -> None:
+            self.progress_hook(
+                {
+                    "status": "downloading",
+                    "downloaded_bytes": downloaded,
+                    "total_bytes": total,
+                    "speed": speed,
+                    "eta": (total - downloaded) / speed if speed and total else 0,
+                    "filename": path,
+                    "info_dict": info,
+                }
+            )
+
+        try:
+            stream_encode.stream_to_encoder(
+                ydl,
+                info,
+                self.ffmpeg_path,
+                self.stream_target,
+                path,
+                on_progress,
+                quality=self.quality,
+                preset=self.encoding_preset,
+                threads=self.encoder_threads,
+                thumbnail=thumbnail,
+                metadata=stream_encode.metadata_for(info) if self.embed_metadata else None,
+            )
+        except stream_encode.StreamUnavailable as exc:
+            self.progress.emit(self.t("pipe_fallback").format(error=exc))
+            return False
+        self.progress_hook({"status": "finished", "filename": path, "info_dict": info})
+        path = self.publish(path)
+        # encoding overlapped the transfer; there is no separate conversion time to measure
+        self._download_finished_at = 0.0
+        info["filepath"] = path
+        self.queue_verification(info)
+        return True
+
+    def reserve_output_name(self, ydl: yt_dlp.YoutubeDL, info: dict) -> None:
+        names = self.resume_state["names"]
+        relative = names.get(info.get("id"))
+        if relative is None:
+            relative = self.namer.reserve(naming.render_template(self.name_template, info))
+            if info.get("id"):
+                names[info["id"]] = relative
+        # the reserved name is literal text inside the yt-dlp template
+        ydl.params["outtmpl"]["default"] = os.path.join(
+            self.work_folder,
+            relative.replace("%", "%%") + self.section_suffix() + ".%(ext)s",
+        )
+
+    def section_suffix(self) -> str:
+        # every section of a clip job becomes its own file, named after the chapter or start time
+        return " [%(section_title,section_start)s]" if self.clipping else ""
+
+    def restore_cached_source(self, ydl: yt_dlp.YoutubeDL, info: dict) -> None:
+        # only single-stream downloads map 1:1 onto a cached file
+        video_id = info.get("id")
+        format_id = info.get("format_id")
+        if info.get("requested_formats") or not video_id or not format_id:
+            return
+        filename = ydl.prepare_filename(info)
+        if self.media_cache.restore(video_id, format_id, filename):
+            self.progress.emit(
+                self.t("cache_hit").format(title=info.get("title", video_id))
+            )
+        else:
+            self._cache_pending[filename] = (video_id, format_id)
+
+    def fetch_bytes(self, ydl: yt_dlp.YoutubeDL, url: str) -> bytes:
+        # through yt-dlp, so proxies, cookies and the route pool apply
+        response = ydl.urlopen(url)
+        try:
+            return response.read()
+        finally:
+            response.close()
+
+    def attach_thumbnail(self, info: dict):
+        # kept until the entry is done: every section of a clip gets the artwork
+        future = self._thumbnail_jobs.get(info.get("id"))
+        filepath = info.get("filepath")
+        if future is None or not filepath:
+            return [], info
+        try:
+            cached = future.result(timeout=120)
+        except Exception:
+            cached = None
+        if not cached:
+            return [], info
+
+        # a per-file copy, since embedding deletes the thumbnail it was given
+        target = os.path.splitext(filepath)[0] + ".jpg"
+        try:
+            shutil.copyfile(cached, target)
+        except Exception:
+            return [], info
+        info["thumbnails"] = [{"id": "0", "url": cached, "filepath": target}]
+        # like a thumbnail yt-dlp wrote: published with the file unless embedding removes it first
+        info.setdefault("__files_to_move", {})[target] = None
+        return [], info
+
+    def produce_outputs(self, info: dict):
+        source = info.get("filepath")
+        if not source or not os.path.exists(source):
+            return [], info
+
+        targets = [item for item in self.output_formats if item != self.source_target]
+        thumbnail = None
+        if self.save_thumbnail:
+            for thumb in reversed(info.get("thumbnails") or []):
+                if thumb.get("filepath") and os.path.exists(thumb["filepath"]):
+                    thumbnail = thumb["filepath"]
+                    break
+
+        self.progress.emit(
+            self.t("transcoding_outputs").format(
+                count=len(targets),
+                title=info.get("title", os.path.basename(source)),
+            )
+        )
+        # converted on the shared transcode pool while yt-dlp moves on to the next entry
+        self._transcodes.append(
+            transcode.get_pool(self.transcode_workers).submit(
+                self.transcode_entry,
+                info.get("id"),
+                self.expected_duration(info),
+                source,
+                targets,
+                thumbnail,
+                self.resume_state["names"].get(info.get("id")),
+            )
+        )
+        return [], info
+
+    def transcode_entry(
+        self,
+        entry_id: Optional[str],
+        duration,
+        source: str,
+        targets: List[str],
+        thumbnail: Optional[str],
+        relative: Optional[str] = None,
+    ) -> None:
+        started = time.monotonic()
+        outputs = transcode.transcode(
+            self.ffmpeg_path,
+            source,
+            targets,
+            keep_source=self.source_target is not None,
+            quality=self.quality,
+            preset=self.encoding_preset,
+            threads=self.encoder_threads,
+            thumbnail=thumbnail,
+            audio_filter=self.audio_filter,
+            trim_silence=self.trim_silence,
+            cancel=self._transcode_cancel,
+        )
+
+        cleanup = []
+        if self.source_target is None and source not in outputs.values():
+            cleanup.append(source)
+        if thumbnail and self.source_target != "mp4":
+            cleanup.append(thumbnail)
+        for path in cleanup:
+            try:
+                os.remove(path)
+            except Exception:
+                pass
+
+        self.progress_model.entry_converted(entry_id, time.monotonic() - started)
+        self.emit_job_progress(force=True)
+
+        produced = dict(outputs)
+        if self.source_target is not None:
+            produced[self.source_target] = source
+        produced = {target: self.publish(path) for target, path in produced.items()}
+        if thumbnail and self.source_target == "mp4":
+            self.publish(thumbnail)
+        if relative is not None:
+            self.namer.release_claim(relative)
+        self.submit_verifications(entry_id, duration, produced)
+
+    def emit_job_progress(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._progress_emitted < JOB_PROGRESS_INTERVAL:
+            return
+        self._progress_emitted = now
+        self.job_progress.emit(self.progress_model.snapshot())
+
+    def queue_verification(self, info: dict):
+        filepath = info.get("filepath")
+        if filepath:
+            target = self.output_formats[0] if self.output_formats else ""
+            self.submit_verifications(info.get("id"), self.expected_duration(info), {target: filepath})
+        return [], info
+
+    def expected_duration(self, info: dict):
+        if not self.clipping:
+            return info.get("duration")
+        if not self.clip_precise:
+            # keyframe cuts start at the keyframe before the requested time, so the length is not exact
+            return None
+        return clips.section_duration(info)
+
+    def submit_verifications(self, entry_id: Optional[str], duration, outputs: dict) -> None:
+        if self.verifier is None:
+            return
+        try:
+            duration = float(duration or 0) or None
+        except (TypeError, ValueError):
+            duration = None
+        for target, path in outputs.items():
+            spec = transcode.OUTPUT_TARGETS.get(target, {})
+            expected = duration
+            if self.trim_silence and spec.get("codec"):
+                # trimmed outputs are shorter than the source by design
+                expected = None
+            try:
+                future = self.verifier.submit(
+                    path,
+                    entry_id=entry_id,
+                    expected_duration=expected,
+                    expect_video=bool(spec.get("video")),
+                )
+            except RuntimeError:
+                # the job was paused or stopped and its verifier shut down
+                return
+            self._verifications.append(future)
+
     def progress_hook(self, data: dict) -> None:
-        if not self._is_running:
-            raise yt_dlp.utils.DownloadError("Download stopped by user")
+        self.check_interrupt()
 
         status = data.get("status")
         info = data.get("info_dict") or {}
         title = info.get("title") if isinstance(info, dict) else None
 
         if status == "downloading":
-            downloaded = data.get("downloaded_bytes") or 0
-            total = data.get("total_bytes") or data.get("total_bytes_estimate") or 0
-            if total:
-                try:
-                    self.progress_value.emit(max(0, min(100, int((downloaded / total) * 100))))
-                except Exception:
-                    pass
-
-            pct = (data.get("_percent_str") or "").strip()
-            speed = (data.get("_speed_str") or "").strip()
-            eta = (data.get("_eta_str") or "").strip()
-
-            parts = []
-            if title:
-                parts.append(f"Downloading: {title}")
-            if pct:
-                parts.append(pct)
-            if speed:
-                parts.append(f"@ {speed}")
-            if eta:
-                parts.append(f"ETA {eta}")
-            self.progress.emit(" | ".join(parts))
+            downloaded = float(data.get("downloaded_bytes") or 0)
+            total = float(data.get("total_bytes") or data.get("total_bytes_estimate") or 0)
+            now = time.monotonic()
+            if now - self._transfer_emitted < TRANSFER_EMIT_INTERVAL and not (total and downloaded >= total):
+                return
+            self._transfer_emitted = now
+            # raw numbers only; the UI formats the latest sample when it renders
+            self.transfer.emit(
+                title or "",
+                downloaded,
+                total,
+                float(data.get("speed") or 0),
+                float(data.get("eta") or 0),
+            )
+            self.progress_model.on_bytes(data.get("filename") or "", downloaded, total)
+            self.emit_job_progress()
             return
 
         if status == "finished":
-            self.progress_value.emit(100)
+            self._download_finished_at = time.monotonic()
+            if data.get("downloaded_bytes"):
+                # the last chunks may have been dropped by the sampling above
+                self.progress_model.on_bytes(
+                    data.get("filename") or "",
+                    float(data["downloaded_bytes"]),
+                    float(data.get("total_bytes") or 0),
+                )
+            cached = self._cache_pending.pop(data.get("filename"), None)
+            if cached and self.media_cache is not None:
+                self.media_cache.store(cached[0], cached[1], data["filename"])
             if title:
                 self.progress.emit(f"Finished download: {title} - converting/merging...")
             else:
@@ -319,7 +1438,6 @@ class BrejaxWorker(QtCore.QObject):
             return
 
         if status == "postprocessing":
-            self.progress_value.emit(100)
             postprocessor = data.get("postprocessor", {})
             if isinstance(postprocessor, dict):
                 self.progress.emit(f"Postprocessing: {postprocessor.get('key', '')}")
@@ -330,19 +1448,177 @@ class BrejaxWorker(QtCore.QObject):
         self.progress.emit(str(data.get("status") or title or data))
 
 
+class BrejaxProcessWorker(QtCore.QObject):
+    """Runs a job in a pool process and relays it through the BrejaxWorker signals.
+
+    run() blocks on the process' event pipe, so it is moved to a QThread just
+    like BrejaxWorker; the download itself does not hold this process' GIL.
+    """
+
+    progress = QtCore.pyqtSignal(str)
+    progress_value = QtCore.pyqtSignal(int)
+    transfer = QtCore.pyqtSignal(str, float, float, float, float)
+    job_progress = QtCore.pyqtSignal(dict)
+    finished = QtCore.pyqtSignal()
+    error = QtCore.pyqtSignal(str)
+    stats = QtCore.pyqtSignal(dict)
+
+    def __init__(
+        self,
+        pool: process_pool.WorkerProcessPool,
+        job_kwargs: dict,
+        resume_state: dict,
+        routes: Optional[route_pool.RoutePool] = None,
+        names=None,
+        media: Optional[media_cache.MediaCache] = None,
+    ):
+        super().__init__()
+        self.pool = pool
+        self.job_kwargs = job_kwargs
+        self.resume_state = resume_state
+        self.routes = routes
+        # objects the pool process calls into: one name registry, one media cache index and one route pool for all processes
+        self.targets = {"names": names, "media": media, "routes": routes}
+        self._lock = threading.Lock()
+        self._slot: Optional[process_pool.PoolSlot] = None
+        self._requests: List[str] = []
+
+    def request(self, kind: str) -> None:
+        with self._lock:
+            if self._slot is None:
+                self._requests.append(kind)
+            else:
+                self._slot.send((kind,))
+
+    def stop(self) -> None:
+        self.request("stop")
+
+    def pause(self) -> None:
+        self.request("pause")
+
+    def relay(self, message: tuple) -> None:
+        if message[0] == "p":
+            self.progress.emit(message[1])
+        elif message[0] == "v":
+            self.progress_value.emit(message[1])
+        elif message[0] == "d":
+            self.transfer.emit(*message[1:])
+        elif message[0] == "j":
+            self.job_progress.emit(message[1])
+        elif message[0] == "t":
+            if self.routes is not None:
+                # the pool process measured its own traffic; bring this process' view up to date
+                self.routes.report(message[1].get("routes"))
+            self.stats.emit(message[1])
+        elif message[0] == "c":
+            self.answer(*message[1:])
+
+    def answer(self, target: str, method: str, args: tuple) -> None:
+        try:
+            result = getattr(self.targets[target], method)(*args)
+        except Exception:
+            result = None
+        with self._lock:
+            if self._slot is not None:
+                self._slot.send(("r", result))
+
+    def run(self) -> None:
+        # chosen here, so jobs are balanced across all pool processes
+        route = self.routes.acquire() if self.routes is not None else None
+        if route is not None:
+            self.job_kwargs["route_hint"] = route.spec
+        slot = self.pool.acquire()
+        try:
+            slot.send(("run", self.job_kwargs))
+            with self._lock:
+                self._slot = slot
+                for kind in self._requests:
+                    slot.send((kind,))
+                self._requests = []
+            outcome = slot.wait(self.relay)
+        finally:
+            with self._lock:
+                self._slot = None
+            self.pool.release(slot)
+            if self.routes is not None:
+                self.routes.release(route)
+
+        state = outcome[-1]
+        if isinstance(state, dict):
+            self.resume_state.clear()
+            self.resume_state.update(state)
+        if outcome[0] == "done":
+            self.finished.emit()
+        else:
+            self.error.emit(outcome[1])
+
+
 class BrejaxDownloaderUI(QtWidgets.QWidget):
+    queue_changed = QtCore.pyqtSignal()
+    # error text of the extractor cache warm-up, "" on success
+    cache_warmed = QtCore.pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
-        self.settings = load_settings()
+        self.settings = SettingsStore(load_settings())
         self.lang = self.settings.get("lang", "en")
         self.ffmpeg = utils.find_ffmpeg()
-        self.worker_thread: Optional[QtCore.QThread] = None
-        self.worker: Optional[BrejaxWorker] = None
+        self.active_jobs = {}
+        self.scheduler = scheduler.JobScheduler(
+            max_concurrent=self.settings.get("max_concurrent_jobs", 1),
+            preemption=bool(self.settings.get("preemption", False)),
+            on_change=self.queue_changed.emit,
+        )
+        # queued, so scheduler calls made by API threads (or from inside pump_queue) never re-enter it
+        self.queue_changed.connect(self.on_queue_changed, QtCore.Qt.ConnectionType.QueuedConnection)
+        self.events = api_server.EventHub()
+        self.api = None
+        self.transfers = {}
+        self._dirty_transfers = set()
+        self.job_progress = {}
+        # bytes of jobs that finished since the queue last became busy
+        self.queue_done_bytes = 0.0
+        self.render_timer = QtCore.QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(TRANSFER_RENDER_INTERVAL_MS)
+        self.render_timer.timeout.connect(self.render_transfers)
+        self.process_pool = None
+        if self.settings.get("process_workers", False):
+            self.process_pool = process_pool.WorkerProcessPool(
+                os.path.abspath(__file__),
+                self.scheduler.max_concurrent,
+            )
+        self.job_store = self.create_job_store()
+        # output names claimed by pool processes when there is no shared store
+        self.name_claims = naming.NameClaims()
+        # shared store IDs whose outcome was recorded
+        self.shared_reported = set()
+        self.shared_timer = QtCore.QTimer(self)
+        self.shared_timer.timeout.connect(self.heartbeat_shared_jobs)
+        if self.job_store is not None:
+            naming.set_registry(self.job_store)
+            self.shared_timer.start(int(self.job_store.lease_seconds * 1000 / 3))
+        self.media_cache = self.create_media_cache()
+        self.extractor_cache = self.create_extractor_cache()
+        self.route_pool = self.create_route_pool()
+        if self.route_pool is not None:
+            self.route_pool.start_checks()
+        self.thumbnail_cache = None
+        if self.ffmpeg:
+            self.thumbnail_cache = thumbnails.ThumbnailCache(
+                os.path.join(CACHE_DIR, "thumbnails"),
+                self.ffmpeg,
+                max_size=self.settings.get("thumbnail_max_size", 1280),
+            )
 
         self.resize(820, 640)
         self.init_ui()
         self.apply_language()
         self.refresh_ffmpeg_notice()
+        self.start_api()
+        if self.extractor_cache is not None and self.settings.get("extractor_cache_warmup", False):
+            self.cache_warmed.connect(self.on_cache_warmed)
+            self.extractor_cache.warm_up(on_done=lambda error: self.cache_warmed.emit(error or ""))
 
         if SETTINGS_RECOVERED:
             QtWidgets.QMessageBox.information(
@@ -366,6 +1642,61 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
     def t(self, key: str, fallback: str = "") -> str:
         return texts.get(self.lang, texts["en"]).get(key, fallback or key)
 
+    def create_media_cache(self) -> Optional[media_cache.MediaCache]:
+        if not self.settings.get("media_cache", False):
+            return None
+        root = self.settings.get("media_cache_dir") or os.path.join(CACHE_DIR, "media")
+        try:
+            return media_cache.MediaCache(
+                root,
+                int(self.settings.get("media_cache_max_mb", 0)) * 1024 * 1024,
+            )
+        except Exception:
+            return None
+
+    def create_job_store(self) -> Optional[job_store.SharedJobStore]:
+        path = self.settings.get("shared_store", "")
+        if not path:
+            return None
+        try:
+            return job_store.SharedJobStore(
+                path,
+                lease_seconds=self.settings.get("shared_store_lease", 60),
+                wal=bool(self.settings.get("shared_store_wal", True)),
+            )
+        except Exception:
+            return None
+
+    def create_route_pool(self) -> Optional[route_pool.RoutePool]:
+        routes = self.settings.get("routes", [])
+        if not routes:
+            return None
+        return route_pool.RoutePool(
+            routes,
+            strategy=self.settings.get("route_strategy", "least-loaded"),
+            scope=self.settings.get("route_scope", "job"),
+            min_speed=self.settings.get("route_min_speed_kb", 0) * 1024,
+            cooldown=self.settings.get("route_cooldown", 120),
+            probe_url=self.settings.get("route_probe_url", ""),
+        )
+
+    def create_extractor_cache(self) -> Optional[extractor_cache.ExtractorCache]:
+        if not self.settings.get("extractor_cache", True):
+            return None
+        try:
+            return extractor_cache.ExtractorCache(
+                os.path.join(CACHE_DIR, "yt-dlp"),
+                int(self.settings.get("extractor_cache_max_mb", 0)) * 1024 * 1024,
+            )
+        except Exception:
+            return None
+
+    def on_cache_warmed(self, error: str) -> None:
+        if error:
+            self.log(self.t("extractor_cache_warmup_failed").format(error=error))
+        else:
+            self.log(self.t("extractor_cache_warm"))
+
     def init_ui(self) -> None:
         self.setObjectName("mainWindow")
         self.setStyleSheet(
@@ -521,6 +1852,18 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         self.playlist_checkbox.setChecked(self.settings.get("playlist", False))
         option_grid.addWidget(self.playlist_checkbox, 1, 2, 1, 2)
 
+        self.lbl_priority = QtWidgets.QLabel()
+        option_grid.addWidget(self.lbl_priority, 2, 0)
+        self.priority_combo = QtWidgets.QComboBox()
+        self.priority_combo.addItems(scheduler.PRIORITY_CLASSES)
+        self.priority_combo.setCurrentIndex(scheduler.PRIORITY_CLASSES.index("normal"))
+        option_grid.addWidget(self.priority_combo, 2, 1)
+
+        self.lbl_clip = QtWidgets.QLabel()
+        option_grid.addWidget(self.lbl_clip, 3, 0)
+        self.clip_input = QtWidgets.QLineEdit()
+        option_grid.addWidget(self.clip_input, 3, 1, 1, 3)
+
         main_layout.addLayout(option_grid)
 
         checkbox_row = QtWidgets.QHBoxLayout()
@@ -577,6 +1920,16 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         self.btn_start.setStyleSheet(self.get_button_style(primary=True))
         button_row.addWidget(self.btn_start)
 
+        self.job_combo = QtWidgets.QComboBox()
+        self.job_combo.currentIndexChanged.connect(lambda _index: self.refresh_queue_controls())
+        button_row.addWidget(self.job_combo)
+
+        self.btn_pause = QtWidgets.QPushButton()
+        self.btn_pause.clicked.connect(self.toggle_pause)
+        self.btn_pause.setEnabled(False)
+        self.btn_pause.setStyleSheet(self.get_button_style(primary=False))
+        button_row.addWidget(self.btn_pause)
+
         self.btn_stop = QtWidgets.QPushButton()
         self.btn_stop.clicked.connect(self.stop_download)
         self.btn_stop.setEnabled(False)
@@ -599,6 +1952,8 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
 
         self.log_output = QtWidgets.QTextEdit()
         self.log_output.setReadOnly(True)
+        # oldest lines are dropped once the limit is reached (0 = unlimited)
+        self.log_output.document().setMaximumBlockCount(self.settings.get("log_max_lines", 5000))
         log_layout.addWidget(self.log_output)
 
         root.addWidget(log_card, 1)
@@ -629,6 +1984,13 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         self.resolution_combo.setToolTip(self.t("resolution_combo_tooltip"))
         self.playlist_checkbox.setText(self.t("playlist_checkbox"))
         self.playlist_checkbox.setToolTip(self.t("playlist_tooltip"))
+        self.lbl_priority.setText(self.t("priority_label"))
+        self.priority_combo.setToolTip(self.t("priority_tooltip"))
+        for index, priority in enumerate(scheduler.PRIORITY_CLASSES):
+            self.priority_combo.setItemText(index, self.t(f"priority_{priority}"))
+        self.lbl_clip.setText(self.t("clip_label"))
+        self.clip_input.setPlaceholderText(self.t("clip_placeholder"))
+        self.clip_input.setToolTip(self.t("clip_tooltip"))
         self.embed_metadata_cb.setText(self.t("embed_metadata"))
         self.embed_metadata_cb.setToolTip(self.t("embed_metadata_tooltip"))
         self.save_thumbnail_cb.setText(self.t("save_thumbnail"))
@@ -642,8 +2004,11 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         self.btn_start.setToolTip(self.t("btn_start_tooltip"))
         self.btn_stop.setText(self.t("btn_stop"))
         self.btn_stop.setToolTip(self.t("btn_stop_tooltip"))
+        self.btn_pause.setToolTip(self.t("btn_pause_tooltip"))
+        self.job_combo.setToolTip(self.t("job_select_tooltip"))
+        self.refresh_queue_controls()
         self.refresh_format_hint()
-        if not self.worker:
+        if not self.active_jobs:
             self.set_status(self.t("status_idle"), state="idle")
 
     def refresh_ffmpeg_notice(self) -> None:
@@ -715,7 +2080,6 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         if folder:
             self.folder_path.setText(folder)
             self.settings["last_folder"] = folder
-            save_settings(self.settings)
 
     def open_output_folder(self) -> None:
         folder = self.folder_path.text().strip()
@@ -741,15 +2105,89 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
             )
 
     def log(self, message: str) -> None:
-        clean = strip_ansi_codes(message)
+        self.append_log(strip_ansi_codes(message))
+
+    def append_log(self, clean: str) -> None:
         timestamp = time.strftime("%H:%M:%S")
         self.log_output.append(f"[{timestamp}] {clean}")
         bar = self.log_output.verticalScrollBar()
         bar.setValue(bar.maximum())
 
+    def on_transfer(self, title: str, downloaded: float, total: float, speed: float, eta: float) -> None:
+        job_id = self.job_id_for(self.sender())
+        self.transfers[job_id] = (title, downloaded, total, speed, eta)
+        self._dirty_transfers.add(job_id)
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def on_job_progress(self, snapshot: dict) -> None:
+        job_id = self.job_id_for(self.sender())
+        self.job_progress[job_id] = snapshot
+        self._dirty_transfers.add(job_id)
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def render_queue_progress(self) -> None:
+        """Byte-weighted progress, throughput and ETA over the running and waiting jobs."""
+        running = list(self.job_progress.values())
+        if not running:
+            return
+        total = sum(item["total_bytes"] for item in running)
+        done = sum(item["done_bytes"] for item in running)
+        work_done = sum(item["fraction"] * item["total_bytes"] for item in running)
+        rate = sum(item["rate"] for item in running)
+        pending = self.scheduler.pending_count()
+        # waiting jobs have not been sized yet; assume the average of the running ones
+        queue_total = self.queue_done_bytes + total + pending * (total / len(running))
+        fraction = (self.queue_done_bytes + work_done) / queue_total if queue_total else 0.0
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(int(fraction * 100))
+        if not rate:
+            self.progress_bar.setFormat("%p%")
+            return
+        converting = sum(item["convert_eta"] for item in running) / max(1, self.scheduler.max_concurrent)
+        eta = (queue_total - self.queue_done_bytes - done) / rate + converting
+        self.progress_bar.setFormat(
+            f"%p% | {utils.format_bytes(rate)}/s | ETA {utils.format_duration(eta)}"
+        )
+        self.events.publish(
+            {"type": "queue_progress", "fraction": fraction, "rate": rate, "eta": eta, "pending": pending}
+        )
+
+    def render_transfers(self) -> None:
+        """Show the latest transfer sample; runs at most every TRANSFER_RENDER_INTERVAL_MS."""
+        if not self._dirty_transfers:
+            return
+        self.render_queue_progress()
+        for job_id in self._dirty_transfers:
+            if job_id in self.job_progress:
+                self.events.publish({"type": "job_progress", "job": job_id, **self.job_progress[job_id]})
+            sample = self.transfers.get(job_id)
+            if sample is not None:
+                self.events.publish(
+                    {
+                        "type": "transfer",
+                        "job": job_id,
+                        "downloaded": sample[1],
+                        "total": sample[2],
+                        "speed": sample[3],
+                        "eta": sample[4],
+                    }
+                )
+        job_id = max(self._dirty_transfers, key=lambda key: key or 0)
+        self._dirty_transfers.clear()
+        sample = self.transfers.get(job_id)
+        if sample is None:
+            return
+        text = format_transfer(*sample)
+        if len(self.transfers) > 1:
+            text = f"[{len(self.transfers)}] {text}"
+        self.set_status(text if len(text) <= 140 else f"{text[:137]}...", state="active")
+
     def on_progress(self, message: str) -> None:
-        self.log(message)
         clean = strip_ansi_codes(message)
+        self.events.publish({"type": "progress", "job": self.job_id_for(self.sender()), "message": clean})
+        self.append_log(clean)
         lower = clean.lower()
         if lower.startswith("title loaded:") or lower.startswith("playlist loaded:"):
             display = clean.split(":", 1)[1].strip() if ":" in clean else clean
@@ -760,14 +2198,29 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
             short = clean if len(clean) <= 140 else f"{clean[:137]}..."
             self.set_status(short, state="active")
 
+    def on_job_stats(self, stats: dict) -> None:
+        job_id = self.job_id_for(self.sender())
+        job = self.scheduler.get(job_id) if job_id is not None else None
+        if job is not None:
+            job.stats = stats
+        self.events.publish({"type": "stats", "job": job_id, "stats": stats})
+        for spec, usage in (stats.get("routes") or {}).items():
+            if usage.get("throttled"):
+                self.log(self.t("route_throttled").format(route=spec))
+        if self.settings.get("memory_budget", False):
+            self.log(self.t("job_memory").format(id=job_id, **stats))
+
     def on_progress_value(self, value: int) -> None:
+        if self.job_progress:
+            # the bar shows the aggregate of all running jobs (render_queue_progress)
+            return
+        self.events.publish({"type": "percent", "job": self.job_id_for(self.sender()), "value": value})
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(max(0, min(100, value)))
 
     def change_language(self, index: int) -> None:
         self.lang = "en" if index == 0 else "de"
         self.settings["lang"] = self.lang
-        save_settings(self.settings)
         self.apply_language()
 
     def on_format_changed(self, _index: int) -> None:
@@ -776,39 +2229,185 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         self.resolution_combo.setVisible(is_mp4)
         self.refresh_format_hint()
 
-    def set_download_controls_enabled(self, enabled: bool) -> None:
-        self.btn_start.setEnabled(enabled)
-        self.btn_stop.setEnabled(not enabled)
-        self.url_input.setEnabled(enabled)
-        self.btn_folder.setEnabled(enabled)
-        self.btn_open_folder.setEnabled(enabled)
-        self.quality_combo.setEnabled(enabled)
-        self.playlist_checkbox.setEnabled(enabled)
-        self.format_combo.setEnabled(enabled)
-        self.resolution_combo.setEnabled(enabled)
-        self.embed_metadata_cb.setEnabled(enabled)
-        self.save_thumbnail_cb.setEnabled(enabled)
-        self.auto_open_cb.setEnabled(enabled)
-        self.lang_combo.setEnabled(enabled)
-
-    def build_worker(self, url: str, out_folder: str, quality: int) -> BrejaxWorker:
+    def refresh_queue_controls(self) -> None:
+        paused = self.scheduler.paused()
+        self.btn_stop.setEnabled(
+            bool(self.active_jobs) or self.scheduler.pending_count() > 0 or bool(paused)
+        )
+        self.refresh_job_combo()
+        job_id = self.job_combo.currentData()
+        job = self.scheduler.get(job_id) if job_id is not None else None
+        if job is not None:
+            self.btn_pause.setEnabled(job.state in ("queued", "running", "preempting", "paused"))
+            resume = job.state == "paused"
+        else:
+            self.btn_pause.setEnabled(bool(self.active_jobs) or bool(paused))
+            resume = bool(paused) and not self.active_jobs
+        self.btn_pause.setText(self.t("btn_resume") if resume else self.t("btn_pause"))
+
+    def refresh_job_combo(self) -> None:
+        """List the unfinished jobs so a single one can be paused or resumed; the first entry means all."""
+        selected = self.job_combo.currentData()
+        jobs = [
+            job for job in sorted(self.scheduler.jobs(), key=lambda job: job.job_id)
+            if job.state not in scheduler.FINAL_STATES
+        ]
+        items = [(self.t("job_select_all"), None)] + [
+            (self.t("job_select_item").format(id=job.job_id, state=self.t(f"job_state_{job.state}")), job.job_id)
+            for job in jobs
+        ]
+        current = [(self.job_combo.itemText(index), self.job_combo.itemData(index)) for index in range(self.job_combo.count())]
+        if items == current:
+            return
+        self.job_combo.blockSignals(True)
+        self.job_combo.clear()
+        for text, job_id in items:
+            self.job_combo.addItem(text, job_id)
+        index = self.job_combo.findData(selected) if selected is not None else 0
+        self.job_combo.setCurrentIndex(max(0, index))
+        self.job_combo.blockSignals(False)
+
+    def toggle_pause(self) -> None:
+        job_id = self.job_combo.currentData()
+        if job_id is not None:
+            self.toggle_pause_job(job_id)
+            return
+        if self.active_jobs:
+            for worker, _thread in self.active_jobs.values():
+                worker.pause()
+            return
+        for job in self.scheduler.paused():
+            self.scheduler.resume(job.job_id)
+            self.log(self.t("job_resumed").format(id=job.job_id))
+        self.pump_queue()
+
+    def toggle_pause_job(self, job_id: int) -> None:
+        job = self.scheduler.get(job_id)
+        if job is None:
+            return
+        if job.state == "paused":
+            if self.scheduler.resume(job_id):
+                self.log(self.t("job_resumed").format(id=job_id))
+        elif self.scheduler.pause(job_id) is not None and job.state == "paused":
+            # was still queued; running jobs are paused by pump_queue
+            self.log(self.t("job_paused").format(id=job_id))
+        self.pump_queue()
+
+    def queue_idle(self) -> bool:
+        return not self.scheduler.running() and self.scheduler.pending_count() == 0
+
+    def job_id_for(self, obj) -> Optional[int]:
+        for job_id, (worker, thread) in self.active_jobs.items():
+            if obj is worker or obj is thread:
+                return job_id
+        return None
+
+    def collect_job_options(self, url: str, out_folder: str, quality: int) -> dict:
+        return {
+            "url": url,
+            "out_folder": out_folder,
+            "quality": quality,
+            "playlist": self.playlist_checkbox.isChecked(),
+            "format_type": self.format_combo.currentText().lower(),
+            "embed_metadata": self.embed_metadata_cb.isChecked(),
+            "save_thumbnail": self.save_thumbnail_cb.isChecked(),
+            "resolution_label": self.resolution_combo.currentText(),
+            "stream_playlist": bool(self.settings.get("stream_playlist", False)),
+            "output_formats": [item.lower() for item in self.settings.get("extra_formats", [])],
+            "name_template": self.settings.get("name_template", naming.DEFAULT_TEMPLATE),
+            "encoding_preset": self.settings.get("encoding_preset", "balanced"),
+            "clip": self.clip_input.text().strip(),
+            "clip_precise": bool(self.settings.get("clip_precise", False)),
+            "match_source_bitrate": bool(self.settings.get("match_source_bitrate", True)),
+            "pipe_encode": bool(self.settings.get("pipe_encode", False)),
+        }
+
+    def build_worker(self, job: scheduler.Job) -> QtCore.QObject:
+        if self.process_pool is not None:
+            return BrejaxProcessWorker(
+                self.process_pool,
+                self.process_job_kwargs(job),
+                job.resume_state,
+                self.route_pool,
+                self.job_store if self.job_store is not None else self.name_claims,
+                self.media_cache,
+            )
         return BrejaxWorker(
-            url,
-            out_folder,
-            quality,
-            self.playlist_checkbox.isChecked(),
-            format_type=self.format_combo.currentText().lower(),
-            embed_metadata=self.embed_metadata_cb.isChecked(),
-            save_thumbnail=self.save_thumbnail_cb.isChecked(),
-            resolution_label=self.resolution_combo.currentText(),
+            **job.options,
             ffmpeg_path=self.ffmpeg,
             lang=self.lang,
+            media_cache=self.media_cache,
+            thumbnail_cache=self.thumbnail_cache,
+            encoder_threads=encoding.encoder_threads(
+                self.scheduler.max_concurrent,
+                self.settings.get("encoder_threads", 0),
+            ),
+            resume_state=job.resume_state,
+            memory_budget=bool(self.settings.get("memory_budget", False)),
+            verify_outputs=self.settings.get("verify_outputs", "off"),
+            scratch_dir=self.settings.get("scratch_dir", ""),
+            cassette_mode=self.settings.get("cassette_mode", "off"),
+            cassette_dir=self.settings.get("cassette_dir") or os.path.join(CACHE_DIR, "cassettes"),
+            cachedir=self.extractor_cache.root if self.extractor_cache is not None else None,
+            route_pool=self.route_pool,
+            **self.audio_processing_kwargs(),
         )
 
-    def start_download(self) -> None:
-        if self.worker_thread is not None:
-            return
+    def audio_processing_kwargs(self) -> dict:
+        return {
+            "audio_filter": audio_filters.filter_chain(
+                loudnorm=bool(self.settings.get("loudnorm", False)),
+                target_lufs=self.settings.get("loudnorm_target", audio_filters.DEFAULT_LOUDNESS),
+                sample_rate=self.settings.get("sample_rate", 0),
+            ),
+            "trim_silence": bool(self.settings.get("trim_silence", False)),
+            "transcode_workers": self.settings.get("transcode_workers", 0),
+        }
 
+    def process_job_kwargs(self, job: scheduler.Job) -> dict:
+        """Picklable worker arguments; caches are described so the pool process can open its own.
+
+        Output names and the media cache stay in this process; the pool process
+        calls into them through BrejaxProcessWorker.
+        """
+        cache_config = {}
+        if self.media_cache is not None:
+            cache_config["media"] = True
+        if self.route_pool is not None:
+            # without the probe URL: health checks run in this process only
+            cache_config["routes"] = (
+                [route.spec for route in self.route_pool.routes],
+                self.route_pool.strategy,
+                self.route_pool.scope,
+                self.route_pool.min_speed,
+                self.route_pool.cooldown,
+            )
+        if self.thumbnail_cache is not None:
+            cache_config["thumbnails"] = (
+                self.thumbnail_cache.root,
+                self.thumbnail_cache.ffmpeg,
+                self.thumbnail_cache.max_size,
+            )
+        return dict(
+            job.options,
+            ffmpeg_path=self.ffmpeg,
+            lang=self.lang,
+            encoder_threads=encoding.encoder_threads(
+                self.scheduler.max_concurrent,
+                self.settings.get("encoder_threads", 0),
+            ),
+            resume_state=job.resume_state,
+            memory_budget=bool(self.settings.get("memory_budget", False)),
+            verify_outputs=self.settings.get("verify_outputs", "off"),
+            scratch_dir=self.settings.get("scratch_dir", ""),
+            cassette_mode=self.settings.get("cassette_mode", "off"),
+            cassette_dir=self.settings.get("cassette_dir") or os.path.join(CACHE_DIR, "cassettes"),
+            cachedir=self.extractor_cache.root if self.extractor_cache is not None else None,
+            cache_config=cache_config,
+            **self.audio_processing_kwargs(),
+        )
+
+    def start_download(self) -> None:
         url = self.url_input.text().strip()
         if not url or not utils.is_url(url):
             QtWidgets.QMessageBox.warning(
@@ -832,14 +2431,31 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         except Exception:
             quality = int(SETTINGS_DEFAULTS["quality"])
 
+        clip = self.clip_input.text().strip()
+        try:
+            clip_ranges, clip_chapters = clips.parse_clip(clip)
+        except ValueError as exc:
+            QtWidgets.QMessageBox.warning(
+                self,
+                self.t("invalid_clip_title"),
+                self.t("msg_invalid_clip").format(error=exc),
+            )
+            return
+
         format_choice = self.format_combo.currentText().lower()
         embed_metadata = self.embed_metadata_cb.isChecked()
         save_thumbnail = self.save_thumbnail_cb.isChecked()
 
+        extra_formats = [
+            item for item in self.settings.get("extra_formats", [])
+            if item.lower() != format_choice
+        ]
         need_ffmpeg = (
             format_choice in ["mp3", "m4a", "opus", "wav", "aac", "flac", "alac", "ogg", "mp4"]
             or embed_metadata
             or save_thumbnail
+            or bool(extra_formats)
+            or bool(clip_ranges or clip_chapters)
         )
         if need_ffmpeg and not self.ffmpeg:
             QtWidgets.QMessageBox.critical(
@@ -862,58 +2478,272 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
                 "resolution": self.resolution_combo.currentText(),
             }
         )
-        save_settings(self.settings)
 
-        self.log_output.clear()
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.set_download_controls_enabled(False)
-        self.set_status(self.t("status_preparing"), state="active")
-
-        self.log(f"URL: {url}")
+        if self.queue_idle():
+            self.log_output.clear()
+            self.queue_done_bytes = 0.0
+            self.progress_bar.setFormat("%p%")
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setValue(0)
+            self.set_status(self.t("status_preparing"), state="active")
+
+        priority = scheduler.PRIORITY_CLASSES[max(0, self.priority_combo.currentIndex())]
+        options = self.collect_job_options(url, out_folder, quality)
+        if self.job_store is not None:
+            # every instance sharing the store may pick it up; this one claims work in sync_shared_jobs
+            shared_id = self.job_store.submit(url, options, priority)
+            self.log(self.t("shared_job_queued").format(id=shared_id, priority=self.t(f"priority_{priority}"), url=url))
+            self.sync_shared_jobs()
+        else:
+            job = self.scheduler.submit(url, options, priority)
+            self.log(
+                self.t("job_queued").format(
+                    id=job.job_id,
+                    priority=self.t(f"priority_{job.priority}"),
+                    url=url,
+                )
+            )
         self.log(f"Output: {out_folder}")
-        self.log(f"Format: {self.format_combo.currentText()}")
+        self.log(f"Format: {' + '.join([self.format_combo.currentText()] + extra_formats)}")
         self.log(f"Quality: {quality} kbps")
         if format_choice == "mp4":
             self.log(f"Resolution: {self.resolution_combo.currentText()}")
+        if clip:
+            self.log(f"Clip: {clip}")
+
+        self.pump_queue()
+
+    def start_api(self) -> None:
+        if not self.settings.get("api_enabled", False):
+            return
+        self.api = api_server.ApiServer(
+            self.scheduler,
+            self.events,
+            self.api_job_options,
+            port=self.settings.get("api_port", 8765),
+            token=self.settings.get("api_token", ""),
+            max_queue=self.settings.get("api_max_queue", 100),
+        )
+        try:
+            self.api.start()
+        except OSError as exc:
+            self.api = None
+            self.log(self.t("api_failed").format(error=exc))
+            return
+        self.log(self.t("api_listening").format(address=self.api.address))
+
+    def api_job_options(self, payload: dict) -> dict:
+        """Worker options for an API submission; unset fields fall back to the saved settings.
+
+        Called from API server threads, so only the thread-safe settings store is read.
+        """
+        url = str(payload.get("url") or "").strip()
+        if not utils.is_url(url):
+            raise ValueError("url is missing or invalid")
+        out_folder = str(payload.get("out_folder") or self.settings.get("last_folder", ""))
+        if not os.path.isdir(out_folder):
+            raise ValueError("out_folder does not exist")
+
+        formats = {item.lower(): item for item in FORMAT_OPTIONS}
+        format_type = str(payload.get("format") or self.settings.get("format", "MP3")).lower()
+        if format_type not in formats:
+            raise ValueError(f"format must be one of: {', '.join(FORMAT_OPTIONS)}")
+        quality = str(payload.get("quality") or self.settings.get("quality", "192"))
+        if quality not in QUALITY_OPTIONS:
+            raise ValueError(f"quality must be one of: {', '.join(QUALITY_OPTIONS)}")
+        resolution = str(payload.get("resolution") or self.settings.get("resolution", RESOLUTION_OPTIONS[0]))
+        if resolution not in RESOLUTION_OPTIONS:
+            raise ValueError(f"resolution must be one of: {', '.join(RESOLUTION_OPTIONS)}")
+
+        def flag(key: str) -> bool:
+            value = payload.get(key)
+            return bool(self.settings.get(key, False) if value is None else value)
+
+        extra_formats = [
+            item.lower() for item in self.settings.get("extra_formats", [])
+            if item.lower() != format_type
+        ]
+        embed_metadata = flag("embed_metadata")
+        save_thumbnail = flag("save_thumbnail")
+        clip = str(payload.get("clip") or "").strip()
+        try:
+            clip_ranges, clip_chapters = clips.parse_clip(clip)
+        except ValueError as exc:
+            raise ValueError(f"clip: {exc}") from exc
+        needs_ffmpeg = (
+            format_type != "best audio (no convert)"
+            or embed_metadata
+            or save_thumbnail
+            or bool(extra_formats)
+            or bool(clip_ranges or clip_chapters)
+        )
+        if needs_ffmpeg and not self.ffmpeg:
+            raise ValueError("FFmpeg is required for this format but was not found")
+
+        return {
+            "url": url,
+            "out_folder": out_folder,
+            "quality": int(quality),
+            "playlist": flag("playlist"),
+            "format_type": format_type,
+            "embed_metadata": embed_metadata,
+            "save_thumbnail": save_thumbnail,
+            "resolution_label": resolution,
+            "stream_playlist": bool(self.settings.get("stream_playlist", False)),
+            "output_formats": [item.lower() for item in self.settings.get("extra_formats", [])],
+            "name_template": self.settings.get("name_template", naming.DEFAULT_TEMPLATE),
+            "encoding_preset": self.settings.get("encoding_preset", "balanced"),
+            "clip": clip,
+            "clip_precise": flag("clip_precise"),
+            "match_source_bitrate": bool(self.settings.get("match_source_bitrate", True)),
+            "pipe_encode": bool(self.settings.get("pipe_encode", False)),
+        }
 
-        self.worker = self.build_worker(url, out_folder, quality)
-        self.worker_thread = QtCore.QThread()
-        self.worker.moveToThread(self.worker_thread)
-        self.worker_thread.started.connect(self.worker.run)
-        self.worker.progress.connect(self.on_progress)
-        self.worker.progress_value.connect(self.on_progress_value)
-        self.worker.finished.connect(self.download_finished)
-        self.worker.error.connect(self.download_error)
-        self.worker.finished.connect(self.worker_thread.quit)
-        self.worker.error.connect(self.worker_thread.quit)
-        self.worker_thread.finished.connect(self.cleanup_worker)
-        self.worker_thread.start()
+    def on_queue_changed(self) -> None:
+        self.events.publish(
+            {
+                "type": "queue",
+                "pending": self.scheduler.pending_count(),
+                "running": [job.job_id for job in self.scheduler.running()],
+            }
+        )
+        self.sync_shared_jobs()
+        self.pump_queue()
+
+    def sync_shared_jobs(self) -> None:
+        """Record finished shared jobs in the store and claim new ones for free slots."""
+        if self.job_store is None:
+            return
+        busy = 0
+        try:
+            for job in self.scheduler.jobs():
+                if job.shared_id is None or job.shared_id in self.shared_reported:
+                    continue
+                if job.state in job_store.FINAL_STATES:
+                    self.job_store.complete(job.shared_id, job.state, job.stats)
+                    self.shared_reported.add(job.shared_id)
+                elif job.state != "paused":
+                    busy += 1
+            for claimed in self.job_store.claim(self.scheduler.max_concurrent - busy):
+                job = self.scheduler.submit(claimed["url"], claimed["options"], claimed["priority"])
+                job.shared_id = claimed["id"]
+                self.log(self.t("shared_job_claimed").format(id=job.job_id, shared=claimed["id"], url=claimed["url"]))
+        except Exception as exc:
+            self.log(self.t("shared_store_error").format(error=exc))
+
+    def live_shared_jobs(self) -> List[scheduler.Job]:
+        return [
+            job for job in self.scheduler.jobs()
+            if job.shared_id is not None
+            and job.shared_id not in self.shared_reported
+            and job.state not in job_store.FINAL_STATES
+        ]
+
+    def heartbeat_shared_jobs(self) -> None:
+        jobs = self.live_shared_jobs()
+        try:
+            lost = set(self.job_store.heartbeat([job.shared_id for job in jobs]))
+        except Exception as exc:
+            self.log(self.t("shared_store_error").format(error=exc))
+            return
+        for job in jobs:
+            if job.shared_id in lost:
+                # expired and taken over by another instance, or cancelled there
+                self.shared_reported.add(job.shared_id)
+                self.log(self.t("shared_lease_lost").format(id=job.job_id))
+                self.scheduler.cancel(job.job_id)
+        self.sync_shared_jobs()
+
+    def pump_queue(self) -> None:
+        # jobs cancelled or paused through the API are only flagged by the scheduler
+        for job_id, (worker, _thread) in self.active_jobs.items():
+            job = self.scheduler.get(job_id)
+            if job is not None and job.state == "cancelling":
+                worker.stop()
+            elif job is not None and job.state == "pausing":
+                worker.pause()
+
+        to_start, to_preempt = self.scheduler.pump()
+        for job in to_preempt:
+            active = self.active_jobs.get(job.job_id)
+            if active is not None:
+                active[0].pause()
+                self.log(self.t("job_preempted").format(id=job.job_id))
+        for job in to_start:
+            self.launch_job(job)
+        self.refresh_queue_controls()
+
+    def launch_job(self, job: scheduler.Job) -> None:
+        worker = self.build_worker(job)
+        thread = QtCore.QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_progress)
+        worker.progress_value.connect(self.on_progress_value)
+        worker.transfer.connect(self.on_transfer)
+        worker.job_progress.connect(self.on_job_progress)
+        worker.stats.connect(self.on_job_stats)
+        worker.finished.connect(self.download_finished)
+        worker.error.connect(self.download_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(self.cleanup_worker)
+        self.active_jobs[job.job_id] = (worker, thread)
+        self.log(self.t("job_started").format(id=job.job_id))
+        thread.start()
 
     def stop_download(self) -> None:
-        if self.worker:
-            self.worker.stop()
+        for job in self.scheduler.jobs():
+            if job.state in ("queued", "running", "preempting", "pausing", "paused"):
+                self.scheduler.cancel(job.job_id)
+        if self.active_jobs:
+            for worker, _thread in self.active_jobs.values():
+                worker.stop()
             self.log(self.t("download_stopped_log"))
             self.set_status(self.t("status_stopped"), state="warning")
         self.btn_stop.setEnabled(False)
 
     def cleanup_worker(self) -> None:
-        if self.worker_thread:
-            try:
-                self.worker_thread.deleteLater()
-            except Exception:
-                pass
-        if self.worker:
-            try:
-                self.worker.deleteLater()
-            except Exception:
-                pass
-        self.worker_thread = None
-        self.worker = None
-        self.set_download_controls_enabled(True)
+        job_id = self.job_id_for(self.sender())
+        self.transfers.pop(job_id, None)
+        finished = self.job_progress.pop(job_id, None)
+        job = self.scheduler.get(job_id) if job_id is not None else None
+        if finished is not None and job is not None and job.state == "done":
+            self.queue_done_bytes += finished["total_bytes"]
+        active = self.active_jobs.pop(job_id, None)
+        if active is not None:
+            for obj in active:
+                try:
+                    obj.deleteLater()
+                except Exception:
+                    pass
+        self.scheduler.forget_finished(keep=FINISHED_JOBS_KEPT)
+        self.pump_queue()
 
     def download_finished(self) -> None:
+        job_id = self.job_id_for(self.sender())
+        job = self.scheduler.get(job_id) if job_id is not None else None
+        if job is not None and job.resume_state.get("retry"):
+            retry = job.resume_state.pop("retry")
+            attempts = job.resume_state.get("verify_attempts", 0)
+            if attempts < VERIFY_RETRIES:
+                job.resume_state["verify_attempts"] = attempts + 1
+                # drop the resolved entries; their stream URLs may be stale by now
+                job.resume_state.pop("entries", None)
+                self.log(self.t("verify_requeued").format(id=job_id, count=len(retry)))
+                self.scheduler.requeue(job_id)
+                return
+            self.log(self.t("verify_gave_up").format(id=job_id, count=len(retry)))
+        if job_id is not None:
+            self.scheduler.finish(job_id, "done")
+            # a finished job never resumes; drop its resolved entries
+            self.scheduler.get(job_id).resume_state.clear()
+        if not self.queue_idle():
+            self.log(self.t("job_done").format(id=job_id))
+            return
+
         self.log(self.t("all_done_log"))
+        self.progress_bar.setFormat("%p%")
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(100)
         self.set_status(self.t("status_done"), state="success")
@@ -930,7 +2760,26 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
                 pass
 
     def download_error(self, message: str) -> None:
+        job_id = self.job_id_for(self.sender())
+        job = self.scheduler.get(job_id) if job_id is not None else None
+
+        if message == "__PAUSED__":
+            if job is not None and job.state == "preempting":
+                self.scheduler.requeue(job_id)
+            elif job is not None and job.state == "cancelling":
+                self.scheduler.finish(job_id, "stopped")
+            elif job_id is not None:
+                self.scheduler.mark_paused(job_id)
+                self.log(self.t("job_paused").format(id=job_id))
+                if not self.scheduler.running():
+                    self.set_status(self.t("status_paused"), state="warning")
+            return
+
         if message == "__STOPPED__":
+            if job_id is not None:
+                self.scheduler.finish(job_id, "stopped")
+            if not self.queue_idle():
+                return
             self.progress_bar.setVisible(False)
             self.set_status(self.t("status_stopped"), state="warning")
             QtWidgets.QMessageBox.information(
@@ -940,9 +2789,13 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
             )
             return
 
+        if job_id is not None:
+            self.scheduler.finish(job_id, "error")
         self.log(self.t("error_log").format(error=message))
-        self.progress_bar.setVisible(False)
         self.set_status(self.t("status_error"), state="error")
+        if not self.queue_idle():
+            return
+        self.progress_bar.setVisible(False)
         QtWidgets.QMessageBox.critical(
             self,
             self.t("error_title"),
@@ -950,9 +2803,23 @@ class BrejaxDownloaderUI(QtWidgets.QWidget):
         )
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
-        if self.worker:
-            self.worker.stop()
-        save_settings(self.settings)
+        if self.api is not None:
+            self.api.stop()
+        if self.job_store is not None:
+            # unfinished work goes back to the other instances right away instead of after the lease
+            self.shared_timer.stop()
+            try:
+                self.job_store.release([job.shared_id for job in self.live_shared_jobs()])
+                self.job_store.release_names()
+            except Exception:
+                pass
+        if self.route_pool is not None:
+            self.route_pool.close()
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+        for worker, _thread in self.active_jobs.values():
+            worker.stop()
+        self.settings.close()
         super().closeEvent(event)
 
 
@@ -970,4 +2837,5 @@ def brejax_main() -> None:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     brejax_main()
@@ -0,0 +1,278 @@
+import hmac
+import json
+import queue
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+import scheduler
+
+MAX_BODY_BYTES = 64 * 1024
+KEEPALIVE_SECONDS = 15.0
+RETRY_AFTER_SECONDS = 5
+
+_JOB_PATH = re.compile(r"^/jobs/(\d+)$")
+_PRIORITY_PATH = re.compile(r"^/jobs/(\d+)/priority$")
+_PAUSE_PATH = re.compile(r"^/jobs/(\d+)/(pause|resume)$")
+
+
+class EventHub:
+    """Fan-out of progress events to any number of SSE subscribers.
+
+    Every subscriber gets a bounded queue; a client that does not keep up
+    loses events instead of slowing down the downloads that publish them.
+    """
+
+    def __init__(self, backlog: int = 256):
+        self.backlog = max(1, backlog)
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+
+    def subscribe(self) -> queue.Queue:
+        events: queue.Queue = queue.Queue(maxsize=self.backlog)
+        with self._lock:
+            self._subscribers.append(events)
+        return events
+
+    def unsubscribe(self, events: queue.Queue) -> None:
+        with self._lock:
+            if events in self._subscribers:
+                self._subscribers.remove(events)
+
+    def publish(self, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                pass
+
+
+class ApiServer:
+    """Optional local HTTP control API on top of the job scheduler.
+
+    build_options turns a submit payload into worker options (raising
+    ValueError for invalid input); it must be safe to call from the server
+    threads. Submissions are refused with 429 once max_queue jobs are waiting.
+    """
+
+    def __init__(
+        self,
+        job_scheduler: scheduler.JobScheduler,
+        hub: EventHub,
+        build_options: Callable[[dict], dict],
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        token: str = "",
+        max_queue: int = 100,
+    ):
+        self.scheduler = job_scheduler
+        self.hub = hub
+        self.build_options = build_options
+        self.host = host
+        self.port = port
+        self.token = token or ""
+        self.max_queue = max(1, int(max_queue or 1))
+        self._submit_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        if self._httpd is None:
+            return ""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        httpd = ThreadingHTTPServer((self.host, self.port), _ApiHandler)
+        httpd.daemon_threads = True
+        httpd.api = self
+        self._httpd = httpd
+        self._stopping.clear()
+        self._thread = threading.Thread(target=httpd.serve_forever, name="api-server", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def authorized(self, header: Optional[str]) -> bool:
+        if not self.token:
+            return True
+        expected = f"Bearer {self.token}"
+        return hmac.compare_digest((header or "").encode("utf-8"), expected.encode("utf-8"))
+
+    def submit(self, payload: dict) -> Optional[scheduler.Job]:
+        """Queue a job from payload; None when the queue is full."""
+        _check_priority(payload)
+        options = self.build_options(payload)
+        with self._submit_lock:
+            if self.scheduler.pending_count() >= self.max_queue:
+                return None
+            return self.scheduler.submit(options["url"], options, payload.get("priority") or "normal")
+
+
+def _check_priority(payload: dict) -> None:
+    priority = payload.get("priority")
+    if priority is not None and not isinstance(priority, str):
+        raise ValueError(f"priority must be one of: {', '.join(scheduler.PRIORITY_CLASSES)}")
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    server_version = "BrejaxAPI/1"
+
+    @property
+    def api(self) -> ApiServer:
+        return self.server.api
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def send_json(self, status: int, payload, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self) -> Optional[dict]:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.send_json(413, {"error": "request body too large"})
+            return None
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except Exception:
+            payload = None
+        if not isinstance(payload, dict):
+            self.send_json(400, {"error": "expected a JSON object"})
+            return None
+        return payload
+
+    def check_auth(self) -> bool:
+        if self.api.authorized(self.headers.get("Authorization")):
+            return True
+        self.send_json(401, {"error": "missing or invalid token"})
+        return False
+
+    def do_GET(self) -> None:
+        if not self.check_auth():
+            return
+        path = self.path.split("?", 1)[0]
+        if path == "/jobs":
+            self.send_json(200, {"jobs": [job.as_dict() for job in self.api.scheduler.jobs()]})
+            return
+        if path == "/events":
+            self.stream_events()
+            return
+        match = _JOB_PATH.match(path)
+        if match:
+            job = self.api.scheduler.get(int(match.group(1)))
+            if job is None:
+                self.send_json(404, {"error": "unknown job"})
+            else:
+                self.send_json(200, job.as_dict())
+            return
+        self.send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if not self.check_auth():
+            return
+        path = self.path.split("?", 1)[0]
+        if path == "/jobs":
+            payload = self.read_json()
+            if payload is None:
+                return
+            try:
+                job = self.api.submit(payload)
+            except ValueError as exc:
+                self.send_json(400, {"error": str(exc)})
+                return
+            if job is None:
+                self.send_json(
+                    429,
+                    {"error": "queue is full"},
+                    headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+                )
+                return
+            self.send_json(201, job.as_dict())
+            return
+
+        match = _PRIORITY_PATH.match(path)
+        if match:
+            payload = self.read_json()
+            if payload is None:
+                return
+            job_id = int(match.group(1))
+            try:
+                _check_priority(payload)
+            except ValueError as exc:
+                self.send_json(400, {"error": str(exc)})
+                return
+            if not self.api.scheduler.set_priority(job_id, payload.get("priority")):
+                self.send_json(404, {"error": "unknown or finished job"})
+                return
+            self.send_json(200, self.api.scheduler.get(job_id).as_dict())
+            return
+
+        match = _PAUSE_PATH.match(path)
+        if match:
+            job_id = int(match.group(1))
+            if match.group(2) == "pause":
+                changed = self.api.scheduler.pause(job_id) is not None
+            else:
+                changed = self.api.scheduler.resume(job_id)
+            if not changed:
+                self.send_json(404, {"error": "unknown, finished or not paused job"})
+                return
+            self.send_json(200, self.api.scheduler.get(job_id).as_dict())
+            return
+        self.send_json(404, {"error": "not found"})
+
+    def do_DELETE(self) -> None:
+        if not self.check_auth():
+            return
+        match = _JOB_PATH.match(self.path.split("?", 1)[0])
+        if not match:
+            self.send_json(404, {"error": "not found"})
+            return
+        job = self.api.scheduler.cancel(int(match.group(1)))
+        if job is None:
+            self.send_json(404, {"error": "unknown job"})
+            return
+        self.send_json(200, job.as_dict())
+
+    def stream_events(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.close_connection = True
+
+        events = self.api.hub.subscribe()
+        try:
+            while not self.api._stopping.is_set():
+                try:
+                    event = events.get(timeout=KEEPALIVE_SECONDS)
+                    chunk = f"event: {event.get('type', 'message')}\ndata: {json.dumps(event)}\n\n"
+                except queue.Empty:
+                    chunk = ": keepalive\n\n"
+                self.wfile.write(chunk.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            self.api.hub.unsubscribe(events)
@@ -0,0 +1,80 @@
+import re
+from typing import List
+
+DEFAULT_LOUDNESS = -14.0
+DEFAULT_TRUE_PEAK = -1.0
+DEFAULT_LOUDNESS_RANGE = 11.0
+# loudnorm upsamples to 192 kHz internally; resample back when no rate is configured
+LOUDNORM_FALLBACK_RATE = 48000
+SILENCE_THRESHOLD_DB = -50
+# shorter silence at an edge is left alone
+SILENCE_MIN_SECONDS = 0.5
+
+_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_SILENCE = re.compile(r"silence_(start|end):\s*(-?\d+(?:\.\d+)?)")
+
+
+def filter_chain(
+    loudnorm: bool = False,
+    target_lufs: float = DEFAULT_LOUDNESS,
+    sample_rate: int = 0,
+) -> str:
+    """Build the ffmpeg audio filter chain for the optional processing stage.
+
+    Loudness normalization uses single-pass (dynamic) EBU R128 loudnorm, so
+    analysis and encode happen in the same ffmpeg run as the conversion.
+    Silence trimming is not part of the chain: its cut points come from a
+    separate silencedetect pass (see edge_trim). Returns "" if nothing is
+    enabled.
+    """
+    filters: List[str] = []
+    if loudnorm:
+        filters.append(
+            f"loudnorm=I={float(target_lufs):.1f}:TP={DEFAULT_TRUE_PEAK}:LRA={DEFAULT_LOUDNESS_RANGE}"
+        )
+    rate = int(sample_rate or 0)
+    if loudnorm and not rate:
+        rate = LOUDNORM_FALLBACK_RATE
+    if rate:
+        filters.append(f"aresample={rate}")
+    return ",".join(filters)
+
+
+def silence_detect_filter() -> str:
+    """Filter for the analysis pass that finds the silent edges of a track."""
+    return f"silencedetect=noise={SILENCE_THRESHOLD_DB}dB:d={SILENCE_MIN_SECONDS}"
+
+
+def edge_trim(log: str) -> str:
+    """atrim filter that cuts the silent start and end found by a silencedetect pass, "" if there are none.
+
+    The pass only decodes and streams, so memory stays constant however long
+    the track is (reversing the track to trim its end would hold all of it).
+    Silence inside the track is kept.
+    """
+    match = _DURATION.search(log)
+    duration = int(match.group(1)) * 3600 + int(match.group(2)) * 60 + float(match.group(3)) if match else None
+    periods = []
+    for kind, value in _SILENCE.findall(log):
+        if kind == "start":
+            periods.append([float(value), None])
+        elif periods:
+            periods[-1][1] = float(value)
+    if not periods:
+        return ""
+
+    start = 0.0
+    first_start, first_end = periods[0]
+    if first_start <= 0.05 and first_end is not None:
+        start = first_end
+    end = None
+    last_start, last_end = periods[-1]
+    # ffmpeg either leaves the final period open or closes it at the end of the stream
+    if last_start > start and (last_end is None or (duration and last_end >= duration - 0.05)):
+        end = last_start
+    if not start and end is None:
+        return ""
+    bounds = [f"start={start:.3f}"] if start else []
+    if end is not None:
+        bounds.append(f"end={end:.3f}")
+    return f"atrim={':'.join(bounds)},asetpts=PTS-STARTPTS"
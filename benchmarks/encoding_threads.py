@@ -0,0 +1,90 @@
+"""Encoder throughput at different concurrent job counts.
+
+Encodes a synthetic audio source with N parallel ffmpeg processes, each limited
+to its share of the CPU via encoding.encoder_threads(), and prints the achieved
+throughput as seconds of audio encoded per wall-clock second.
+
+    python benchmarks/encoding_threads.py --codec mp3 --preset balanced
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import encoding  # noqa: E402
+import utils  # noqa: E402
+
+ENCODERS = {
+    "mp3": (["-c:a", "libmp3lame", "-b:a", "192k"], "mp3"),
+    "aac": (["-c:a", "aac", "-b:a", "192k"], "m4a"),
+    "opus": (["-c:a", "libopus", "-b:a", "192k"], "opus"),
+    "vorbis": (["-c:a", "libvorbis", "-b:a", "192k"], "ogg"),
+    "flac": (["-c:a", "flac"], "flac"),
+}
+
+
+def make_source(ffmpeg: str, folder: str, seconds: int) -> str:
+    path = os.path.join(folder, "source.wav")
+    subprocess.run(
+        [ffmpeg, "-y", "-loglevel", "error", "-f", "lavfi",
+         "-i", f"sine=frequency=440:duration={seconds}:sample_rate=48000",
+         "-ac", "2", path],
+        check=True,
+    )
+    return path
+
+
+def encode(ffmpeg: str, source: str, target: str, codec: str, preset: str, threads: int) -> None:
+    codec_opts, _ext = ENCODERS[codec]
+    subprocess.run(
+        [ffmpeg, "-y", "-loglevel", "error", "-i", source]
+        + codec_opts
+        + encoding.encoder_args(codec, preset, threads)
+        + [target],
+        check=True,
+    )
+
+
+def run(ffmpeg: str, source: str, folder: str, codec: str, preset: str, jobs: int, seconds: int) -> float:
+    threads = encoding.encoder_threads(jobs)
+    _codec_opts, ext = ENCODERS[codec]
+    targets = [os.path.join(folder, f"out_{jobs}_{i}.{ext}") for i in range(jobs)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(lambda t: encode(ffmpeg, source, t, codec, preset, threads), targets))
+    elapsed = time.perf_counter() - start
+    return (jobs * seconds) / elapsed if elapsed else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--codec", choices=sorted(ENCODERS), default="mp3")
+    parser.add_argument("--preset", choices=encoding.ENCODING_PRESETS, default="balanced")
+    parser.add_argument("--seconds", type=int, default=300, help="length of the synthetic source")
+    parser.add_argument("--jobs", type=int, nargs="*", help="job counts to test")
+    args = parser.parse_args()
+
+    ffmpeg = utils.find_ffmpeg()
+    if not ffmpeg:
+        sys.exit("ffmpeg not found")
+
+    cores = encoding.cpu_count()
+    job_counts = args.jobs or sorted({1, 2, 4, cores})
+    print(f"cpus={cores} codec={args.codec} preset={args.preset} source={args.seconds}s")
+    with tempfile.TemporaryDirectory(prefix="brejax_bench_") as folder:
+        source = make_source(ffmpeg, folder, args.seconds)
+        for jobs in job_counts:
+            speed = run(ffmpeg, source, folder, args.codec, args.preset, jobs, args.seconds)
+            print(
+                f"jobs={jobs:<3} threads/job={encoding.encoder_threads(jobs):<3} "
+                f"throughput={speed:8.1f}x realtime"
+            )
+
+
+if __name__ == "__main__":
+    main()
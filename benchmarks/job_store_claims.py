@@ -0,0 +1,95 @@
+"""Throughput of N instances splitting one shared job store, and a duplicate check.
+
+Every instance is a separate process that claims jobs for its slots, "runs"
+each one for --work seconds while sending heartbeats, and records the
+outcome, like the GUI does. Reports jobs per second, the speedup over one
+instance and how many jobs ran more than once (expected: 0).
+
+    python benchmarks/job_store_claims.py --jobs 400 --instances 1 2 4 8 --slots 2 --work 0.05
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job_store  # noqa: E402
+
+
+def instance(path: str, slots: int, work: float, wal: bool, results) -> None:
+    store = job_store.SharedJobStore(path, lease_seconds=30, wal=wal)
+    ran = []
+    running = {}
+    while True:
+        now = time.monotonic()
+        for job_id, until in list(running.items()):
+            if until <= now:
+                del running[job_id]
+                store.complete(job_id, "done")
+                ran.append(job_id)
+        claimed = store.claim(slots - len(running))
+        for job in claimed:
+            running[job["id"]] = now + work
+        if not running and not claimed:
+            break
+        store.heartbeat(running)
+        time.sleep(min(work / 4, 0.01))
+    store.close()
+    results.put(ran)
+
+
+def run(jobs: int, instances: int, slots: int, work: float, wal: bool) -> tuple:
+    folder = tempfile.mkdtemp(prefix="jobstore_")
+    path = os.path.join(folder, "jobs.sqlite")
+    store = job_store.SharedJobStore(path, wal=wal)
+    for index in range(jobs):
+        store.submit(f"https://example.invalid/{index}", {"index": index})
+    store.close()
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=instance, args=(path, slots, work, wal, results))
+        for _ in range(instances)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    ran = []
+    for _ in processes:
+        ran.extend(results.get())
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    with sqlite3.connect(path) as db:
+        done = db.execute("SELECT COUNT(*) FROM jobs WHERE state = 'done'").fetchone()[0]
+    return elapsed, len(ran) - len(set(ran)), done
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--instances", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--slots", type=int, default=2, help="concurrent jobs per instance")
+    parser.add_argument("--work", type=float, default=0.05, help="simulated seconds per job")
+    parser.add_argument("--no-wal", action="store_true", help="rollback journal, as used on network shares")
+    args = parser.parse_args()
+
+    base = None
+    for count in args.instances:
+        elapsed, duplicates, done = run(args.jobs, count, args.slots, args.work, not args.no_wal)
+        rate = args.jobs / elapsed
+        base = base or rate / count
+        print(
+            f"{count:3d} instance(s): {rate:8.1f} jobs/s   speedup {rate / base:5.2f}x   "
+            f"done {done}/{args.jobs}   duplicates {duplicates}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Per-event cost of the download progress path, before and after structured progress.
+
+"before" replays what every progress_hook call used to do: build the status
+string from yt-dlp's preformatted fields, then strip ANSI codes twice (log and
+status) with a regex compiled on each call. "after" runs the shipped
+BrejaxWorker.progress_hook, which drops samples closer together than
+TRANSFER_EMIT_INTERVAL and feeds the rest to the transfer signal, the progress
+model and the job progress throttle, with a receiver that keeps the latest sample like the GUI's
+on_transfer, and renders it with the shipped format_transfer once per render
+tick (as the GUI does every TRANSFER_RENDER_INTERVAL_MS). The GUI receives the
+signal through a queued connection; posting that event is not included.
+Also compares the old and new get_video_format.
+
+    python benchmarks/progress_events.py --events 200000 --events-per-render 25
+"""
+import argparse
+import importlib.util
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import utils  # noqa: E402
+
+ANSI_ESCAPE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
+
+
+CHUNK_BYTES = 16384
+
+
+def make_event(index: int, total: int) -> dict:
+    downloaded = (index + 1) * CHUNK_BYTES
+    return {
+        "status": "downloading",
+        "downloaded_bytes": downloaded,
+        "total_bytes": total,
+        "speed": 2_500_000.0,
+        "eta": 12,
+        "_percent_str": f"\x1b[0;94m{downloaded * 100 / total:5.1f}%\x1b[0m",
+        "_speed_str": "\x1b[0;32m   2.38MiB/s\x1b[0m",
+        "_eta_str": "\x1b[0;33m00:12\x1b[0m",
+        "filename": "Some fairly long video title - official audio.webm",
+        "info_dict": {"title": "Some fairly long video title - official audio"},
+    }
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("brejax_app", os.path.join(ROOT, "YT-DL.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["brejax_app"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def old_strip(text: str) -> str:
+    ansi_escape = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
+    return ansi_escape.sub("", str(text))
+
+
+def old_get_video_format(res_label: str) -> str:
+    label = (res_label or "").strip().lower()
+    mapping = {
+        "auto (best)": "bestvideo+bestaudio/best",
+        "360p": "bv[height<=360]+ba/best",
+        "480p": "bv[height<=480]+ba/best",
+        "720p": "bv[height<=720]+ba/best",
+        "1080p": "bv[height<=1080]+ba/best",
+        "1440p": "bv[height<=1440]+ba/best",
+        "2160p (4k)": "bv[height<=2160]+ba/best",
+    }
+    for k, v in mapping.items():
+        if k == label:
+            return v
+    return "bestvideo+bestaudio/best"
+
+
+def before(data: dict, sink: list) -> None:
+    info = data.get("info_dict") or {}
+    title = info.get("title") if isinstance(info, dict) else None
+    downloaded = data.get("downloaded_bytes") or 0
+    total = data.get("total_bytes") or data.get("total_bytes_estimate") or 0
+    percent = max(0, min(100, int((downloaded / total) * 100))) if total else 0
+    pct = (data.get("_percent_str") or "").strip()
+    speed = (data.get("_speed_str") or "").strip()
+    eta = (data.get("_eta_str") or "").strip()
+    parts = []
+    if title:
+        parts.append(f"Downloading: {title}")
+    if pct:
+        parts.append(pct)
+    if speed:
+        parts.append(f"@ {speed}")
+    if eta:
+        parts.append(f"ETA {eta}")
+    message = " | ".join(parts)
+    logged = old_strip(message)
+    status = old_strip(message)
+    sink.append((percent, logged, status))
+
+
+def make_worker(app, out_folder: str, total: int, latest: dict):
+    """A worker that is never started; only its progress_hook is driven."""
+    worker = app.BrejaxWorker(
+        "https://www.youtube.com/watch?v=benchmark",
+        out_folder,
+        192,
+        False,
+        embed_metadata=False,
+        save_thumbnail=False,
+    )
+    worker.progress_model.start_entry({"id": "benchmark", "filesize": total})
+    direct = app.QtCore.Qt.ConnectionType.DirectConnection
+
+    def on_transfer(*sample) -> None:
+        latest[1] = sample
+
+    worker.transfer.connect(on_transfer, direct)
+    worker.job_progress.connect(lambda snapshot: latest.__setitem__("job", snapshot), direct)
+    return worker
+
+
+def timed(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / count * 1e9
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--events-per-render", type=int, default=25,
+                        help="progress events arriving per render tick and job")
+    args = parser.parse_args()
+
+    # one file that completes with the last event
+    total = args.events * CHUNK_BYTES
+    events = [make_event(index, total) for index in range(args.events)]
+    app = load_app()
+    out_folder = tempfile.mkdtemp(prefix="progress_events_")
+
+    def run_before():
+        sink = []
+        for data in events:
+            before(data, sink)
+            if len(sink) > 1000:
+                sink.clear()
+
+    latest = {}
+    worker = make_worker(app, out_folder, total, latest)
+
+    def run_after():
+        rendered = []
+        for index, data in enumerate(events):
+            worker.progress_hook(data)
+            if index % args.events_per_render == 0:
+                rendered.append(app.format_transfer(*latest[1]))
+                if len(rendered) > 1000:
+                    rendered.clear()
+
+    labels = [label.lower() for label in ("Auto (best)", "720p", "2160p (4K)", "unknown")] * (args.events // 4)
+
+    def run_old_format():
+        for label in labels:
+            old_get_video_format(label)
+
+    def run_new_format():
+        for label in labels:
+            utils.get_video_format(label)
+
+    old_ns = timed(run_before, len(events))
+    new_ns = timed(run_after, len(events))
+    print(f"progress event  before: {old_ns:8.0f} ns   after: {new_ns:8.0f} ns   ({old_ns / new_ns:.1f}x)")
+    old_ns = timed(run_old_format, len(labels))
+    new_ns = timed(run_new_format, len(labels))
+    print(f"get_video_format before: {old_ns:8.0f} ns   after: {new_ns:8.0f} ns   ({old_ns / new_ns:.1f}x)")
+    shutil.rmtree(out_folder, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Offline throughput of a whole download job, replayed from a recorded cassette.
+
+Record a job once (needs network), then replay it as often as needed without
+network, at full speed or with the recorded timing:
+
+    python benchmarks/replay_job.py --record --url "https://www.youtube.com/watch?v=..." --cassettes cassettes
+    python benchmarks/replay_job.py --url "https://www.youtube.com/watch?v=..." --cassettes cassettes --runs 5
+
+Each run reports the time until the first media byte (extraction), the
+transfer time and the time from the last byte to the end of the job
+(post-processing), measured from the worker's signals.
+"""
+import argparse
+import importlib.util
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import utils  # noqa: E402
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("brejax_app", os.path.join(ROOT, "YT-DL.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["brejax_app"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_job(app, args, mode: str) -> dict:
+    out_folder = tempfile.mkdtemp(prefix="replay_out_")
+    marks = {"start": time.perf_counter()}
+    errors = []
+    worker = app.BrejaxWorker(
+        args.url,
+        out_folder,
+        args.quality,
+        args.playlist,
+        format_type=args.format,
+        embed_metadata=False,
+        save_thumbnail=False,
+        ffmpeg_path=utils.find_ffmpeg(),
+        verify_outputs="off",
+        cassette_mode=mode,
+        cassette_dir=args.cassettes,
+    )
+    direct = app.QtCore.Qt.ConnectionType.DirectConnection
+
+    def on_transfer(*_sample) -> None:
+        marks.setdefault("first_byte", time.perf_counter())
+        marks["last_byte"] = time.perf_counter()
+
+    worker.transfer.connect(on_transfer, direct)
+    worker.error.connect(errors.append, direct)
+    worker.run()
+    marks["end"] = time.perf_counter()
+    shutil.rmtree(out_folder, ignore_errors=True)
+    if errors:
+        raise SystemExit(f"job failed: {errors[0]}")
+
+    first = marks.get("first_byte", marks["end"])
+    last = marks.get("last_byte", marks["end"])
+    return {
+        "extract": first - marks["start"],
+        "transfer": last - first,
+        "post": marks["end"] - last,
+        "total": marks["end"] - marks["start"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--cassettes", default="cassettes", help="folder with one cassette per URL")
+    parser.add_argument("--record", action="store_true", help="record the job instead of replaying it")
+    parser.add_argument("--realtime", action="store_true", help="replay with the recorded timing")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--format", default="mp3")
+    parser.add_argument("--quality", type=int, default=192)
+    parser.add_argument("--playlist", action="store_true")
+    args = parser.parse_args()
+
+    app = load_app()
+    if args.record:
+        result = run_job(app, args, "record")
+        print(f"recorded in {result['total']:.2f}s")
+        return 0
+
+    mode = "replay" if args.realtime else "replay-fast"
+    results = [run_job(app, args, mode) for _ in range(max(1, args.runs))]
+    for key in ("extract", "transfer", "post", "total"):
+        values = [result[key] for result in results]
+        print(f"{key:8} median {statistics.median(values):7.3f}s   min {min(values):7.3f}s   max {max(values):7.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
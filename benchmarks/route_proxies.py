@@ -0,0 +1,194 @@
+"""Aggregate throughput over a pool of local proxy stand-ins with per-route throttling.
+
+Starts a local origin server and --proxies forwarding proxies. Each proxy
+shares one rate limit (--rate KiB/s) between all its connections, like a
+per-IP throttle. Optionally the first proxy is --slow times slower than the
+others, or answers 429 to every request. Then --jobs downloads run at the
+same time through a route_pool.RoutePool with 1..N routes, fetching the file
+in ranged requests through YoutubeDL.urlopen the way the app does. Reports
+the aggregate rate per pool size and the state of every route afterwards.
+
+    python benchmarks/route_proxies.py --proxies 4 --jobs 4 --rate 2048 --slow 20 --min-speed 512
+    python benchmarks/route_proxies.py --proxies 4 --scope request --blocked
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yt_dlp  # noqa: E402
+from yt_dlp.networking import Request  # noqa: E402
+
+import route_pool  # noqa: E402
+
+CHUNK = 64 * 1024
+RANGE_BYTES = 2 * 1024 * 1024
+
+
+class Origin(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        size = self.server.size
+        start, end = 0, size - 1
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match:
+            start = int(match.group(1))
+            end = min(end, int(match.group(2))) if match.group(2) else end
+        self.send_response(206 if match else 200)
+        if match:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Type", "audio/webm")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        remaining = end - start + 1
+        block = b"\0" * CHUNK
+        while remaining > 0:
+            self.wfile.write(block[:min(CHUNK, remaining)])
+            remaining -= CHUNK
+
+
+class Bucket:
+    """Token bucket shared by every connection through one proxy."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.next_free = time.monotonic()
+
+    def take(self, size: int) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.next_free = max(self.next_free, now) + size / self.rate
+            wait = self.next_free - now
+        if wait > 0:
+            time.sleep(wait)
+
+
+class Proxy(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.server.blocked:
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        upstream = urllib.request.Request(self.path, headers={"Range": self.headers.get("Range") or ""})
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        with opener.open(upstream) as response:
+            self.send_response(response.status)
+            for key in ("Content-Range", "Content-Type", "Content-Length"):
+                if response.headers.get(key):
+                    self.send_header(key, response.headers[key])
+            self.end_headers()
+            while True:
+                data = response.read(CHUNK)
+                if not data:
+                    break
+                self.server.bucket.take(len(data))
+                self.wfile.write(data)
+
+
+def serve(handler, **attributes) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    for key, value in attributes.items():
+        setattr(server, key, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def download(pool: route_pool.RoutePool, url: str, size: int, results: list) -> None:
+    usage = {}
+    route = pool.acquire()
+    try:
+        with yt_dlp.YoutubeDL(dict(route.ydl_options(), quiet=True)) as ydl:
+            pool.attach(ydl, route, usage)
+            offset = 0
+            while offset < size:
+                end = min(size, offset + RANGE_BYTES) - 1
+                response = ydl.urlopen(Request(url, headers={"Range": f"bytes={offset}-{end}"}))
+                while response.read(CHUNK):
+                    pass
+                response.close()
+                offset = end + 1
+        results.append(size)
+    except Exception as exc:
+        results.append(exc)
+    finally:
+        pool.release(route)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--proxies", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent downloads per round")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds of --jobs downloads per pool size")
+    parser.add_argument("--size", type=float, default=8, help="MiB per download")
+    parser.add_argument("--rate", type=float, default=2048, help="KiB/s per proxy")
+    parser.add_argument("--slow", type=float, default=1, help="the first proxy is this many times slower")
+    parser.add_argument("--blocked", action="store_true", help="the first proxy answers 429 to everything")
+    parser.add_argument("--min-speed", type=float, default=0, help="route_min_speed_kb for the pool")
+    parser.add_argument("--strategy", choices=route_pool.ROUTE_STRATEGIES, default="least-loaded")
+    parser.add_argument("--scope", choices=route_pool.ROUTE_SCOPES, default="job")
+    args = parser.parse_args()
+
+    size = int(args.size * 1024 * 1024)
+    origin = serve(Origin, size=size)
+    url = f"http://127.0.0.1:{origin.server_address[1]}/media.webm"
+    proxies = []
+    for index in range(args.proxies):
+        rate = args.rate * 1024 / (args.slow if index == 0 else 1)
+        server = serve(Proxy, bucket=Bucket(rate), blocked=args.blocked and index == 0)
+        proxies.append(f"http://127.0.0.1:{server.server_address[1]}")
+
+    counts = sorted({1, args.proxies} | {count for count in (2, 4, 8) if count < args.proxies})
+    for count in counts:
+        pool = route_pool.RoutePool(
+            proxies[:count],
+            strategy=args.strategy,
+            scope=args.scope,
+            min_speed=args.min_speed * 1024,
+            cooldown=60,
+        )
+        done = 0
+        failed = 0
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            results = []
+            threads = [
+                threading.Thread(target=download, args=(pool, url, size, results))
+                for _ in range(args.jobs)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            done += sum(item for item in results if isinstance(item, int))
+            failed += sum(1 for item in results if not isinstance(item, int))
+        elapsed = time.perf_counter() - started
+        print(f"{count} route(s): {done / elapsed / 1024 / 1024:7.2f} MiB/s   failed downloads {failed}")
+        for item in pool.snapshot():
+            print(
+                f"    {item['route']:28} {item['bytes'] / 1024 / 1024:8.1f} MiB   "
+                f"{item['speed'] / 1024:8.0f} KiB/s   throttles {item['throttles']}   cooldown {item['cooldown']:.0f}s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import yt_dlp
+from yt_dlp.networking import Request, Response
+from yt_dlp.networking.exceptions import HTTPError, TransportError
+
+CASSETTE_MODES = ["off", "record", "replay", "replay-fast"]
+INDEX_NAME = "index.json"
+# 2: headers are a list of [name, value] pairs (1 kept a dict, which lost repeated headers)
+FORMAT_VERSION = 2
+CHUNK_SIZE = 64 * 1024
+# dropped when replaying: the body is stored decoded and its length is sent again
+HOP_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection", "keep-alive"}
+
+
+def cassette_file(folder: str, url: str) -> str:
+    """Cassette path of a job URL, so record and replay runs of the same URL meet."""
+    return os.path.join(folder, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".zip")
+
+
+def _data_digest(data) -> Optional[str]:
+    if data is None:
+        return None
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if not isinstance(data, (bytes, bytearray)):
+        # file-like or iterable request bodies are not matched by content
+        return "stream"
+    return hashlib.sha1(data).hexdigest()
+
+
+def _loose_url(url: str) -> str:
+    # the query often carries per-request values (nonces, timestamps)
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _request_key(request: Request) -> Tuple[str, str, str, Optional[str]]:
+    return (
+        request.method,
+        request.url,
+        request.headers.get("Range") or "",
+        _data_digest(request.data),
+    )
+
+
+class _Tee:
+    """File-like view of a response body that copies everything read into a spool file."""
+
+    def __init__(self, response: Response, on_done):
+        self._response = response
+        self._on_done = on_done
+        self._spool = tempfile.TemporaryFile()
+        self._digest = hashlib.sha1()
+        self._size = 0
+        self._started = time.monotonic()
+        self._done = False
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        data = self._response.read(amt)
+        if data:
+            self._spool.write(data)
+            self._digest.update(data)
+            self._size += len(data)
+        if not data or amt is None or amt < 0:
+            self._finish()
+        return data
+
+    def _finish(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        self._spool.seek(0)
+        self._on_done(self._spool, self._digest.hexdigest(), self._size, time.monotonic() - self._started)
+        self._spool.close()
+
+    def close(self) -> None:
+        # a body closed early (pause, stop) is recorded as far as it was read
+        self._finish()
+        self._response.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._done
+
+
+class Recorder:
+    """Captures every request a YoutubeDL instance makes into a cassette (a zip file).
+
+    The index keeps request, status, headers and timing of each exchange;
+    bodies are stored once per content under bodies/<sha1>. Media bodies are
+    stored as they are, everything else is deflated.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(prefix=".cassette_", suffix=".zip", dir=folder)
+        os.close(fd)
+        self._zip = zipfile.ZipFile(self._temp_path, "w")
+        self._lock = threading.Lock()
+        self._bodies = set()
+        self._exchanges: List[dict] = []
+        self._started = time.monotonic()
+
+    def attach(self, ydl: yt_dlp.YoutubeDL) -> None:
+        urlopen = ydl.urlopen
+
+        def recording_urlopen(req):
+            if not isinstance(req, Request):
+                req = Request(req) if isinstance(req, str) else req
+            if not isinstance(req, Request):
+                return urlopen(req)
+            method, url, byte_range, data = _request_key(req)
+            exchange = {
+                "method": method,
+                "url": url,
+                "range": byte_range,
+                "data": data,
+                "at": round(time.monotonic() - self._started, 4),
+            }
+            sent = time.monotonic()
+            try:
+                response = urlopen(req)
+            except HTTPError as exc:
+                exchange["wait"] = round(time.monotonic() - sent, 4)
+                body = exc.response.read()
+                self._store(exchange, exc.response, body=body)
+                raise HTTPError(
+                    Response(_BytesBody(body), exc.response.url, exc.response.headers,
+                             exc.response.status, exc.response.reason)
+                ) from None
+            exchange["wait"] = round(time.monotonic() - sent, 4)
+            return Response(
+                _Tee(response, lambda spool, digest, size, seconds: self._store(
+                    exchange, response, spool=spool, digest=digest, size=size, seconds=seconds)),
+                response.url,
+                response.headers,
+                response.status,
+                response.reason,
+            )
+
+        ydl.urlopen = recording_urlopen
+
+    def _store(self, exchange: dict, response: Response, *, body: Optional[bytes] = None,
+               spool=None, digest: str = "", size: int = 0, seconds: float = 0.0) -> None:
+        # pairs, so repeated headers (Set-Cookie) are all kept
+        headers = [[name, value] for name, value in response.headers.items()]
+        if body is not None:
+            digest = hashlib.sha1(body).hexdigest()
+            size = len(body)
+        content_type = next((value for name, value in headers if name.lower() == "content-type"), "").lower()
+        stored = content_type.startswith(("audio/", "video/", "image/"))
+        exchange.update(
+            {
+                "status": response.status,
+                "reason": response.reason,
+                "final_url": response.url,
+                "headers": headers,
+                "body": digest,
+                "size": size,
+                "seconds": round(seconds, 4),
+            }
+        )
+        with self._lock:
+            if self._zip is None:
+                return
+            if digest not in self._bodies:
+                self._bodies.add(digest)
+                info = zipfile.ZipInfo(f"bodies/{digest}")
+                info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                # the size is not known up front; bodies of 2 GiB and more need zip64
+                with self._zip.open(info, "w", force_zip64=True) as target:
+                    if body is not None:
+                        target.write(body)
+                    else:
+                        for chunk in iter(lambda: spool.read(CHUNK_SIZE), b""):
+                            target.write(chunk)
+            self._exchanges.append(exchange)
+
+    def save(self) -> str:
+        with self._lock:
+            if self._zip is None:
+                return self.path
+            self._exchanges.sort(key=lambda item: item["at"])
+            self._zip.writestr(
+                INDEX_NAME,
+                json.dumps({"version": FORMAT_VERSION, "exchanges": self._exchanges}, indent=1),
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+            self._zip.close()
+            self._zip = None
+        os.replace(self._temp_path, self.path)
+        return self.path
+
+
+class _BytesBody:
+    def __init__(self, data: bytes):
+        self._data = data
+        self._offset = 0
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        end = len(self._data) if amt is None or amt < 0 else self._offset + amt
+        chunk = self._data[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        pass
+
+
+class Cassette:
+    """A recorded cassette opened for replay; exchanges are matched in recorded order."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "r")
+        self._zip_lock = threading.Lock()
+        index = json.loads(self._zip.read(INDEX_NAME).decode("utf-8"))
+        self.exchanges: List[dict] = index.get("exchanges") or []
+        self._lock = threading.Lock()
+        self._exact: Dict[tuple, deque] = {}
+        self._loose: Dict[tuple, deque] = {}
+        for number, exchange in enumerate(self.exchanges):
+            exact = (exchange["method"], exchange["url"], exchange.get("range") or "", exchange.get("data"))
+            loose = (exchange["method"], _loose_url(exchange["url"]), exchange.get("range") or "")
+            self._exact.setdefault(exact, deque()).append(number)
+            self._loose.setdefault(loose, deque()).append(number)
+
+    def match(self, request: Request) -> Optional[int]:
+        method, url, byte_range, data = _request_key(request)
+        with self._lock:
+            for table, key in (
+                (self._exact, (method, url, byte_range, data)),
+                (self._loose, (method, _loose_url(url), byte_range)),
+            ):
+                numbers = table.get(key)
+                if numbers:
+                    # the last recording of a request answers every further repeat
+                    return numbers.popleft() if len(numbers) > 1 else numbers[0]
+        return None
+
+    def body(self, exchange: dict) -> bytes:
+        if not exchange.get("body"):
+            return b""
+        with self._zip_lock:
+            return self._zip.read(f"bodies/{exchange['body']}")
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class ReplayServer:
+    """Local stand-in for the recorded hosts.
+
+    attach() rewrites every request of a YoutubeDL instance to this server,
+    which answers with the recorded exchange. With realtime, the recorded
+    time to first byte and transfer rate are reproduced; otherwise bodies are
+    sent at full speed.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.cassette = Cassette(path)
+        self.realtime = realtime
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ReplayHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.replay = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="cassette-replay", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def attach(self, ydl: yt_dlp.YoutubeDL) -> None:
+        urlopen = ydl.urlopen
+
+        def replaying_urlopen(req):
+            if not isinstance(req, Request):
+                req = Request(req) if isinstance(req, str) else req
+            if not isinstance(req, Request):
+                raise TransportError("cassette replay cannot handle this request type")
+            number = self.cassette.match(req)
+            if number is None:
+                raise TransportError(f"no recorded response for {req.method} {req.url}")
+            exchange = self.cassette.exchanges[number]
+            # never through a configured proxy: the stand-in server is local
+            local = Request(f"{self.address}/{number}", proxies={"all": "__noproxy__"})
+            try:
+                response = urlopen(local)
+            except HTTPError as exc:
+                response = exc.response
+            replayed = Response(
+                response,
+                exchange.get("final_url") or req.url,
+                _header_message(_replay_headers(exchange)),
+                exchange["status"],
+                exchange.get("reason"),
+            )
+            if exchange["status"] >= 400:
+                raise HTTPError(replayed)
+            return replayed
+
+        ydl.urlopen = replaying_urlopen
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.cassette.close()
+
+
+def _replay_headers(exchange: dict) -> List[Tuple[str, str]]:
+    recorded = exchange.get("headers") or []
+    if isinstance(recorded, dict):
+        # format version 1
+        recorded = recorded.items()
+    headers = [(name, value) for name, value in recorded if name.lower() not in HOP_HEADERS]
+    headers.append(("Content-Length", str(exchange.get("size") or 0)))
+    return headers
+
+
+def _header_message(headers: List[Tuple[str, str]]) -> Message:
+    message = Message()
+    for name, value in headers:
+        message[name] = value
+    return message
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "BrejaxReplay/1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        replay: ReplayServer = self.server.replay
+        try:
+            exchange = replay.cassette.exchanges[int(self.path.strip("/"))]
+        except (ValueError, IndexError):
+            self.send_error(404)
+            return
+        body = replay.cassette.body(exchange)
+        if replay.realtime and exchange.get("wait"):
+            time.sleep(exchange["wait"])
+        self.send_response(exchange["status"], exchange.get("reason"))
+        for key, value in _replay_headers(exchange):
+            self.send_header(key, value)
+        self.end_headers()
+
+        rate = len(body) / exchange["seconds"] if replay.realtime and exchange.get("seconds") else 0.0
+        started = time.monotonic()
+        try:
+            for offset in range(0, len(body), CHUNK_SIZE):
+                self.wfile.write(body[offset:offset + CHUNK_SIZE])
+                if rate:
+                    ahead = (offset + CHUNK_SIZE) / rate - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+@contextlib.contextmanager
+def session(ydl: yt_dlp.YoutubeDL, mode: str, path: str) -> Iterator[None]:
+    """Record or replay every request of ydl for the duration of the block."""
+    if mode == "record":
+        recorder = Recorder(path)
+        recorder.attach(ydl)
+        try:
+            yield
+        finally:
+            recorder.save()
+    elif mode in ("replay", "replay-fast"):
+        server = ReplayServer(path, realtime=mode == "replay")
+        server.attach(ydl)
+        try:
+            yield
+        finally:
+            server.stop()
+    else:
+        yield
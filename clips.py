@@ -0,0 +1,83 @@
+import math
+import re
+from typing import List, Optional, Tuple
+
+_TIME_RANGE = re.compile(r"^(?P<start>[\d:.]*)\s*-\s*(?P<end>[\d:.]*|inf)$", re.IGNORECASE)
+
+
+def parse_time(text: str) -> float:
+    """Parse "90", "1:30" or "1:02:03.5" into seconds."""
+    parts = text.strip().split(":")
+    if not 1 <= len(parts) <= 3 or any(part == "" for part in parts):
+        raise ValueError(f"invalid time: {text!r}")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_clip(text: str) -> Tuple[List[Tuple[float, float]], List[str]]:
+    """Split a clip field like "1:00-2:30, 1:10:00-, Intro" into time ranges and chapter patterns.
+
+    Parts separated by "," or ";" are time ranges ("start-end", either side
+    may be empty) or, if they are not, case-insensitive regular expressions
+    matched against chapter titles. Raises ValueError for invalid input.
+    """
+    ranges: List[Tuple[float, float]] = []
+    chapters: List[str] = []
+    for part in re.split(r"[,;]", text or ""):
+        part = part.strip()
+        if not part:
+            continue
+        match = _TIME_RANGE.match(part)
+        if match:
+            start = parse_time(match.group("start")) if match.group("start") else 0.0
+            end_text = match.group("end")
+            end = math.inf if not end_text or end_text.lower() == "inf" else parse_time(end_text)
+            if end <= start:
+                raise ValueError(f"clip ends before it starts: {part!r}")
+            ranges.append((start, end))
+            continue
+        try:
+            re.compile(part)
+        except re.error as exc:
+            raise ValueError(f"invalid chapter pattern {part!r}: {exc}") from exc
+        chapters.append(f"(?i){part}")
+    return ranges, chapters
+
+
+def clip_seconds(ranges: List[Tuple[float, float]], duration: float) -> Optional[float]:
+    """Total length of the time ranges within a video of the given duration, None if unknown."""
+    if not ranges or not duration:
+        return None
+    return sum(max(0.0, min(end, duration) - start) for start, end in ranges)
+
+
+def selected_seconds(info: dict, ranges: List[Tuple[float, float]], chapters: List[str]) -> Optional[float]:
+    """Seconds of an entry the clip selects (time ranges plus matching chapters), None if unknown."""
+    try:
+        duration = float(info.get("duration") or 0)
+    except (TypeError, ValueError):
+        duration = 0.0
+    if not duration:
+        return None
+    total = clip_seconds(ranges, duration) or 0.0
+    if chapters:
+        patterns = [re.compile(pattern) for pattern in chapters]
+        for chapter in info.get("chapters") or []:
+            title = chapter.get("title") or ""
+            if any(pattern.search(title) for pattern in patterns):
+                total += max(0.0, float(chapter.get("end_time") or duration) - float(chapter.get("start_time") or 0))
+    return min(total, duration)
+
+
+def section_duration(info: dict) -> Optional[float]:
+    """Length of a downloaded section (yt-dlp's section_start/section_end), None for whole entries."""
+    if info.get("section_start") is None and info.get("section_end") is None:
+        return None
+    try:
+        start = float(info.get("section_start") or 0)
+        end = float(info.get("section_end") or info.get("duration") or 0)
+    except (TypeError, ValueError):
+        return None
+    return end - start if end > start else None
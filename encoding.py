@@ -0,0 +1,81 @@
+import os
+from typing import Dict, List, Optional
+
+ENCODING_PRESETS = ["fast", "balanced", "archival"]
+
+# Per-codec encoder arguments for each speed preset. Keys match the codec names
+# passed to FFmpegExtractAudio ("preferredcodec"). Codecs without a speed knob
+# (vorbis, wav, alac) only receive the thread limit.
+PRESET_ARGS: Dict[str, Dict[str, List[str]]] = {
+    "fast": {
+        "mp3": ["-compression_level", "7"],
+        "aac": ["-aac_coder", "fast"],
+        "m4a": ["-aac_coder", "fast"],
+        "opus": ["-compression_level", "3"],
+        "flac": ["-compression_level", "0"],
+    },
+    "balanced": {
+        "mp3": ["-compression_level", "3"],
+        "opus": ["-compression_level", "8"],
+        "flac": ["-compression_level", "5"],
+    },
+    "archival": {
+        "mp3": ["-compression_level", "0"],
+        "aac": ["-aac_coder", "twoloop"],
+        "m4a": ["-aac_coder", "twoloop"],
+        "opus": ["-compression_level", "10"],
+        "flac": ["-compression_level", "8"],
+    },
+}
+
+
+def cpu_count() -> int:
+    """Number of CPUs this process may use (respects affinity where supported)."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except Exception:
+        return max(1, os.cpu_count() or 1)
+
+
+def encoder_threads(concurrent_jobs: int = 1, override: int = 0) -> int:
+    """Split the available cores evenly across concurrently running jobs."""
+    try:
+        override = int(override)
+    except Exception:
+        override = 0
+    if override > 0:
+        return override
+    jobs = max(1, int(concurrent_jobs or 1))
+    return max(1, cpu_count() // jobs)
+
+
+def normalize_preset(preset: Optional[str]) -> str:
+    preset = (preset or "").strip().lower()
+    return preset if preset in ENCODING_PRESETS else "balanced"
+
+
+def codec_args(codec: str, preset: str = "balanced") -> List[str]:
+    """Encoder speed/quality arguments for codec under preset (may be empty)."""
+    table = PRESET_ARGS.get(normalize_preset(preset), {})
+    return list(table.get((codec or "").lower(), []))
+
+
+def thread_args(threads: int) -> List[str]:
+    return ["-threads", str(max(1, int(threads or 1)))]
+
+
+def encoder_args(codec: str, preset: str = "balanced", threads: int = 1) -> List[str]:
+    """Full output argument list for one encode: thread limit plus preset args."""
+    return thread_args(threads) + codec_args(codec, preset)
+
+
+def postprocessor_args(
+    codec: Optional[str],
+    preset: str = "balanced",
+    threads: int = 1,
+) -> Dict[str, List[str]]:
+    """Build yt-dlp "postprocessor_args" for audio extraction and the MP4 merger."""
+    args = {"merger": thread_args(threads)}
+    if codec:
+        args["extractaudio"] = encoder_args(codec, preset, threads)
+    return args
@@ -0,0 +1,147 @@
+import os
+import shutil
+import threading
+from typing import Optional
+
+import yt_dlp
+
+import utils
+
+VERSION_FILE = "VERSION"
+# a short public video: extracting it fetches the current player and its signature functions
+WARMUP_URL = "https://www.youtube.com/watch?v=jNQXAC9IVRM"
+
+
+def cache_version() -> str:
+    return f"yt-dlp {yt_dlp.version.__version__}"
+
+
+class ExtractorCache:
+    """The yt-dlp cache directory (player JavaScript, signature functions, tokens) managed by the app.
+
+    The directory is wiped when the installed yt-dlp version changes, since
+    cached player code is only valid for the extractor that wrote it, and is
+    trimmed oldest-first to max_bytes.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        utils.ensure_dir(self.root)
+        self._check_version()
+        self.trim()
+
+    def _check_version(self) -> None:
+        marker = os.path.join(self.root, VERSION_FILE)
+        try:
+            with open(marker, "r", encoding="utf-8") as handle:
+                current = handle.read().strip()
+        except OSError:
+            current = ""
+        if current == cache_version():
+            return
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass
+        try:
+            with open(marker, "w", encoding="utf-8") as handle:
+                handle.write(cache_version())
+        except OSError:
+            pass
+
+    def size(self) -> int:
+        total = 0
+        for folder, _dirs, files in os.walk(self.root):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(folder, name))
+                except OSError:
+                    continue
+        return total
+
+    def trim(self) -> None:
+        if not self.max_bytes:
+            return
+        with self._lock:
+            files = []
+            total = 0
+            for folder, _dirs, names in os.walk(self.root):
+                for name in names:
+                    path = os.path.join(folder, name)
+                    if folder == self.root and name == VERSION_FILE:
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            for _mtime, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+
+    def warm_up(self, url: str = WARMUP_URL, on_done=None) -> threading.Thread:
+        """Fill the cache in the background by resolving one video's formats."""
+
+        def run() -> None:
+            error: Optional[str] = None
+            try:
+                with yt_dlp.YoutubeDL(
+                    {"cachedir": self.root, "quiet": True, "no_warnings": True, "skip_download": True}
+                ) as ydl:
+                    ydl.extract_info(url, download=False)
+            except Exception as exc:
+                error = str(exc) or exc.__class__.__name__
+            self.trim()
+            if on_done is not None:
+                on_done(error)
+
+        thread = threading.Thread(target=run, name="extractor-cache-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+class CacheCounters:
+    """Hits and misses of one YoutubeDL instance's cache lookups."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def attach(self, ydl: yt_dlp.YoutubeDL) -> None:
+        cache = getattr(ydl, "cache", None)
+        if cache is None:
+            return
+        load, store = cache.load, cache.store
+        missing = object()
+
+        def counted_load(section, key, dtype="json", default=None, **kwargs):
+            value = load(section, key, dtype, missing, **kwargs)
+            if value is missing:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+        def counted_store(section, key, *args, **kwargs):
+            self.writes += 1
+            return store(section, key, *args, **kwargs)
+
+        cache.load = counted_load
+        cache.store = counted_store
+
+    def as_dict(self) -> dict:
+        return {"cache_hits": self.hits, "cache_misses": self.misses, "cache_writes": self.writes}
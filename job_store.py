@@ -0,0 +1,246 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import scheduler
+
+DEFAULT_LEASE_SECONDS = 60.0
+# a job whose lease ran out this often (instance crashed mid-job each time) is given up
+MAX_ATTEMPTS = 3
+FINAL_STATES = scheduler.FINAL_STATES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    options TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    owner TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    finished REAL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (state, priority, id);
+CREATE TABLE IF NOT EXISTS names (
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    reserved REAL NOT NULL,
+    PRIMARY KEY (folder, name)
+);
+"""
+
+
+class SharedJobStore:
+    """Job queue shared by several app instances through one SQLite database.
+
+    An instance claims queued jobs by taking a lease, renews it with
+    heartbeat() while the job runs and records the outcome with complete().
+    Leases that are not renewed expire and the job goes to the next instance
+    that claims work. Claims run in an immediate transaction, so no job is
+    handed out twice. The names table extends naming.OutputNamer reservations
+    across instances writing to the same folder.
+
+    WAL mode needs shared memory between the processes, which network file
+    systems usually do not provide; use wal=False for a database on a NAS.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        wal: bool = True,
+        instance_id: Optional[str] = None,
+    ):
+        self.path = path
+        self.lease_seconds = max(5.0, float(lease_seconds or DEFAULT_LEASE_SECONDS))
+        self.instance_id = instance_id or f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA busy_timeout = 30000")
+        self._db.execute(f"PRAGMA journal_mode = {'WAL' if wal else 'DELETE'}")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def _transaction(self, sql_steps):
+        """Run sql_steps(db) in one immediate (write-locked) transaction."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = sql_steps(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    def submit(self, url: str, options: dict, priority: str = "normal") -> int:
+        rank = scheduler.PRIORITY_CLASSES.index(scheduler.normalize_priority(priority))
+
+        def steps(db) -> int:
+            cursor = db.execute(
+                "INSERT INTO jobs (url, options, priority, created) VALUES (?, ?, ?, ?)",
+                (url, json.dumps(options), rank, time.time()),
+            )
+            return int(cursor.lastrowid)
+
+        return self._transaction(steps)
+
+    def claim(self, limit: int) -> List[dict]:
+        """Lease up to limit jobs (queued or with an expired lease), highest priority first."""
+        if limit <= 0:
+            return []
+
+        def steps(db) -> List[dict]:
+            now = time.time()
+            db.execute(
+                "UPDATE jobs SET state = 'error', owner = NULL, finished = ?, result = ? "
+                "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, json.dumps({"error": "lease expired too often"}), now, MAX_ATTEMPTS),
+            )
+            rows = db.execute(
+                "SELECT id, url, options, priority, attempts FROM jobs "
+                "WHERE state = 'queued' OR (state = 'leased' AND lease_until < ?) "
+                "ORDER BY priority, id LIMIT ?",
+                (now, int(limit)),
+            ).fetchall()
+            claimed = []
+            for row in rows:
+                db.execute(
+                    "UPDATE jobs SET state = 'leased', owner = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (self.instance_id, now + self.lease_seconds, row["id"]),
+                )
+                claimed.append(
+                    {
+                        "id": row["id"],
+                        "url": row["url"],
+                        "options": json.loads(row["options"]),
+                        "priority": scheduler.PRIORITY_CLASSES[row["priority"]],
+                        "attempt": row["attempts"] + 1,
+                    }
+                )
+            return claimed
+
+        return self._transaction(steps)
+
+    def heartbeat(self, job_ids: Iterable[int]) -> List[int]:
+        """Renew the leases of job_ids; return the ones this instance no longer holds."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+
+        def steps(db) -> List[int]:
+            until = time.time() + self.lease_seconds
+            lost = []
+            for job_id in job_ids:
+                cursor = db.execute(
+                    "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND state = 'leased'",
+                    (until, job_id, self.instance_id),
+                )
+                if cursor.rowcount == 0:
+                    lost.append(job_id)
+            return lost
+
+        return self._transaction(steps)
+
+    def complete(self, job_id: int, state: str, result: Optional[dict] = None) -> bool:
+        """Record the outcome of a leased job; False if the lease was lost to another instance."""
+        if state not in FINAL_STATES:
+            raise ValueError(f"state must be one of: {', '.join(FINAL_STATES)}")
+
+        def steps(db) -> bool:
+            cursor = db.execute(
+                "UPDATE jobs SET state = ?, lease_until = NULL, finished = ?, result = ? "
+                "WHERE id = ? AND owner = ? AND state = 'leased'",
+                (state, time.time(), json.dumps(result or {}), job_id, self.instance_id),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(steps)
+
+    def release(self, job_ids: Iterable[int]) -> None:
+        """Hand leased jobs back to the queue right away (e.g. on shutdown)."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+
+        def steps(db) -> None:
+            for job_id in job_ids:
+                db.execute(
+                    "UPDATE jobs SET state = 'queued', owner = NULL, lease_until = NULL, "
+                    "attempts = MAX(attempts - 1, 0) WHERE id = ? AND owner = ? AND state = 'leased'",
+                    (job_id, self.instance_id),
+                )
+
+        self._transaction(steps)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) AS count FROM jobs GROUP BY state").fetchall()
+        return {row["state"]: row["count"] for row in rows}
+
+    def folder_key(self, directory: str) -> str:
+        """Key of an output folder in the names table that every instance agrees on.
+
+        Instances reach a shared folder through different paths (a mount point
+        on one machine, a drive letter on another), so a folder inside the
+        folder of the store is keyed by its path relative to the store. Other
+        folders are keyed by their local path.
+        """
+        base = os.path.dirname(os.path.abspath(self.path))
+        try:
+            relative = os.path.relpath(os.path.abspath(directory), base)
+        except ValueError:
+            # another drive
+            relative = os.pardir
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            return os.path.normcase(os.path.abspath(directory))
+        return "store:" + relative.replace(os.sep, "/").casefold()
+
+    def claim_name(self, folder: str, name: str) -> bool:
+        """Reserve an output name for this instance; False if another instance holds it."""
+        try:
+            return self._transaction(
+                lambda db: db.execute(
+                    "INSERT OR IGNORE INTO names (folder, name, owner, reserved) VALUES (?, ?, ?, ?)",
+                    (folder, name, self.instance_id, time.time()),
+                ).rowcount == 1
+            )
+        except sqlite3.Error:
+            # the store is unreachable; fall back to this instance's own reservations
+            return True
+
+    def release_name(self, folder: str, name: str) -> None:
+        try:
+            self._transaction(
+                lambda db: db.execute(
+                    "DELETE FROM names WHERE folder = ? AND name = ? AND owner = ?",
+                    (folder, name, self.instance_id),
+                )
+            )
+        except sqlite3.Error:
+            pass
+
+    def release_names(self) -> None:
+        """Drop every name this instance still holds (e.g. on shutdown, for entries that never finished)."""
+        try:
+            self._transaction(
+                lambda db: db.execute("DELETE FROM names WHERE owner = ?", (self.instance_id,))
+            )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -64,6 +64,66 @@ texts = {
         "prefetch_failed": "Videoinfos konnten nicht vorgeladen werden: {error}",
         "title_loaded": "Titel geladen: {title}",
         "playlist_loaded": "Playlist geladen: {title} ({count} Einträge)",
+        "playlist_streaming": "Playlist geladen: {title} (Einträge werden fortlaufend abgerufen)",
+        "playlist_entry": "Eintrag {index}: {title}",
+        "transcoding_outputs": "Erzeuge {count} Ausgabe(n) aus einem Download: {title}",
+        "cache_hit": "Quellstream aus dem Cache verwendet: {title}",
+        "shared_job_queued": "Gemeinsamer Auftrag #{id} eingereiht ({priority}): {url}",
+        "shared_job_claimed": "Auftrag #{id} aus der gemeinsamen Warteschlange übernommen (#{shared}): {url}",
+        "shared_lease_lost": "Auftrag #{id} wird jetzt von einer anderen Instanz bearbeitet und hier gestoppt.",
+        "shared_store_error": "Gemeinsame Warteschlange nicht erreichbar: {error}",
+        "route_assigned": "Verbindung für diesen Auftrag: {route}",
+        "route_throttled": "Verbindung {route} wird gedrosselt und pausiert, bis sie wieder schnell genug ist.",
+        "cassette_active": "Kassette ({mode}): {path}",
+        "cassette_missing": "Keine Aufnahme für diese URL gefunden: {path}",
+        "scratch_unavailable": "Arbeitsordner nicht verfügbar ({error}), es wird direkt im Ausgabeordner gearbeitet.",
+        "name_taken": "{name} existiert bereits im Ausgabeordner, gespeichert als {renamed}.",
+        "pipe_fallback": "Quelle kann nicht direkt an FFmpeg gestreamt werden ({error}), normaler Download wird verwendet.",
+        "extractor_cache_stats": "Extraktor-Cache: {hits} von {lookups} Abfragen aus dem Cache.",
+        "extractor_cache_warm": "Extraktor-Cache vorgewärmt.",
+        "extractor_cache_warmup_failed": "Extraktor-Cache konnte nicht vorgewärmt werden: {error}",
+        "source_saved": "Quellstreams passend zur Zielbitrate gewählt: {size} weniger heruntergeladen.",
+        "clip_label": "Ausschnitt:",
+        "clip_placeholder": "z. B. 1:00-2:30, 1:05:00-, Refrain",
+        "clip_tooltip": "Lädt nur diese Zeitbereiche (Start-Ende, kommagetrennt) oder Kapitel, deren Titel passt. Jeder Ausschnitt wird eine eigene Datei. Leer lädt das ganze Video.",
+        "invalid_clip_title": "Ungültiger Ausschnitt",
+        "msg_invalid_clip": "Der Ausschnitt konnte nicht gelesen werden: {error}",
+        "priority_label": "Priorität:",
+        "priority_tooltip": "Aufträge mit höherer Priorität werden zuerst ausgeführt.",
+        "priority_high": "Hoch",
+        "priority_normal": "Normal",
+        "priority_low": "Niedrig",
+        "job_queued": "Auftrag #{id} eingereiht ({priority}): {url}",
+        "job_started": "Auftrag #{id} gestartet.",
+        "job_done": "Auftrag #{id} abgeschlossen.",
+        "job_preempted": "Auftrag #{id} pausiert für einen Auftrag mit höherer Priorität und wird später fortgesetzt.",
+        "btn_pause": "Pause",
+        "btn_resume": "Fortsetzen",
+        "btn_pause_tooltip": "Pausiert laufende Downloads, ohne bereits geladene Daten zu verwerfen.",
+        "status_paused": "Pausiert",
+        "job_paused": "Auftrag #{id} pausiert. Bereits geladene Daten bleiben erhalten.",
+        "job_resumed": "Auftrag #{id} wird fortgesetzt.",
+        "job_select_all": "Alle Aufträge",
+        "job_select_item": "#{id} ({state})",
+        "job_select_tooltip": "Auftrag, den Pausieren/Fortsetzen betrifft.",
+        "job_state_queued": "wartet",
+        "job_state_running": "läuft",
+        "job_state_preempting": "wird verdrängt",
+        "job_state_pausing": "wird pausiert",
+        "job_state_paused": "pausiert",
+        "job_state_cancelling": "wird abgebrochen",
+        "job_resuming": "Setze unterbrochenen Download fort...",
+        "resume_refresh": "Stream-Link ist abgelaufen, Format-URL wird neu abgerufen...",
+        "api_listening": "Lokale API erreichbar unter {address}",
+        "api_failed": "Lokale API konnte nicht gestartet werden: {error}",
+        "transcode_waiting": "Warte auf laufende Konvertierungen...",
+        "verify_unavailable": "ffprobe nicht gefunden, Prüfung der Ausgabedateien wird übersprungen.",
+        "verify_waiting": "Prüfe {count} Ausgabedatei(en)...",
+        "verify_failed": "Prüfung fehlgeschlagen: {file} ({reason})",
+        "verify_done": "{ok} von {total} Ausgabedatei(en) in Ordnung.",
+        "verify_requeued": "Auftrag #{id}: {count} fehlerhafte(r) Download(s) wird erneut eingereiht.",
+        "verify_gave_up": "Auftrag #{id}: {count} Download(s) auch nach erneutem Versuch fehlerhaft.",
+        "job_memory": "Auftrag #{id}: RSS {rss_mb} MB ({rss_delta_mb:+} MB, Spitze {rss_peak_mb} MB), {objects} Objekte ({objects_delta:+}).",
         "disk_space_error": "Nicht genug Speicherplatz für diese Playlist. Download abgebrochen.",
         "download_starting": "Download startet ({format})",
         "download_stopped_log": "Download wurde vom Benutzer gestoppt.",
@@ -139,6 +199,66 @@ texts = {
         "prefetch_failed": "Could not pre-fetch video info: {error}",
         "title_loaded": "Title loaded: {title}",
         "playlist_loaded": "Playlist loaded: {title} ({count} items)",
+        "playlist_streaming": "Playlist loaded: {title} (entries are listed while downloading)",
+        "playlist_entry": "Item {index}: {title}",
+        "transcoding_outputs": "Creating {count} output(s) from one download: {title}",
+        "cache_hit": "Using cached source stream: {title}",
+        "shared_job_queued": "Shared job #{id} queued ({priority}): {url}",
+        "shared_job_claimed": "Job #{id} taken from the shared queue (#{shared}): {url}",
+        "shared_lease_lost": "Job #{id} is now handled by another instance and was stopped here.",
+        "shared_store_error": "Shared queue unavailable: {error}",
+        "route_assigned": "Route for this job: {route}",
+        "route_throttled": "Route {route} is throttled and paused until it is fast enough again.",
+        "cassette_active": "Cassette ({mode}): {path}",
+        "cassette_missing": "No recording found for this URL: {path}",
+        "scratch_unavailable": "Scratch folder unavailable ({error}), working in the output folder instead.",
+        "name_taken": "{name} already exists in the output folder, saved as {renamed}.",
+        "pipe_fallback": "Source cannot be streamed into FFmpeg ({error}), using the normal download.",
+        "extractor_cache_stats": "Extractor cache: {hits} of {lookups} lookups served from the cache.",
+        "extractor_cache_warm": "Extractor cache warmed up.",
+        "extractor_cache_warmup_failed": "Extractor cache warm-up failed: {error}",
+        "source_saved": "Source streams matched to the target bitrate: {size} less downloaded.",
+        "clip_label": "Clip:",
+        "clip_placeholder": "e.g. 1:00-2:30, 1:05:00-, Chorus",
+        "clip_tooltip": "Only downloads these time ranges (start-end, comma separated) or the chapters whose title matches. Every clip becomes its own file. Leave empty for the whole video.",
+        "invalid_clip_title": "Invalid clip",
+        "msg_invalid_clip": "The clip could not be read: {error}",
+        "priority_label": "Priority:",
+        "priority_tooltip": "Jobs with a higher priority run first.",
+        "priority_high": "High",
+        "priority_normal": "Normal",
+        "priority_low": "Low",
+        "job_queued": "Job #{id} queued ({priority}): {url}",
+        "job_started": "Job #{id} started.",
+        "job_done": "Job #{id} finished.",
+        "job_preempted": "Job #{id} paused for a higher-priority job; it will resume later.",
+        "btn_pause": "Pause",
+        "btn_resume": "Resume",
+        "btn_pause_tooltip": "Pause running downloads without discarding data that was already downloaded.",
+        "status_paused": "Paused",
+        "job_paused": "Job #{id} paused. Partial data is kept.",
+        "job_resumed": "Job #{id} resumed.",
+        "job_select_all": "All jobs",
+        "job_select_item": "#{id} ({state})",
+        "job_select_tooltip": "Job that pause/resume applies to.",
+        "job_state_queued": "queued",
+        "job_state_running": "running",
+        "job_state_preempting": "preempting",
+        "job_state_pausing": "pausing",
+        "job_state_paused": "paused",
+        "job_state_cancelling": "cancelling",
+        "job_resuming": "Resuming interrupted download...",
+        "resume_refresh": "Stream link expired, fetching the format URL again...",
+        "api_listening": "Local API listening on {address}",
+        "api_failed": "Could not start the local API: {error}",
+        "transcode_waiting": "Waiting for running conversions...",
+        "verify_unavailable": "ffprobe not found, skipping output verification.",
+        "verify_waiting": "Verifying {count} output file(s)...",
+        "verify_failed": "Verification failed: {file} ({reason})",
+        "verify_done": "{ok} of {total} output file(s) OK.",
+        "verify_requeued": "Job #{id}: re-queuing {count} broken download(s).",
+        "verify_gave_up": "Job #{id}: {count} download(s) still broken after retrying.",
+        "job_memory": "Job #{id}: RSS {rss_mb} MB ({rss_delta_mb:+} MB, peak {rss_peak_mb} MB), {objects} objects ({objects_delta:+}).",
         "disk_space_error": "Not enough disk space for this playlist. Download aborted.",
         "download_starting": "Starting download ({format})",
         "download_stopped_log": "Download stopped by user.",
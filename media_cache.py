@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import utils
+
+INDEX_NAME = "index.json"
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaCache:
+    """On-disk store of raw source streams keyed by video ID and format ID.
+
+    Blobs are content-addressed (named by their SHA-256) so identical streams
+    are stored once. The index keeps the hash, size and last use per key and
+    is trimmed least-recently-used first once max_bytes is exceeded.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        utils.ensure_dir(os.path.join(self.root, "blobs"))
+        self._load_index()
+
+    @staticmethod
+    def key(video_id: str, format_id: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", f"{video_id}-{format_id}")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def _load_index(self) -> None:
+        try:
+            with open(os.path.join(self.root, INDEX_NAME), "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+            if isinstance(raw, dict):
+                self._index = {k: v for k, v in raw.items() if isinstance(v, dict)}
+        except Exception:
+            self._index = {}
+
+    def _save_index(self) -> None:
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix="index_", suffix=".json", dir=self.root)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(self._index, handle)
+                os.replace(temp_path, os.path.join(self.root, INDEX_NAME))
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        except Exception:
+            pass
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            seen = {}
+            for entry in self._index.values():
+                seen[entry.get("sha256")] = int(entry.get("size") or 0)
+            return sum(seen.values())
+
+    def lookup(self, video_id: str, format_id: str) -> Optional[str]:
+        """Return the verified blob path for a cached stream, or None."""
+        key = self.key(video_id, format_id)
+        with self._lock:
+            entry = self._index.get(key)
+        if not entry:
+            return None
+        path = self._blob_path(entry.get("sha256", ""))
+        try:
+            valid = (
+                os.path.getsize(path) == entry.get("size")
+                and file_sha256(path) == entry.get("sha256")
+            )
+        except Exception:
+            valid = False
+        with self._lock:
+            if not valid:
+                self._index.pop(key, None)
+                self._drop_unreferenced(entry.get("sha256", ""))
+                self._save_index()
+                return None
+            entry["last_used"] = time.time()
+            self._save_index()
+        return path
+
+    def restore(self, video_id: str, format_id: str, dest: str) -> bool:
+        """Place a cached stream at dest (hard link if possible); True on a hit."""
+        path = self.lookup(video_id, format_id)
+        if not path:
+            return False
+        try:
+            utils.ensure_dir(os.path.dirname(dest) or ".")
+            if os.path.exists(dest):
+                os.remove(dest)
+            try:
+                os.link(path, dest)
+            except Exception:
+                shutil.copyfile(path, dest)
+            return True
+        except Exception:
+            return False
+
+    def store(self, video_id: str, format_id: str, src: str) -> None:
+        """Add a downloaded stream to the cache and evict old entries if needed."""
+        if not video_id or not format_id or not os.path.isfile(src):
+            return
+        try:
+            size = os.path.getsize(src)
+            if self.max_bytes and size > self.max_bytes:
+                return
+            digest = file_sha256(src)
+            blob = self._blob_path(digest)
+            if not os.path.exists(blob):
+                utils.ensure_dir(os.path.dirname(blob))
+                temp_blob = f"{blob}.tmp"
+                try:
+                    os.link(src, temp_blob)
+                except Exception:
+                    shutil.copyfile(src, temp_blob)
+                os.replace(temp_blob, blob)
+        except Exception:
+            return
+
+        with self._lock:
+            self._index[self.key(video_id, format_id)] = {
+                "sha256": digest,
+                "size": size,
+                "last_used": time.time(),
+            }
+            self._evict()
+            self._save_index()
+
+    def _drop_unreferenced(self, digest: str) -> None:
+        if not digest or any(e.get("sha256") == digest for e in self._index.values()):
+            return
+        try:
+            os.remove(self._blob_path(digest))
+        except Exception:
+            pass
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        sizes = {}
+        for entry in self._index.values():
+            sizes[entry.get("sha256")] = int(entry.get("size") or 0)
+        total = sum(sizes.values())
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            del self._index[key]
+            digest = entry.get("sha256", "")
+            if not any(e.get("sha256") == digest for e in self._index.values()):
+                total -= sizes.get(digest, 0)
+                self._drop_unreferenced(digest)
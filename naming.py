@@ -0,0 +1,193 @@
+import os
+import threading
+from typing import Dict, Set
+
+import utils
+
+DEFAULT_TEMPLATE = "{title}"
+TEMP_SUFFIXES = (".part", ".ytdl", ".temp", ".tmp")
+
+_namers: Dict[str, "OutputNamer"] = {}
+_namers_lock = threading.Lock()
+# shares reservations with other app instances (job_store.SharedJobStore); None = this process only
+_registry = None
+
+
+class _TemplateFields(dict):
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def render_template(template: str, info: dict) -> str:
+    """Render a name template like "{uploader}/{playlist}/{playlist_index:03d} - {title}".
+
+    Every path component is passed through utils.sanitize_filename; components
+    that render empty (e.g. {playlist} for a single video) are dropped.
+    """
+    fields = _TemplateFields(
+        (key, value) for key, value in info.items()
+        if isinstance(value, (str, int, float)) and not key.startswith("_")
+    )
+    try:
+        fields["playlist_index"] = int(info.get("playlist_index") or 0)
+    except Exception:
+        fields["playlist_index"] = 0
+
+    parts = []
+    for part in (template or DEFAULT_TEMPLATE).replace("\\", "/").split("/"):
+        try:
+            text = part.format_map(fields)
+        except Exception:
+            text = part
+        if not text.strip():
+            continue
+        text = utils.sanitize_filename(text)
+        if text.strip(".") == "":
+            continue
+        parts.append(text)
+    if not parts or not parts[-1]:
+        parts.append(utils.sanitize_filename(info.get("title") or info.get("id") or ""))
+    return "/".join(parts)
+
+
+def _stem(name: str) -> str:
+    lower = name.lower()
+    for suffix in TEMP_SUFFIXES:
+        if lower.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return os.path.splitext(name)[0]
+
+
+class OutputNamer:
+    """Collision-free output names for one directory tree.
+
+    Each (sub)directory is scanned once into an in-memory index of taken stems
+    (again per reservation while names are shared through a registry);
+    reservations are made under a lock, so concurrent jobs never pick the same
+    name and no per-candidate filesystem probes are needed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # (registry, folder key) of the last shared claim
+        self._shared = None
+        self._lock = threading.Lock()
+        self._index: Dict[str, Set[str]] = {}
+
+    def _taken(self, subdir: str, rescan: bool = False) -> Set[str]:
+        key = os.path.normcase(subdir)
+        taken = self._index.get(key)
+        if taken is None or rescan:
+            taken = taken or set()
+            try:
+                with os.scandir(os.path.join(self.directory, subdir)) as it:
+                    for entry in it:
+                        taken.add(_stem(entry.name).casefold())
+            except Exception:
+                pass
+            self._index[key] = taken
+        return taken
+
+    def reserve(self, relative: str, rescan: bool = False) -> str:
+        """Reserve relative ("sub/dir/stem", no extension); return the unique stem path.
+
+        rescan reads the folder again first, e.g. after a file appeared there
+        that this namer did not know of.
+        """
+        subdir, name = os.path.split(relative.replace("/", os.sep))
+        with self._lock:
+            # with a registry, other instances publish into the folder and then release their claims
+            taken = self._taken(subdir, rescan=rescan or _registry is not None)
+            candidate = name
+            counter = 1
+            while candidate.casefold() in taken or not self._claim_shared(subdir, candidate):
+                # a name held by another instance counts as taken from now on
+                taken.add(candidate.casefold())
+                candidate = f"{name} ({counter})"
+                counter += 1
+            taken.add(candidate.casefold())
+        return os.path.join(subdir, candidate) if subdir else candidate
+
+    def _shared_key(self, subdir: str, name: str) -> str:
+        return "/".join(part for part in (subdir.replace(os.sep, "/"), name) if part).casefold()
+
+    def _folder_key(self, registry) -> str:
+        shared = self._shared
+        if shared is None or shared[0] is not registry:
+            shared = self._shared = (registry, registry.folder_key(self.directory))
+        return shared[1]
+
+    def _claim_shared(self, subdir: str, name: str) -> bool:
+        registry = _registry
+        return registry is None or registry.claim_name(self._folder_key(registry), self._shared_key(subdir, name))
+
+    def release_claim(self, relative: str) -> None:
+        """Release the shared claim once the file is published; the folder scan finds it from then on."""
+        registry = _registry
+        if registry is not None:
+            subdir, name = os.path.split(relative.replace("/", os.sep))
+            registry.release_name(self._folder_key(registry), self._shared_key(subdir, name))
+
+    def release(self, relative: str) -> None:
+        subdir, name = os.path.split(relative.replace("/", os.sep))
+        with self._lock:
+            self._taken(subdir).discard(name.casefold())
+        registry = _registry
+        if registry is not None:
+            registry.release_name(self._folder_key(registry), self._shared_key(subdir, name))
+
+
+class NameClaims:
+    """In-memory registry with the claim_name/release_name interface of job_store.SharedJobStore.
+
+    Pool processes each scan the folders on their own; names they are still
+    writing are claimed here, in the GUI process, so two processes never pick
+    the same one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claimed: Set[tuple] = set()
+
+    def folder_key(self, directory: str) -> str:
+        # every claimer runs on this machine, so the local path identifies the folder
+        return local_folder_key(directory)
+
+    def claim_name(self, folder: str, name: str) -> bool:
+        with self._lock:
+            if (folder, name) in self._claimed:
+                return False
+            self._claimed.add((folder, name))
+            return True
+
+    def release_name(self, folder: str, name: str) -> None:
+        with self._lock:
+            self._claimed.discard((folder, name))
+
+
+def local_folder_key(directory: str) -> str:
+    return os.path.normcase(os.path.abspath(directory))
+
+
+def get_namer(directory: str) -> OutputNamer:
+    """Shared namer per output directory, so all jobs reserve from one index."""
+    key = local_folder_key(directory)
+    with _namers_lock:
+        namer = _namers.get(key)
+        if namer is None:
+            namer = OutputNamer(directory)
+            _namers[key] = namer
+        return namer
+
+
+def set_registry(registry) -> None:
+    """Reserve names through registry as well (folder_key/claim_name/release_name), or only locally with None."""
+    global _registry
+    _registry = registry
+
+
+def reset_namers() -> None:
+    """Drop all shared indexes so the next reservation rescans the folders."""
+    with _namers_lock:
+        _namers.clear()
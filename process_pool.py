@@ -0,0 +1,347 @@
+import importlib.util
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import media_cache
+import naming
+import route_pool
+import thumbnails
+
+APP_MODULE = "brejax_app"
+# transfer samples are sent at most this often (the GUI renders them every 250 ms anyway)
+TRANSFER_INTERVAL = 0.25
+
+# IPC messages (child -> parent):
+#   ("p", text)                      progress line
+#   ("v", percent)                   progress value, only sent when it changes
+#   ("d", title, done, total, speed, eta) raw transfer numbers, formatted by the GUI; throttled
+#   ("j", snapshot)                  progress_model snapshot of the whole job
+#   ("t", stats)                     telemetry.JobTelemetry numbers of the job
+#   ("done", None)                   job finished
+#   ("error", message, resume_state) job failed, stopped ("__STOPPED__", no state) or paused ("__PAUSED__")
+#   ("c", target, method, args)      call a method of a parent-side object ("names" or "media")
+# parent -> child: ("run", kwargs), ("pause",), ("stop",), ("quit",), ("r", result) answering a "c"
+
+
+def _load_app(script: str):
+    # under "spawn" the GUI script is usually already imported as __mp_main__
+    main = sys.modules.get("__mp_main__")
+    if main is not None and os.path.abspath(getattr(main, "__file__", "") or "") == os.path.abspath(script):
+        return main
+    module = sys.modules.get(APP_MODULE)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(APP_MODULE, script)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[APP_MODULE] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _portable_state(state: dict) -> dict:
+    """resume_state if it pickles; otherwise only the parts that always do."""
+    try:
+        pickle.dumps(state)
+        return state
+    except Exception:
+        return {
+            "names": dict(state.get("names") or {}),
+            "completed": list(state.get("completed") or []),
+            "paused": bool(state.get("paused")),
+            "bytes_saved": float(state.get("bytes_saved") or 0),
+            "scratch": state.get("scratch"),
+        }
+
+
+class _ParentCalls:
+    """Blocking calls into the parent; one at a time, so every answer matches its call."""
+
+    def __init__(self, runtime: "_ChildRuntime"):
+        self.runtime = runtime
+        self._lock = threading.Lock()
+
+    def call(self, target: str, method: str, *args):
+        with self._lock:
+            self.runtime.send(("c", target, method, args))
+            return self.runtime.replies.get()
+
+
+class _RemoteNames:
+    """naming registry of a pool process: names are claimed in the parent (naming.NameClaims or the job store)."""
+
+    def __init__(self, calls: _ParentCalls):
+        self.calls = calls
+
+    def folder_key(self, directory: str) -> str:
+        return self.calls.call("names", "folder_key", directory) or naming.local_folder_key(directory)
+
+    def claim_name(self, folder: str, name: str) -> bool:
+        # None: the parent is gone; fall back to this process' own reservations
+        return self.calls.call("names", "claim_name", folder, name) is not False
+
+    def release_name(self, folder: str, name: str) -> None:
+        self.calls.call("names", "release_name", folder, name)
+
+
+class _RemoteMediaCache:
+    """media_cache.MediaCache of the parent, so all processes share one index and one eviction order."""
+
+    def __init__(self, calls: _ParentCalls):
+        self.calls = calls
+
+    def restore(self, video_id: str, format_id: str, dest: str) -> bool:
+        return bool(self.calls.call("media", "restore", video_id, format_id, dest))
+
+    def store(self, video_id: str, format_id: str, src: str) -> None:
+        self.calls.call("media", "store", video_id, format_id, src)
+
+
+class _RemoteRoutes:
+    """Shared pool of a pool process' RoutePool: throttles go to the route pool of the parent, its cooldowns come back."""
+
+    def __init__(self, calls: _ParentCalls):
+        self.calls = calls
+
+    def report(self, usage: dict) -> None:
+        self.calls.call("routes", "report", usage)
+
+    def cooldowns(self) -> dict:
+        return self.calls.call("routes", "cooldowns") or {}
+
+
+class _ChildRuntime:
+    def __init__(self, script: str, control, events):
+        self.app = _load_app(script)
+        self.control = control
+        self.events = events
+        self._send_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._worker = None
+        self._early: List[str] = []
+        self._jobs: queue.Queue = queue.Queue()
+        self.replies: queue.Queue = queue.Queue()
+        self._calls = _ParentCalls(self)
+        self._media_cache = _RemoteMediaCache(self._calls)
+        self._thumbnail_caches = {}
+        self._route_pool = None
+        self._route_config = None
+
+    def send(self, message: tuple) -> None:
+        with self._send_lock:
+            try:
+                self.events.send(message)
+            except (EOFError, OSError):
+                pass
+
+    def read_control(self) -> None:
+        while True:
+            try:
+                message = self.control.recv()
+            except (EOFError, OSError):
+                self._jobs.put(None)
+                self.replies.put(None)
+                return
+            kind = message[0]
+            if kind == "r":
+                self.replies.put(message[1])
+            elif kind == "run":
+                self._jobs.put(message[1])
+            elif kind == "quit":
+                self._jobs.put(None)
+                return
+            elif kind in ("pause", "stop"):
+                with self._worker_lock:
+                    if self._worker is None:
+                        self._early.append(kind)
+                    else:
+                        getattr(self._worker, kind)()
+
+    def caches(self, config: dict) -> Tuple[Optional[media_cache.MediaCache], Optional[thumbnails.ThumbnailCache]]:
+        # the media cache index lives in the parent; a copy per process would drop the others' entries
+        media = self._media_cache if config.get("media") else None
+        thumbs = None
+        if config.get("thumbnails"):
+            root, ffmpeg, max_size = config["thumbnails"]
+            thumbs = self._thumbnail_caches.get(root)
+            if thumbs is None:
+                thumbs = self._thumbnail_caches[root] = thumbnails.ThumbnailCache(root, ffmpeg, max_size=max_size)
+        return media, thumbs
+
+    def routes(self, config: dict) -> Optional[route_pool.RoutePool]:
+        if not config.get("routes"):
+            return None
+        if self._route_config != config["routes"]:
+            specs, strategy, scope, min_speed, cooldown = config["routes"]
+            self._route_pool = route_pool.RoutePool(specs, strategy, scope, min_speed, cooldown)
+            # a route throttled in one process is left out by all of them
+            self._route_pool.shared = _RemoteRoutes(self._calls)
+            self._route_config = config["routes"]
+        return self._route_pool
+
+    def run_job(self, kwargs: dict) -> None:
+        kwargs = dict(kwargs)
+        config = kwargs.pop("cache_config", {})
+        kwargs["media_cache"], kwargs["thumbnail_cache"] = self.caches(config)
+        kwargs["route_pool"] = self.routes(config)
+        # other processes may have written files since the last job; scan the folders again
+        naming.reset_namers()
+
+        result: list = []
+        last_value = [-1]
+        # [time of the last sent sample, sample waiting to be sent]
+        transfer = [0.0, None]
+
+        def on_value(value: int) -> None:
+            if value != last_value[0]:
+                last_value[0] = value
+                self.send(("v", value))
+
+        def on_transfer(*sample) -> None:
+            now = time.monotonic()
+            _title, done, total = sample[:3]
+            if now - transfer[0] >= TRANSFER_INTERVAL or (total and done >= total):
+                transfer[0], transfer[1] = now, None
+                self.send(("d",) + sample)
+            else:
+                transfer[1] = sample
+
+        direct = self.app.QtCore.Qt.ConnectionType.DirectConnection
+        worker = self.app.BrejaxWorker(**kwargs)
+        worker.progress.connect(lambda text: self.send(("p", text)), direct)
+        worker.progress_value.connect(on_value, direct)
+        worker.transfer.connect(on_transfer, direct)
+        worker.job_progress.connect(lambda snapshot: self.send(("j", snapshot)), direct)
+        worker.stats.connect(lambda stats: self.send(("t", stats)), direct)
+        worker.finished.connect(lambda: result.append(("done",)), direct)
+        worker.error.connect(lambda message: result.append(("error", message)), direct)
+
+        with self._worker_lock:
+            self._worker = worker
+            for kind in self._early:
+                getattr(worker, kind)()
+            self._early = []
+        try:
+            worker.run()
+        except BaseException as exc:
+            result.append(("error", str(exc)))
+        finally:
+            with self._worker_lock:
+                self._worker = None
+
+        if transfer[1] is not None:
+            self.send(("d",) + transfer[1])
+        outcome = result[0] if result else ("error", "Worker exited without a result.")
+        # finished and stopped jobs never run again, so their resolved entries need not cross the pipe
+        keep = outcome[0] == "error" and outcome[1] != "__STOPPED__"
+        self.send(outcome + (_portable_state(worker.resume_state) if keep else None,))
+
+    def serve(self) -> None:
+        naming.set_registry(_RemoteNames(self._calls))
+        threading.Thread(target=self.read_control, name="pool-control", daemon=True).start()
+        while True:
+            kwargs = self._jobs.get()
+            if kwargs is None:
+                return
+            self.run_job(kwargs)
+
+
+def _child_main(script: str, control, events) -> None:
+    _ChildRuntime(script, control, events).serve()
+
+
+class PoolSlot:
+    """One long-lived worker process with a control pipe and an event pipe."""
+
+    def __init__(self, context, script: str):
+        control_recv, self._control = context.Pipe(duplex=False)
+        self._events, events_send = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_child_main,
+            args=(script, control_recv, events_send),
+            name="brejax-worker",
+            daemon=True,
+        )
+        self.process.start()
+        control_recv.close()
+        events_send.close()
+        self._lock = threading.Lock()
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def send(self, message: tuple) -> None:
+        with self._lock:
+            try:
+                self._control.send(message)
+            except (EOFError, OSError):
+                pass
+
+    def wait(self, on_event: Callable[[tuple], None]) -> tuple:
+        """Relay progress messages until the job ends; return the final message."""
+        while True:
+            try:
+                message = self._events.recv()
+            except (EOFError, OSError):
+                return ("error", "Worker process exited unexpectedly.", None)
+            if message[0] in ("done", "error"):
+                return message
+            on_event(message)
+
+    def close(self) -> None:
+        self.send(("quit",))
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        for conn in (self._control, self._events):
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+class WorkerProcessPool:
+    """Pool of worker processes that run BrejaxWorker jobs outside the GUI process.
+
+    Processes are spawned lazily, reused for later jobs and replaced if they
+    die. The scheduler never runs more jobs than the pool size, so acquire()
+    only blocks if a caller bypasses it.
+    """
+
+    def __init__(self, script: str, size: int):
+        self.script = script
+        self.size = max(1, int(size or 1))
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._spawned = 0
+        self._slots: List[PoolSlot] = []
+
+    def acquire(self) -> PoolSlot:
+        with self._lock:
+            if self._idle.empty() and self._spawned < self.size:
+                self._spawned += 1
+                slot = PoolSlot(self._context, self.script)
+                self._slots.append(slot)
+                return slot
+        slot = self._idle.get()
+        if not slot.alive():
+            with self._lock:
+                self._slots.remove(slot)
+                slot.close()
+                slot = PoolSlot(self._context, self.script)
+                self._slots.append(slot)
+        return slot
+
+    def release(self, slot: PoolSlot) -> None:
+        self._idle.put(slot)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for slot in self._slots:
+                slot.close()
+            self._slots = []
@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import clips
+
+# assumed size of an entry whose size yt-dlp could not estimate (and nothing else is known)
+DEFAULT_ENTRY_BYTES = 8 * 1024 * 1024
+# assumed conversion speed (seconds of media per wall-clock second) before one was measured
+DEFAULT_TRANSCODE_SPEED = 40.0
+RATE_WINDOW_SECONDS = 10.0
+SPEED_SMOOTHING = 0.3
+
+
+def expected_bytes(info: dict) -> float:
+    """yt-dlp's size estimate of an entry (all requested streams), 0 if unknown."""
+    formats = info.get("requested_formats") or [info]
+    total = 0.0
+    for fmt in formats:
+        try:
+            total += float(fmt.get("filesize") or fmt.get("filesize_approx") or 0)
+        except (TypeError, ValueError):
+            continue
+    return total
+
+
+class TranscodeSpeeds:
+    """Measured conversion speed per output set, smoothed over the session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._speeds: Dict[str, float] = {}
+
+    def record(self, key: str, media_seconds: float, wall_seconds: float) -> None:
+        if not key or media_seconds <= 0 or wall_seconds <= 0:
+            return
+        speed = media_seconds / wall_seconds
+        with self._lock:
+            previous = self._speeds.get(key)
+            self._speeds[key] = speed if previous is None else (
+                previous + SPEED_SMOOTHING * (speed - previous)
+            )
+
+    def speed(self, key: str) -> float:
+        with self._lock:
+            return self._speeds.get(key, DEFAULT_TRANSCODE_SPEED)
+
+
+TRANSCODE_SPEEDS = TranscodeSpeeds()
+
+
+class RollingRate:
+    """Throughput over the last RATE_WINDOW_SECONDS from cumulative byte counts."""
+
+    def __init__(self, window: float = RATE_WINDOW_SECONDS):
+        self.window = window
+        self._samples: deque = deque()
+
+    def add(self, now: float, total_bytes: float) -> None:
+        self._samples.append((now, total_bytes))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+
+    def rate(self) -> float:
+        if len(self._samples) < 2:
+            return 0.0
+        (start, first), (end, last) = self._samples[0], self._samples[-1]
+        if end <= start:
+            return 0.0
+        return max(0.0, (last - first) / (end - start))
+
+
+class _Entry:
+    __slots__ = ("expected", "duration", "files", "downloaded", "converted")
+
+    def __init__(self, expected: float, duration: float):
+        self.expected = expected
+        self.duration = duration
+        self.files: Dict[str, float] = {}
+        self.downloaded = False
+        self.converted = False
+
+
+class JobProgress:
+    """Byte-weighted progress and ETA of one job, including conversion time.
+
+    Entries are weighted by their expected size; conversion is accounted as
+    the media duration divided by the measured conversion speed of the job's
+    output set. Thread-safe: downloads and pool conversions update it.
+    """
+
+    def __init__(
+        self,
+        transcode_key: str = "",
+        converts: bool = False,
+        clip: Optional[Tuple[List[Tuple[float, float]], List[str]]] = None,
+    ):
+        self.transcode_key = transcode_key
+        self.converts = converts
+        # clips.parse_clip() result: only the selected part of each entry is downloaded
+        self.clip = clip
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._current: Optional[str] = None
+        self._received = 0.0
+        self._rate = RollingRate()
+
+    def sizing(self, info: dict) -> Tuple[float, float]:
+        """Expected bytes and media seconds of an entry, scaled down to the clip if there is one."""
+        size = expected_bytes(info)
+        try:
+            duration = float(info.get("duration") or 0)
+        except (TypeError, ValueError):
+            duration = 0.0
+        if self.clip and duration:
+            selected = clips.selected_seconds(info, *self.clip)
+            if selected is not None:
+                size *= selected / duration
+                duration = selected
+        return size, duration
+
+    def plan(self, entries: Iterable[dict], completed: Iterable[str] = ()) -> None:
+        entries = [entry for entry in entries if entry]
+        sizing = [self.sizing(entry) for entry in entries]
+        sizes = [size for size, _duration in sizing]
+        known = [size for size in sizes if size]
+        fallback = sum(known) / len(known) if known else DEFAULT_ENTRY_BYTES
+        done = set(completed)
+        with self._lock:
+            for index, (entry, (size, duration)) in enumerate(zip(entries, sizing)):
+                key = str(entry.get("id") or f"#{index}")
+                item = self._entries.setdefault(key, _Entry(size or fallback, duration))
+                if key in done:
+                    item.downloaded = item.converted = True
+
+    def start_entry(self, info: dict) -> None:
+        key = str(info.get("id") or f"#{len(self._entries)}")
+        size, duration = self.sizing(info)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                known = [entry.expected for entry in self._entries.values()]
+                fallback = sum(known) / len(known) if known else DEFAULT_ENTRY_BYTES
+                item = self._entries[key] = _Entry(size or fallback, 0.0)
+            if size:
+                item.expected = size
+            item.duration = duration or item.duration
+            self._current = key
+
+    def on_bytes(self, filename: str, downloaded: float, total: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(self._current) if self._current else None
+            if item is None:
+                # download without a plan (e.g. extraction fallback): track it as one entry
+                self._current = filename or "#0"
+                item = self._entries.setdefault(self._current, _Entry(total or DEFAULT_ENTRY_BYTES, 0.0))
+            previous = item.files.get(filename, 0.0)
+            item.files[filename] = downloaded
+            self._received += max(0.0, downloaded - previous)
+            if total and len(item.files) == 1:
+                item.expected = max(item.expected, total)
+            else:
+                item.expected = max(item.expected, sum(item.files.values()))
+            self._rate.add(now, self._received)
+
+    def entry_downloaded(self, key: Optional[str]) -> None:
+        with self._lock:
+            item = self._entries.get(str(key)) if key else None
+            if item is not None:
+                item.downloaded = True
+                item.converted = item.converted or not self.converts
+
+    def entry_converted(self, key: Optional[str], wall_seconds: float = 0.0) -> None:
+        with self._lock:
+            item = self._entries.get(str(key)) if key else None
+            if item is None:
+                return
+            item.downloaded = item.converted = True
+            duration = item.duration
+        if wall_seconds:
+            TRANSCODE_SPEEDS.record(self.transcode_key, duration, wall_seconds)
+
+    def snapshot(self) -> dict:
+        speed = TRANSCODE_SPEEDS.speed(self.transcode_key) if self.converts else 0.0
+        with self._lock:
+            rate = self._rate.rate()
+            total_bytes = done_bytes = 0.0
+            total_convert = done_convert = 0.0
+            for item in self._entries.values():
+                total_bytes += item.expected
+                done_bytes += item.expected if item.downloaded else min(item.expected, sum(item.files.values()))
+                if speed:
+                    seconds = item.duration / speed
+                    total_convert += seconds
+                    if item.converted:
+                        done_convert += seconds
+
+        remaining_convert = total_convert - done_convert
+        if rate:
+            total_work = total_bytes / rate + total_convert
+            done_work = done_bytes / rate + done_convert
+            eta = (total_bytes - done_bytes) / rate + remaining_convert
+        else:
+            total_work, done_work, eta = total_bytes, done_bytes, 0.0
+        return {
+            "fraction": min(1.0, done_work / total_work) if total_work else 0.0,
+            "done_bytes": done_bytes,
+            "total_bytes": total_bytes,
+            "rate": rate,
+            "eta": eta,
+            "convert_eta": remaining_convert,
+        }
@@ -0,0 +1,438 @@
+import itertools
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import yt_dlp
+from yt_dlp.networking import Request, Response
+from yt_dlp.networking.exceptions import HTTPError, TransportError
+
+ROUTE_STRATEGIES = ["least-loaded", "round-robin"]
+ROUTE_SCOPES = ["job", "request"]
+PROXY_SCHEMES = ("http", "https", "socks4", "socks4a", "socks5", "socks5h")
+# only these can change per request; a source address is bound to yt-dlp's request handlers
+PER_REQUEST_KINDS = ("proxy", "direct")
+THROTTLE_STATUSES = (429,)
+DEFAULT_COOLDOWN = 120.0
+MAX_COOLDOWN = 30 * 60.0
+# unreachable this many times in a row counts like a throttle
+FAILURES_BEFORE_COOLDOWN = 3
+# throughput of shorter transfers is dominated by latency and says nothing about throttling
+MIN_SAMPLE_BYTES = 1024 * 1024
+SPEED_SMOOTHING = 0.3
+DEFAULT_PROBE_URL = "https://www.youtube.com/generate_204"
+CHECK_INTERVAL = 30.0
+# how often a pool that shares its routes with others picks up their cooldowns
+SHARED_SYNC_INTERVAL = 1.0
+
+
+class Route:
+    """One way out: a proxy URL, a local source address or the direct connection."""
+
+    def __init__(self, spec: str):
+        self.spec = spec.strip()
+        self.proxy: Optional[str] = None
+        self.source_address: Optional[str] = None
+        if self.spec.lower() == "direct":
+            self.kind = "direct"
+        elif "://" in self.spec:
+            if self.spec.split("://", 1)[0].lower() not in PROXY_SCHEMES:
+                raise ValueError(f"unsupported proxy scheme: {self.spec}")
+            self.kind = "proxy"
+            self.proxy = self.spec
+        else:
+            self.kind = "source"
+            self.source_address = self.spec[len("source:"):] if self.spec.startswith("source:") else self.spec
+            if not self.source_address:
+                raise ValueError(f"empty source address: {self.spec}")
+        # jobs on this route, and single requests spread onto it in the "request" scope
+        self.active = 0
+        self.requests = 0
+        self.bytes = 0
+        self.speed = 0.0
+        self.throttles = 0
+        self.failures = 0
+        # consecutive throttles; each one doubles the cooldown
+        self.strikes = 0
+        self.cooldown_until = 0.0
+        # set by a throttle when health checks are on: the route waits for a passing probe
+        self.needs_check = False
+        self.last_assigned = 0.0
+
+    def ydl_options(self) -> dict:
+        if self.kind == "proxy":
+            return {"proxy": self.proxy}
+        if self.kind == "source":
+            return {"source_address": self.source_address}
+        return {}
+
+    def request_proxies(self) -> Dict[str, str]:
+        return {"all": self.proxy if self.kind == "proxy" else "__noproxy__"}
+
+    def as_dict(self) -> dict:
+        return {
+            "route": self.spec,
+            "active": self.active,
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "speed": round(self.speed, 1),
+            "throttles": self.throttles,
+            "failures": self.failures,
+            "cooldown": round(max(0.0, self.cooldown_until - time.monotonic()), 1),
+            "needs_check": self.needs_check,
+        }
+
+
+def valid_route(spec) -> bool:
+    if not isinstance(spec, str) or not spec.strip():
+        return False
+    try:
+        Route(spec)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_routes(specs: Iterable[str]) -> List[Route]:
+    routes = []
+    for spec in specs:
+        if spec and spec.strip() and spec.strip() not in [route.spec for route in routes]:
+            routes.append(Route(spec))
+    return routes
+
+
+def _bound_to_address(url: str) -> bool:
+    # googlevideo stream URLs are signed for the address that extracted them
+    return "ip" in parse_qs(urlsplit(url).query)
+
+
+class RoutePool:
+    """Spreads outgoing traffic over several routes and keeps throttled ones out of rotation.
+
+    With scope "job" every job gets one route for all its requests; with
+    "request" the requests of a job are spread over the proxy and direct
+    routes (except URLs bound to the extracting address). A route that
+    answers 429, stays below min_speed (bytes/s) on a transfer of at least
+    MIN_SAMPLE_BYTES or is unreachable several times in a row is cooled
+    down, twice as long on every repeat. With a probe URL, a cooled-down
+    route only comes back after a health check through it passed.
+
+    Pools of several processes share their throttles through shared (an
+    object with report(usage) and cooldowns(), e.g. the pool of the main
+    process behind a proxy): every throttle is reported at once, and the
+    cooldowns known there are picked up at most every SHARED_SYNC_INTERVAL.
+    """
+
+    def __init__(
+        self,
+        specs: Iterable[str],
+        strategy: str = "least-loaded",
+        scope: str = "job",
+        min_speed: float = 0.0,
+        cooldown: float = DEFAULT_COOLDOWN,
+        probe_url: str = "",
+    ):
+        self.routes = parse_routes(specs)
+        self.strategy = strategy if strategy in ROUTE_STRATEGIES else ROUTE_STRATEGIES[0]
+        self.scope = scope if scope in ROUTE_SCOPES else ROUTE_SCOPES[0]
+        self.min_speed = max(0.0, float(min_speed or 0))
+        self.cooldown = max(1.0, float(cooldown or DEFAULT_COOLDOWN))
+        self.probe_url = probe_url or ""
+        self._lock = threading.Lock()
+        self._cursor = itertools.count()
+        self._checker: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self.shared = None
+        self._synced = 0.0
+
+    def get(self, spec: str) -> Optional[Route]:
+        for route in self.routes:
+            if route.spec == spec:
+                return route
+        return None
+
+    def available(self, route: Route, now: float) -> bool:
+        return route.cooldown_until <= now and not route.needs_check
+
+    def acquire(
+        self,
+        prefer: Optional[str] = None,
+        exclude: Iterable[Route] = (),
+        kinds: Optional[Iterable[str]] = None,
+        single: bool = False,
+    ) -> Optional[Route]:
+        """Pick a route and count it as busy until release(); None if the pool has none that fit.
+
+        single counts a single request instead of a job; the two are balanced
+        separately. When every fitting route is cooling down, the one that
+        recovers first is returned, so jobs are never held back by the pool.
+        """
+        exclude = list(exclude)
+        self._sync()
+        with self._lock:
+            candidates = [
+                route for route in self.routes
+                if route not in exclude and (kinds is None or route.kind in kinds)
+            ]
+            if not candidates:
+                return None
+            now = time.monotonic()
+            ready = [route for route in candidates if self.available(route, now)]
+            preferred = self.get(prefer) if prefer else None
+            if preferred is not None and preferred in ready:
+                route = preferred
+            elif not ready:
+                route = min(candidates, key=lambda item: item.cooldown_until)
+            elif self.strategy == "round-robin":
+                route = ready[next(self._cursor) % len(ready)]
+            elif single:
+                route = min(ready, key=lambda item: (item.requests, item.last_assigned))
+            else:
+                route = min(ready, key=lambda item: (item.active, item.requests, item.last_assigned))
+            if single:
+                route.requests += 1
+            else:
+                route.active += 1
+            route.last_assigned = now
+            return route
+
+    def release(self, route: Optional[Route], single: bool = False) -> None:
+        if route is None:
+            return
+        with self._lock:
+            if single:
+                route.requests = max(0, route.requests - 1)
+            else:
+                route.active = max(0, route.active - 1)
+
+    def _sync(self) -> None:
+        shared = self.shared
+        now = time.monotonic()
+        if shared is None or now - self._synced < SHARED_SYNC_INTERVAL:
+            return
+        self._synced = now
+        self.apply_cooldowns(shared.cooldowns() or {})
+
+    def _share(self, route: Route) -> None:
+        # called without the lock: the shared pool may live in another process
+        if self.shared is not None:
+            self.shared.report({route.spec: {"throttled": True}})
+
+    def cooldowns(self) -> Dict[str, list]:
+        """[seconds left, waiting for a check] of every route that is out of rotation, by spec."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                route.spec: [round(max(0.0, route.cooldown_until - now), 3), route.needs_check]
+                for route in self.routes
+                if not self.available(route, now)
+            }
+
+    def apply_cooldowns(self, cooldowns: Dict[str, list]) -> None:
+        """Take over the cooldowns of the shared pool (see cooldowns), which also runs the health checks."""
+        now = time.monotonic()
+        with self._lock:
+            for route in self.routes:
+                remaining, needs_check = cooldowns.get(route.spec) or (0.0, False)
+                route.cooldown_until = max(route.cooldown_until, now + float(remaining))
+                route.needs_check = bool(needs_check)
+
+    def _cool_down(self, route: Route, retry_after: float = 0.0) -> None:
+        # called with the lock held
+        route.strikes += 1
+        pause = min(MAX_COOLDOWN, self.cooldown * 2 ** (route.strikes - 1))
+        route.cooldown_until = time.monotonic() + max(pause, retry_after)
+        route.needs_check = bool(self.probe_url)
+
+    def record(self, route: Route, size: int, seconds: float) -> bool:
+        """Account a finished transfer; True if it was too slow and throttled the route."""
+        with self._lock:
+            route.bytes += size
+            route.failures = 0
+            if size < MIN_SAMPLE_BYTES or seconds <= 0:
+                return False
+            rate = size / seconds
+            route.speed = rate if not route.speed else route.speed + SPEED_SMOOTHING * (rate - route.speed)
+            if not self.min_speed or rate >= self.min_speed:
+                route.strikes = 0
+                return False
+            route.throttles += 1
+            self._cool_down(route)
+        self._share(route)
+        return True
+
+    def throttle(self, route: Route, retry_after: float = 0.0) -> None:
+        with self._lock:
+            route.throttles += 1
+            self._cool_down(route, retry_after)
+        self._share(route)
+
+    def failed(self, route: Route) -> None:
+        with self._lock:
+            route.failures += 1
+            if route.failures < FAILURES_BEFORE_COOLDOWN:
+                return
+            route.failures = 0
+            self._cool_down(route)
+        self._share(route)
+
+    def report(self, usage: Dict[str, dict]) -> None:
+        """Apply the per-route usage a job measured in another process (see attach)."""
+        for spec, item in (usage or {}).items():
+            route = self.get(spec)
+            if route is None:
+                continue
+            if item.get("bytes"):
+                self.record(route, int(item["bytes"]), float(item.get("seconds") or 0))
+            if item.get("throttled") and self.available(route, time.monotonic()):
+                self.throttle(route)
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [route.as_dict() for route in self.routes]
+
+    def check(self, route: Route) -> bool:
+        """Fetch the probe URL through route; a pass returns it to rotation, a failure cools it down."""
+        params = dict(route.ydl_options(), quiet=True, no_warnings=True, socket_timeout=10)
+        proxies = route.request_proxies() if route.kind in PER_REQUEST_KINDS else None
+        try:
+            with yt_dlp.YoutubeDL(params) as ydl:
+                response = ydl.urlopen(Request(self.probe_url, proxies=proxies))
+                response.read(1024)
+                response.close()
+        except HTTPError as exc:
+            if exc.status in THROTTLE_STATUSES:
+                self.throttle(route, _retry_after(exc))
+                return False
+            # any HTTP answer means the route itself works
+        except Exception:
+            with self._lock:
+                self._cool_down(route)
+            return False
+        with self._lock:
+            route.needs_check = False
+            route.failures = 0
+        return True
+
+    def start_checks(self, interval: float = CHECK_INTERVAL) -> None:
+        """Probe every route once, then re-check cooled-down routes when their cooldown ends."""
+        if not self.probe_url or self._checker is not None or not self.routes:
+            return
+
+        def loop() -> None:
+            for route in list(self.routes):
+                if self._closed.is_set():
+                    return
+                self.check(route)
+            while not self._closed.wait(interval):
+                now = time.monotonic()
+                for route in list(self.routes):
+                    if route.needs_check and route.cooldown_until <= now:
+                        self.check(route)
+
+        self._checker = threading.Thread(target=loop, name="route-checks", daemon=True)
+        self._checker.start()
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def attach(self, ydl: yt_dlp.YoutubeDL, route: Optional[Route], usage: Dict[str, dict]) -> None:
+        """Route and measure every request of ydl; per-route bytes, seconds and throttles go into usage."""
+        urlopen = ydl.urlopen
+        spread = self.scope == "request" and any(item.kind in PER_REQUEST_KINDS for item in self.routes)
+
+        def routed_urlopen(req):
+            if isinstance(req, str):
+                req = Request(req)
+            if not isinstance(req, Request):
+                return urlopen(req)
+            per_request = spread and not _bound_to_address(req.url)
+            if route is None and not per_request:
+                return urlopen(req)
+            tried: List[Route] = []
+            while True:
+                chosen = route
+                if per_request:
+                    chosen = self.acquire(exclude=tried, kinds=PER_REQUEST_KINDS, single=True)
+                    if chosen is None:
+                        return urlopen(req)
+                    req = req.copy()
+                    req.proxies = chosen.request_proxies()
+                    tried.append(chosen)
+                sent = time.monotonic()
+                try:
+                    response = urlopen(req)
+                except HTTPError as exc:
+                    if exc.status in THROTTLE_STATUSES:
+                        self.throttle(chosen, _retry_after(exc))
+                        usage.setdefault(chosen.spec, {})["throttled"] = True
+                    if per_request:
+                        self.release(chosen, single=True)
+                    if not per_request or exc.status not in THROTTLE_STATUSES:
+                        raise
+                    continue
+                except TransportError:
+                    self.failed(chosen)
+                    if not per_request:
+                        raise
+                    self.release(chosen, single=True)
+                    continue
+                return Response(
+                    _Metered(response, sent, lambda size, seconds, used=chosen: self._finished(
+                        used, size, seconds, usage, per_request)),
+                    response.url,
+                    response.headers,
+                    response.status,
+                    response.reason,
+                )
+
+        ydl.urlopen = routed_urlopen
+
+    def _finished(self, route: Route, size: int, seconds: float, usage: Dict[str, dict], per_request: bool) -> None:
+        item = usage.setdefault(route.spec, {})
+        item["bytes"] = item.get("bytes", 0) + size
+        item["seconds"] = round(item.get("seconds", 0.0) + seconds, 3)
+        if self.record(route, size, seconds):
+            item["throttled"] = True
+        if per_request:
+            self.release(route, single=True)
+
+
+def _retry_after(exc: HTTPError) -> float:
+    try:
+        return max(0.0, float(exc.response.headers.get("Retry-After") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Metered:
+    """Response body that reports its size and transfer time once it is read or closed."""
+
+    def __init__(self, response: Response, sent: float, on_done):
+        self._response = response
+        self._sent = sent
+        self._on_done = on_done
+        self._size = 0
+        self._done = False
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        data = self._response.read(amt)
+        self._size += len(data)
+        if not data or amt is None or amt < 0:
+            self._finish()
+        return data
+
+    def _finish(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        self._on_done(self._size, time.monotonic() - self._sent)
+
+    def close(self) -> None:
+        self._finish()
+        self._response.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._done
@@ -0,0 +1,239 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+PRIORITY_CLASSES = ["high", "normal", "low"]
+_PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITY_CLASSES)}
+# a job in one of these states never runs again
+FINAL_STATES = ("done", "error", "stopped", "cancelled")
+
+
+def normalize_priority(priority: Optional[str]) -> str:
+    priority = priority.strip().lower() if isinstance(priority, str) else ""
+    return priority if priority in _PRIORITY_RANK else "normal"
+
+
+class Job:
+    """One queued download: the worker options plus its scheduling state.
+
+    resume_state is handed to every worker that runs the job, so a job that was
+    preempted keeps its reserved file names and skips entries it already
+    finished when it runs again.
+    """
+
+    def __init__(self, job_id: int, url: str, options: dict, priority: str, seq: int):
+        self.job_id = job_id
+        self.url = url
+        self.options = options
+        self.priority = normalize_priority(priority)
+        self.seq = seq
+        self.state = "queued"
+        self.created = time.time()
+        self.preemptions = 0
+        self.resume_state: dict = {}
+        self.stats: dict = {}
+        # ID in the shared job store this job was claimed from, None for local jobs
+        self.shared_id: Optional[int] = None
+
+    def rank(self) -> Tuple[int, int]:
+        return _PRIORITY_RANK[self.priority], self.seq
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.job_id,
+            "url": self.url,
+            "priority": self.priority,
+            "state": self.state,
+            "created": self.created,
+            "preemptions": self.preemptions,
+            "stats": self.stats,
+            "shared_id": self.shared_id,
+        }
+
+
+class JobScheduler:
+    """Priority queue of jobs with a fixed number of run slots.
+
+    Jobs run highest priority class first and first-come first-served within a
+    class. With preemption enabled, a waiting job that outranks a running one
+    marks the lowest-ranked running job for preemption; the caller stops it and
+    hands it back through requeue() once it has released its slot.
+    Thread-safe; on_change is called after every state change.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        preemption: bool = False,
+        on_change: Optional[Callable[[], None]] = None,
+    ):
+        self.max_concurrent = max(1, int(max_concurrent or 1))
+        self.preemption = preemption
+        self.on_change = on_change
+        self._lock = threading.RLock()
+        self._queue: List[Tuple[Tuple[int, int], int]] = []
+        self._jobs: Dict[int, Job] = {}
+        self._running: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            try:
+                self.on_change()
+            except Exception:
+                pass
+
+    def submit(self, url: str, options: dict, priority: str = "normal") -> Job:
+        with self._lock:
+            job = Job(next(self._ids), url, options, priority, next(self._seq))
+            self._jobs[job.job_id] = job
+            heapq.heappush(self._queue, (job.rank(), job.job_id))
+        self._changed()
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.state == "queued")
+
+    def running(self) -> List[Job]:
+        with self._lock:
+            return list(self._running.values())
+
+    def paused(self) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if job.state == "paused"]
+
+    def set_priority(self, job_id: int, priority: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state in FINAL_STATES:
+                return False
+            job.priority = normalize_priority(priority)
+            if job.state == "queued":
+                self._rebuild_queue()
+        self._changed()
+        return True
+
+    def cancel(self, job_id: int) -> Optional[Job]:
+        """Cancel a job. Queued jobs are dropped; running jobs are returned for the caller to stop."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.state in ("queued", "paused"):
+                job.state = "cancelled"
+                self._rebuild_queue()
+            elif job.state in ("running", "preempting", "pausing"):
+                job.state = "cancelling"
+        self._changed()
+        return job
+
+    def pause(self, job_id: int) -> Optional[Job]:
+        """Pause one job. Queued jobs wait until resume(); running jobs are returned for the caller to pause."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state in FINAL_STATES or job.state == "cancelling":
+                return None
+            if job.state == "queued":
+                job.state = "paused"
+                self._rebuild_queue()
+            elif job.state in ("running", "preempting"):
+                job.state = "pausing"
+        self._changed()
+        return job
+
+    def pump(self) -> Tuple[List[Job], List[Job]]:
+        """Fill free slots; return (jobs to start, jobs to preempt)."""
+        to_start: List[Job] = []
+        to_preempt: List[Job] = []
+        with self._lock:
+            while self._queue and len(self._running) < self.max_concurrent:
+                _rank, job_id = heapq.heappop(self._queue)
+                job = self._jobs.get(job_id)
+                if job is None or job.state != "queued":
+                    continue
+                job.state = "running"
+                self._running[job_id] = job
+                to_start.append(job)
+
+            head = self._peek()
+            if self.preemption and head is not None and len(self._running) >= self.max_concurrent:
+                if not any(job.state == "preempting" for job in self._running.values()):
+                    candidates = [job for job in self._running.values() if job.state == "running"]
+                    if candidates:
+                        victim = max(candidates, key=lambda job: job.rank())
+                        if victim.rank()[0] > head.rank()[0]:
+                            victim.state = "preempting"
+                            victim.preemptions += 1
+                            to_preempt.append(victim)
+        if to_start or to_preempt:
+            self._changed()
+        return to_start, to_preempt
+
+    def requeue(self, job_id: int) -> None:
+        """Put a stopped (preempted) job back into the queue at its original position."""
+        with self._lock:
+            job = self._running.pop(job_id, None) or self._jobs.get(job_id)
+            if job is None:
+                return
+            job.state = "queued"
+            heapq.heappush(self._queue, (job.rank(), job.job_id))
+        self._changed()
+
+    def mark_paused(self, job_id: int) -> None:
+        """Release the slot of a job that paused itself; it waits until resume()."""
+        self.finish(job_id, "paused")
+
+    def resume(self, job_id: int) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "paused":
+                return False
+        self.requeue(job_id)
+        return True
+
+    def finish(self, job_id: int, state: str) -> None:
+        with self._lock:
+            job = self._running.pop(job_id, None) or self._jobs.get(job_id)
+            if job is None:
+                return
+            job.state = state
+        self._changed()
+
+    def forget_finished(self, keep: int = 200) -> None:
+        """Drop all but the newest keep finished jobs so long sessions do not accumulate them."""
+        with self._lock:
+            finished = [
+                job for job in self._jobs.values()
+                if job.state in FINAL_STATES
+            ]
+            if len(finished) <= keep:
+                return
+            finished.sort(key=lambda job: job.seq)
+            for job in finished[: len(finished) - keep]:
+                del self._jobs[job.job_id]
+
+    def _peek(self) -> Optional[Job]:
+        while self._queue:
+            job = self._jobs.get(self._queue[0][1])
+            if job is not None and job.state == "queued":
+                return job
+            heapq.heappop(self._queue)
+        return None
+
+    def _rebuild_queue(self) -> None:
+        self._queue = [
+            (job.rank(), job.job_id) for job in self._jobs.values() if job.state == "queued"
+        ]
+        heapq.heapify(self._queue)
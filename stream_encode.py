@@ -0,0 +1,145 @@
+import os
+import re
+import subprocess
+import tempfile
+import time
+from typing import Callable, Dict, Optional
+
+import yt_dlp
+
+import transcode
+
+STREAM_PROTOCOLS = ("http", "https")
+# containers ffmpeg can read front to back from a pipe
+PIPEABLE_EXTS = ("webm", "mka", "mp3", "ogg", "opus", "aac", "flac", "wav")
+# ranged requests of this size avoid the throttling YouTube applies to long single requests
+CHUNK_BYTES = 10 * 1024 * 1024
+READ_BYTES = 256 * 1024
+
+_CONTENT_RANGE = re.compile(r"bytes\s+\d+-\d+/(\d+)")
+
+
+class StreamUnavailable(Exception):
+    """The source could not be streamed into ffmpeg; no output was left behind and the normal download path can be used."""
+
+
+def can_stream(info: dict) -> bool:
+    """True for a single http(s) stream in a container that ffmpeg can read from a pipe."""
+    if info.get("requested_formats") or not info.get("url"):
+        return False
+    if info.get("protocol") not in STREAM_PROTOCOLS:
+        return False
+    ext = (info.get("ext") or "").lower()
+    if ext in PIPEABLE_EXTS:
+        return True
+    # fragmented (DASH) MP4 is read in order; a progressive MP4 may keep its index (moov) at the end
+    return ext in ("m4a", "mp4") and str(info.get("container") or "").endswith("_dash")
+
+
+def metadata_for(info: dict) -> Dict[str, str]:
+    """Tags yt-dlp's FFmpegMetadata step would write, for encodes that bypass it."""
+    fields = {
+        "title": info.get("track") or info.get("title"),
+        "artist": info.get("artist") or info.get("creator") or info.get("uploader"),
+        "album": info.get("album"),
+        "date": info.get("release_date") or info.get("upload_date"),
+        "comment": info.get("webpage_url"),
+        "track": info.get("track_number"),
+    }
+    return {key: str(value) for key, value in fields.items() if value not in (None, "")}
+
+
+def _open_range(ydl: yt_dlp.YoutubeDL, info: dict, start: int, end: Optional[int]):
+    headers = dict(info.get("http_headers") or {})
+    headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+    return ydl.urlopen(yt_dlp.networking.Request(info["url"], headers=headers))
+
+
+def stream_to_encoder(
+    ydl: yt_dlp.YoutubeDL,
+    info: dict,
+    ffmpeg: str,
+    target: str,
+    path: str,
+    on_progress: Callable[[float, float, float], None],
+    **build_kwargs,
+) -> str:
+    """Download info's stream straight into ffmpeg's stdin and encode it to path.
+
+    Only the encoded file is written (to a temporary name, renamed when ffmpeg
+    succeeds). on_progress(downloaded, total, speed) is called per read and
+    may raise to abort; the partial output is then removed. Raises
+    StreamUnavailable if a request fails or ffmpeg rejects the piped input.
+    """
+    total = float(info.get("filesize") or 0)
+    try:
+        response = _open_range(ydl, info, 0, CHUNK_BYTES - 1)
+    except Exception as exc:
+        raise StreamUnavailable(str(exc)) from exc
+    match = _CONTENT_RANGE.match(response.headers.get("Content-Range") or "")
+    if match:
+        total = float(match.group(1))
+    elif not total:
+        total = float(response.headers.get("Content-Length") or 0)
+    ranged = match is not None
+
+    stem, ext = os.path.splitext(path)
+    work = f"{stem}.temp{ext}"
+    cmd = transcode.build_command(ffmpeg, "pipe:0", {target: work}, **build_kwargs)
+    errors = tempfile.TemporaryFile()
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors)
+
+    downloaded = 0
+    started = time.monotonic()
+    try:
+        while True:
+            try:
+                data = response.read(READ_BYTES)
+                if not data:
+                    response.close()
+                    if not ranged or (total and downloaded >= total):
+                        break
+                    response = _open_range(ydl, info, downloaded, downloaded + CHUNK_BYTES - 1)
+                    continue
+            except (yt_dlp.networking.exceptions.RequestError, OSError) as exc:
+                # e.g. a later range answered 403; the partial output is removed below
+                raise StreamUnavailable(str(exc)) from exc
+            try:
+                process.stdin.write(data)
+            except BrokenPipeError:
+                # ffmpeg gave up; its own error is reported below
+                break
+            downloaded += len(data)
+            elapsed = time.monotonic() - started
+            on_progress(downloaded, total, downloaded / elapsed if elapsed else 0.0)
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        response.close()
+        returncode = process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        response.close()
+        errors.close()
+        _remove(work)
+        raise
+
+    if returncode != 0:
+        errors.seek(0)
+        message = errors.read().decode("utf-8", "replace").strip().splitlines()
+        errors.close()
+        _remove(work)
+        raise StreamUnavailable(message[-1] if message else f"ffmpeg exited with {returncode}")
+    errors.close()
+    os.replace(work, path)
+    return path
+
+
+def _remove(path: str) -> None:
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
@@ -0,0 +1,88 @@
+import gc
+import os
+import sys
+import time
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process in bytes (0 if it cannot be read)."""
+    if psutil is not None:
+        try:
+            return int(psutil.Process().memory_info().rss)
+        except Exception:
+            pass
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return int(counters.WorkingSetSize)
+        except Exception:
+            pass
+    try:
+        import resource
+
+        # peak, not current, but the best the platform offers without psutil
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:
+        return 0
+
+
+def object_count() -> int:
+    return len(gc.get_objects())
+
+
+class JobTelemetry:
+    """RSS and live object counts of one job: at start, at the end and the peak in between."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.rss_start = rss_bytes()
+        self.objects_start = object_count()
+        self.rss_peak = self.rss_start
+
+    def sample(self) -> None:
+        self.rss_peak = max(self.rss_peak, rss_bytes())
+
+    def finish(self) -> dict:
+        rss = rss_bytes()
+        objects = object_count()
+        self.rss_peak = max(self.rss_peak, rss)
+        mb = 1024 * 1024
+        return {
+            "seconds": round(time.time() - self.started, 1),
+            "rss_mb": round(rss / mb, 1),
+            "rss_delta_mb": round((rss - self.rss_start) / mb, 1),
+            "rss_peak_mb": round(self.rss_peak / mb, 1),
+            "objects": objects,
+            "objects_delta": objects - self.objects_start,
+        }
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import subprocess
+import threading
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import utils
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+
+
+def thumbnail_urls(info: dict) -> List[str]:
+    """Thumbnail URLs of an info dict, best first (yt-dlp sorts thumbnails worst to best).
+
+    The best ones often do not exist (e.g. YouTube's maxresdefault), so the
+    rest are kept as fallbacks.
+    """
+    urls = []
+    for thumb in reversed(info.get("thumbnails") or []):
+        if isinstance(thumb, dict) and thumb.get("url") and thumb["url"] not in urls:
+            urls.append(thumb["url"])
+    if info.get("thumbnail") and info["thumbnail"] not in urls:
+        urls.append(info["thumbnail"])
+    return urls
+
+
+def _download(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+class ThumbnailCache:
+    """Fetch every thumbnail URL once, shrink it with ffmpeg and keep it on disk.
+
+    Requests for a URL that is already being fetched share the same future, and
+    images with identical content are stored once, so playlists whose entries
+    share artwork only download and re-encode it a single time.
+    """
+
+    def __init__(self, root: str, ffmpeg: str, max_size: int = 1280, workers: int = 4):
+        self.root = root
+        self.max_size = max(0, int(max_size or 0))
+        self.ffmpeg = ffmpeg
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="thumbnails")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        utils.ensure_dir(self.root)
+
+    def submit(self, urls: List[str], opener: Optional[Callable[[str], bytes]] = None) -> Future:
+        """Start (or join) the fetch of the first of urls that works; the future yields a local image path or None.
+
+        opener(url) returns the body of url (e.g. through YoutubeDL.urlopen, so
+        proxies and cookies apply); without it the image is fetched directly.
+        """
+        key = urls[0]
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or (future.done() and future.result() is None):
+                future = self._pool.submit(self._fetch_first, list(urls), opener or _download)
+                self._futures[key] = future
+            return future
+
+    def _fetch_first(self, urls: List[str], opener: Callable[[str], bytes]) -> Optional[str]:
+        for url in urls:
+            path = self._fetch(url, opener)
+            if path:
+                return path
+        return None
+
+    def _url_key(self, url: str) -> str:
+        return hashlib.sha1(f"{url}|{self.max_size}".encode("utf-8")).hexdigest()
+
+    def _fetch(self, url: str, opener: Callable[[str], bytes]) -> Optional[str]:
+        link = os.path.join(self.root, self._url_key(url) + ".url")
+        try:
+            with open(link, "r", encoding="utf-8") as handle:
+                cached = os.path.join(self.root, handle.read().strip())
+            if os.path.isfile(cached):
+                return cached
+        except Exception:
+            pass
+
+        try:
+            data = opener(url)
+        except Exception:
+            return None
+        if not data:
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        name = f"{digest}_{self.max_size}.jpg"
+        processed = os.path.join(self.root, name)
+        if not os.path.isfile(processed) and not self._process(data, digest, processed):
+            return None
+
+        try:
+            with open(link, "w", encoding="utf-8") as handle:
+                handle.write(name)
+        except Exception:
+            pass
+        return processed
+
+    def _process(self, data: bytes, digest: str, target: str) -> bool:
+        source = os.path.join(self.root, f"{digest}.src")
+        temp_target = f"{target}.tmp.jpg"
+        try:
+            with open(source, "wb") as handle:
+                handle.write(data)
+            cmd = [self.ffmpeg, "-y", "-loglevel", "error", "-i", source]
+            if self.max_size:
+                cmd += [
+                    "-vf",
+                    f"scale='min(iw,{self.max_size})':'min(ih,{self.max_size})'"
+                    ":force_original_aspect_ratio=decrease",
+                ]
+            cmd += ["-frames:v", "1", "-q:v", "3", temp_target]
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            os.replace(temp_target, target)
+            return True
+        except Exception:
+            return False
+        finally:
+            for path in (source, temp_target):
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except Exception:
+                    pass
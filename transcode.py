@@ -0,0 +1,191 @@
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import audio_filters
+import encoding
+
+# how often a running ffmpeg checks whether its job was cancelled
+CANCEL_POLL_SECONDS = 0.25
+
+
+class TranscodeCancelled(Exception):
+    """The job was stopped while ffmpeg ran; ffmpeg was killed and its partial outputs removed."""
+
+# ffmpeg output settings per output target (lowercase FORMAT_OPTIONS entries).
+# "codec" is the key used for encoding presets, "cover" marks containers that
+# can carry an attached picture, "video" keeps the first video stream.
+OUTPUT_TARGETS: Dict[str, Dict] = {
+    "mp3": {"ext": "mp3", "codec": "mp3", "args": ["-c:a", "libmp3lame", "-id3v2_version", "3"], "bitrate": True, "cover": True},
+    "m4a": {"ext": "m4a", "codec": "m4a", "args": ["-c:a", "aac"], "bitrate": True, "cover": True},
+    "aac": {"ext": "aac", "codec": "aac", "args": ["-c:a", "aac", "-f", "adts"], "bitrate": True, "cover": False},
+    "opus": {"ext": "opus", "codec": "opus", "args": ["-c:a", "libopus"], "bitrate": True, "cover": False},
+    "wav": {"ext": "wav", "codec": "wav", "args": ["-c:a", "pcm_s16le"], "bitrate": False, "cover": False},
+    "flac": {"ext": "flac", "codec": "flac", "args": ["-c:a", "flac"], "bitrate": False, "cover": True},
+    "alac": {"ext": "m4a", "codec": "alac", "args": ["-c:a", "alac"], "bitrate": False, "cover": True},
+    "ogg": {"ext": "ogg", "codec": "vorbis", "args": ["-c:a", "libvorbis"], "bitrate": True, "cover": False},
+    "mp4": {"ext": "mp4", "codec": "mp4", "args": ["-c:v", "copy", "-c:a", "aac"], "bitrate": True, "cover": False, "video": True},
+    "best audio (no convert)": {"ext": "mka", "codec": None, "args": ["-c:a", "copy"], "bitrate": False, "cover": False},
+}
+
+
+def output_paths(source: str, targets: Sequence[str], keep_source: bool = False) -> Dict[str, str]:
+    """Derive one output path per target next to source, avoiding extension clashes.
+
+    Unless keep_source is set, a target may take over the source's own path;
+    transcode() writes it to a temporary name first and replaces the source
+    once ffmpeg is done.
+    """
+    base, _ext = os.path.splitext(source)
+    paths: Dict[str, str] = {}
+    used = {os.path.normcase(os.path.abspath(source))} if keep_source else set()
+    for target in targets:
+        spec = OUTPUT_TARGETS[target]
+        path = f"{base}.{spec['ext']}"
+        if os.path.normcase(os.path.abspath(path)) in used:
+            path = f"{base}.{spec['codec'] or 'audio'}.{spec['ext']}"
+        used.add(os.path.normcase(os.path.abspath(path)))
+        paths[target] = path
+    return paths
+
+
+def build_command(
+    ffmpeg: str,
+    source: str,
+    outputs: Dict[str, str],
+    *,
+    quality: int = 192,
+    preset: str = "balanced",
+    threads: int = 1,
+    thumbnail: Optional[str] = None,
+    audio_filter: str = "",
+    metadata: Optional[Dict[str, str]] = None,
+) -> List[str]:
+    """Build a single ffmpeg invocation that decodes source once and writes every output.
+
+    With audio_filter, the filter chain runs once and its result is split to
+    every re-encoded output; stream-copy outputs keep the untouched audio.
+    metadata tags are written to every output on top of the source's own.
+    """
+    cmd = [ffmpeg, "-y", "-loglevel", "error", "-i", source]
+    if thumbnail:
+        cmd += ["-i", thumbnail]
+
+    filtered = [target for target in outputs if audio_filter and OUTPUT_TARGETS[target]["codec"]]
+    if filtered:
+        labels = "".join(f"[a{index}]" for index in range(len(filtered)))
+        cmd += ["-filter_complex", f"[0:a:0]{audio_filter},asplit={len(filtered)}{labels}"]
+
+    for target, path in outputs.items():
+        spec = OUTPUT_TARGETS[target]
+        if spec.get("video"):
+            cmd += ["-map", "0:v:0"]
+        audio = f"[a{filtered.index(target)}]" if target in filtered else "0:a:0"
+        cmd += ["-map", audio, "-map_metadata", "0"]
+        for key, value in (metadata or {}).items():
+            cmd += ["-metadata", f"{key}={value}"]
+        if thumbnail and spec["cover"]:
+            cmd += ["-map", "1:v:0", "-c:v", "mjpeg", "-disposition:v:0", "attached_pic"]
+        cmd += spec["args"]
+        if spec["bitrate"]:
+            cmd += ["-b:a", f"{int(quality)}k"]
+        if spec["codec"]:
+            cmd += encoding.encoder_args(spec["codec"], preset, threads)
+        cmd.append(path)
+    return cmd
+
+
+def _run(cmd: List[str], cancel: Optional[threading.Event] = None) -> Tuple[int, str]:
+    """Run ffmpeg; return (exit code, stderr). Kills it and raises TranscodeCancelled once cancel is set."""
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    while True:
+        try:
+            _stdout, stderr = process.communicate(timeout=CANCEL_POLL_SECONDS)
+            return process.returncode, stderr or ""
+        except subprocess.TimeoutExpired:
+            if cancel is not None and cancel.is_set():
+                process.kill()
+                process.communicate()
+                raise TranscodeCancelled()
+
+
+def _remove(paths) -> None:
+    for path in paths:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception:
+            pass
+
+
+def transcode(
+    ffmpeg: str,
+    source: str,
+    targets: Sequence[str],
+    keep_source: bool = False,
+    trim_silence: bool = False,
+    cancel: Optional[threading.Event] = None,
+    **kwargs,
+) -> Dict[str, str]:
+    """Produce all targets from source in one ffmpeg run; return target -> path.
+
+    With trim_silence, a silencedetect pass over source comes first and the
+    resulting atrim is put in front of audio_filter.
+    """
+    outputs = output_paths(source, targets, keep_source)
+    if not outputs:
+        return {}
+    work = dict(outputs)
+    source_key = os.path.normcase(os.path.abspath(source))
+    for target, path in outputs.items():
+        if os.path.normcase(os.path.abspath(path)) == source_key:
+            stem, ext = os.path.splitext(path)
+            work[target] = f"{stem}.temp{ext}"
+    if trim_silence:
+        detect = [
+            ffmpeg, "-hide_banner", "-nostats", "-i", source,
+            "-map", "0:a:0", "-af", audio_filters.silence_detect_filter(), "-f", "null", "-",
+        ]
+        returncode, log = _run(detect, cancel)
+        # an analysis failure leaves the edges untouched; the conversion reports real problems
+        trim = audio_filters.edge_trim(log) if returncode == 0 else ""
+        kwargs["audio_filter"] = ",".join(item for item in (trim, kwargs.get("audio_filter")) if item)
+    cmd = build_command(ffmpeg, source, work, **kwargs)
+    try:
+        returncode, stderr = _run(cmd, cancel)
+    except TranscodeCancelled:
+        _remove(work.values())
+        raise
+    if returncode != 0:
+        _remove(work.values())
+        message = stderr.strip().splitlines()
+        raise RuntimeError(message[-1] if message else f"ffmpeg exited with {returncode}")
+    for target, path in work.items():
+        if path != outputs[target]:
+            os.replace(path, outputs[target])
+    return outputs
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers: int = 0) -> ThreadPoolExecutor:
+    """Shared pool for transcode runs, so conversion overlaps with the next download.
+
+    The size is fixed by the first call; 0 derives it from the CPU count.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            size = int(workers or 0) or max(1, encoding.cpu_count() // 2)
+            _pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="transcode")
+        return _pool
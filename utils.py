@@ -1,8 +1,11 @@
 import re
 import os
+import errno
 import shutil
+import tempfile
 import platform
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Any
+from urllib.parse import parse_qs, urlsplit
 
 def sanitize_filename(name: str, replace_with: str = "_") -> str:
     """Remove filesystem-problematic characters and trim length."""
@@ -57,6 +60,59 @@ def bytes_free(path: str) -> int:
     except Exception:
         return 0
 
+def same_filesystem(first: str, second: str) -> bool:
+    """True if both existing paths live on the same filesystem (a rename between them is atomic)."""
+    try:
+        return os.stat(first).st_dev == os.stat(second).st_dev
+    except OSError:
+        return False
+
+def _place(source: str, target: str) -> None:
+    """Rename source to target on the same filesystem; FileExistsError instead of replacing a file there."""
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        raise
+    except OSError as exc:
+        if exc.errno == errno.EXDEV:
+            raise
+        # no hard links here (e.g. FAT or some SMB shares): check, then rename
+        if os.path.lexists(target):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), target)
+        os.replace(source, target)
+        return
+    os.remove(source)
+
+def publish_file(source: str, target: str) -> str:
+    """Move a finished file to target without exposing a partial file there.
+
+    A rename on the same filesystem; otherwise a copy to a hidden name next to
+    target, renamed once complete. A file that already is at target (e.g.
+    written by another instance) is never replaced: FileExistsError is raised
+    and source stays where it is.
+    """
+    folder = os.path.dirname(target) or "."
+    ensure_dir(folder)
+    try:
+        _place(source, target)
+        return target
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+    fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".publish", dir=folder)
+    os.close(fd)
+    try:
+        shutil.copy2(source, temp_path)
+        _place(temp_path, target)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    os.remove(source)
+    return target
+
 def format_bytes(num: int) -> str:
     """Pretty print bytes (e.g., 123456 -> '120.56 KB')."""
     try:
@@ -69,6 +125,18 @@ def format_bytes(num: int) -> str:
         num /= 1024.0
     return f"{num:.2f} PB"
 
+def format_duration(seconds: float) -> str:
+    """Seconds as "mm:ss" or "h:mm:ss"."""
+    try:
+        seconds = int(max(0, float(seconds)))
+    except Exception:
+        return "00:00"
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
 def ensure_dir(path: str) -> bool:
     """Ensure a directory exists; return True on success."""
     try:
@@ -95,21 +163,128 @@ def estimate_total_size_from_entries(entries: List[Dict]) -> int:
             continue
     return total
 
+def iter_playlist_entries(entries: Any, page_size: int = 50) -> Iterator[Dict]:
+    """Yield playlist entries one by one without materializing the whole list."""
+    if entries is None:
+        return
+    if hasattr(entries, "getslice"):
+        # yt-dlp PagedList: fetch page by page instead of all at once
+        start = 0
+        while True:
+            page = entries.getslice(start, start + page_size)
+            if not page:
+                return
+            for entry in page:
+                yield entry
+            start += len(page)
+    else:
+        for entry in entries:
+            yield entry
+
+# googlevideo carries the expiry as a query parameter, or as a path segment in manifest URLs
+_EXPIRE_PATH = re.compile(r"/expire/(\d+)")
+
+def stream_expiry(info: Dict) -> Optional[float]:
+    """Earliest expiry (Unix time) of the selected stream URLs of an entry, None if they carry none."""
+    urls = [fmt.get("url") for fmt in info.get("requested_formats") or []] or [info.get("url")]
+    expiries = []
+    for url in urls:
+        if not url:
+            continue
+        value = parse_qs(urlsplit(url).query).get("expire", [None])[0]
+        match = _EXPIRE_PATH.search(url)
+        value = value or (match.group(1) if match else None)
+        try:
+            expiries.append(float(value))
+        except (TypeError, ValueError):
+            pass
+    return min(expiries) if expiries else None
+
+# per-entry fields that can be large and that this app never reads
+HEAVY_INFO_FIELDS = ("automatic_captions", "subtitles", "heatmap", "requested_subtitles")
+
+def prune_info(info: Dict, fields=HEAVY_INFO_FIELDS) -> Dict:
+    """Drop large fields from an info dict in place (and from its entries)."""
+    if not isinstance(info, dict):
+        return info
+    for field in fields:
+        info.pop(field, None)
+    entries = info.get("entries")
+    if isinstance(entries, list):
+        for entry in entries:
+            prune_info(entry, fields)
+    return info
+
+def prune_resolved(info: Dict, drop_thumbnails: bool = True) -> Dict:
+    """Shrink a resolved entry to what its download needs, in place.
+
+    formats is cut down to the selected format(s), so yt-dlp selects the same
+    ones again when the entry is downloaded; requested_formats and url stay.
+    """
+    if not isinstance(info, dict) or not info.get("format_id"):
+        return info
+    selected = info.get("requested_formats") or [
+        fmt for fmt in info.get("formats") or [] if fmt.get("format_id") == info["format_id"]
+    ]
+    if selected:
+        info["formats"] = list(selected)
+    if drop_thumbnails:
+        info.pop("thumbnails", None)
+    return info
+
+# yt-dlp format selectors per resolution label (lowercase); "<=" lets yt-dlp fall back gracefully
+VIDEO_FORMATS = {
+    "auto (best)": "bestvideo+bestaudio/best",
+    "360p": "bv[height<=360]+ba/best",
+    "480p": "bv[height<=480]+ba/best",
+    "720p": "bv[height<=720]+ba/best",
+    "1080p": "bv[height<=1080]+ba/best",
+    "1440p": "bv[height<=1440]+ba/best",
+    "2160p (4k)": "bv[height<=2160]+ba/best",
+}
+
 def get_video_format(res_label: str) -> str:
-    label = (res_label or "").strip().lower()
-    # mapping to safe <= patterns so yt-dlp falls back gracefully
-    mapping = {
-        "auto (best)": "bestvideo+bestaudio/best",
-        "360p": "bv[height<=360]+ba/best",
-        "480p": "bv[height<=480]+ba/best",
-        "720p": "bv[height<=720]+ba/best",
-        "1080p": "bv[height<=1080]+ba/best",
-        "1440p": "bv[height<=1440]+ba/best",
-        "2160p (4k)": "bv[height<=2160]+ba/best",
-    }
-    # normalize keys
-    for k, v in mapping.items():
-        if k == label:
-            return v
-    # fallback to best
-    return "bestvideo+bestaudio/best"
+    return VIDEO_FORMATS.get((res_label or "").strip().lower(), "bestvideo+bestaudio/best")
+
+def get_audio_source_format(quality: int) -> str:
+    """Audio-only stream with at least the target bitrate, else the best one as before.
+
+    Which stream counts as "best" comes from get_audio_source_sort.
+    """
+    return f"bestaudio[abr>={int(quality)}]/bestaudio/best"
+
+def get_audio_source_sort(quality: int) -> List[str]:
+    """format_sort for get_audio_source_format.
+
+    The original (or default) audio track ranks first, so a dubbed track is never
+    picked for its bitrate. Within it, "+abr:Q" ranks the smallest stream at or
+    above the target first, then the streams below it from the largest down.
+    """
+    return ["lang", f"+abr:{int(quality)}"]
+
+def estimated_format_size(fmt: Dict, duration: float = 0) -> float:
+    """filesize, filesize_approx or bitrate x duration of one format, 0 if unknown."""
+    try:
+        size = float(fmt.get("filesize") or fmt.get("filesize_approx") or 0)
+        if not size and duration:
+            size = float(fmt.get("abr") or fmt.get("tbr") or 0) * 1000 / 8 * float(duration)
+        return size
+    except (TypeError, ValueError):
+        return 0.0
+
+def source_bytes_saved(info: Dict) -> float:
+    """Bytes the selected audio stream saves against the best audio-only stream of the entry."""
+    if info.get("requested_formats"):
+        return 0.0
+    duration = info.get("duration") or 0
+    audio_only = [
+        fmt for fmt in info.get("formats") or []
+        if fmt.get("vcodec") == "none" and fmt.get("acodec") not in (None, "none")
+    ]
+    if not audio_only:
+        return 0.0
+    best = max(audio_only, key=lambda fmt: fmt.get("abr") or fmt.get("tbr") or 0)
+    chosen = estimated_format_size(info, duration)
+    if not chosen or best.get("format_id") == info.get("format_id"):
+        return 0.0
+    return max(0.0, estimated_format_size(best, duration) - chosen)
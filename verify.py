@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+VERIFY_MODES = ["off", "fast", "full"]
+MIN_BYTES = 1024
+# below this many bytes per second of audio a file cannot hold a usable stream (~8 kbps)
+MIN_BYTES_PER_SECOND = 1000
+DURATION_TOLERANCE = 2.0
+DURATION_TOLERANCE_RATIO = 0.01
+
+
+def find_ffprobe(ffmpeg: Optional[str]) -> Optional[str]:
+    """ffprobe next to the given ffmpeg binary, or the one in PATH."""
+    if ffmpeg:
+        folder, name = os.path.split(ffmpeg)
+        candidate = os.path.join(folder, name.replace("ffmpeg", "ffprobe"))
+        if candidate != ffmpeg and os.path.isfile(candidate):
+            return candidate
+    return shutil.which("ffprobe")
+
+
+class VerifyResult:
+    def __init__(self, path: str, entry_id: Optional[str], ok: bool, reason: str = ""):
+        self.path = path
+        self.entry_id = entry_id
+        self.ok = ok
+        self.reason = reason
+
+
+def probe(ffprobe: str, path: str) -> dict:
+    result = subprocess.run(
+        [
+            ffprobe, "-v", "error",
+            "-show_entries", "format=duration:stream=codec_type",
+            "-of", "json", path,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=60,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip() or "ffprobe failed")
+    return json.loads(result.stdout.decode("utf-8", "replace") or "{}")
+
+
+def check_file(
+    ffprobe: str,
+    path: str,
+    expected_duration: Optional[float] = None,
+    expect_video: bool = False,
+) -> str:
+    """Fast checks on one output file; returns "" if it looks complete, otherwise the reason."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return "file is missing"
+    if size < MIN_BYTES:
+        return f"file is only {size} bytes"
+
+    try:
+        data = probe(ffprobe, path)
+    except Exception as exc:
+        return f"ffprobe could not read the file ({exc})"
+
+    kinds = {stream.get("codec_type") for stream in data.get("streams") or []}
+    if "audio" not in kinds:
+        return "no audio stream"
+    if expect_video and "video" not in kinds:
+        return "no video stream"
+
+    try:
+        duration = float((data.get("format") or {}).get("duration") or 0)
+    except (TypeError, ValueError):
+        duration = 0.0
+    if expected_duration:
+        tolerance = max(DURATION_TOLERANCE, expected_duration * DURATION_TOLERANCE_RATIO)
+        if abs(duration - expected_duration) > tolerance:
+            return f"duration {duration:.1f}s, expected {expected_duration:.1f}s"
+    if duration and size < duration * MIN_BYTES_PER_SECOND:
+        return f"{size} bytes is too small for {duration:.0f}s"
+    return ""
+
+
+def decode_file(ffmpeg: str, path: str) -> str:
+    """Decode the whole file; returns "" if ffmpeg reported no errors."""
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-v", "error", "-xerror", "-i", path, "-f", "null", "-"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+    except Exception as exc:
+        return f"decode failed ({exc})"
+    errors = result.stderr.decode("utf-8", "replace").strip()
+    if result.returncode != 0 or errors:
+        return f"decode error: {errors.splitlines()[0] if errors else result.returncode}"
+    return ""
+
+
+class Verifier:
+    """Checks finished output files on a small thread pool while later downloads continue."""
+
+    def __init__(self, ffmpeg: str, ffprobe: str, full_decode: bool = False, workers: int = 2):
+        self.ffmpeg = ffmpeg
+        self.ffprobe = ffprobe
+        self.full_decode = full_decode
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="verify")
+
+    def submit(
+        self,
+        path: str,
+        entry_id: Optional[str] = None,
+        expected_duration: Optional[float] = None,
+        expect_video: bool = False,
+    ) -> Future:
+        return self._pool.submit(self._verify, path, entry_id, expected_duration, expect_video)
+
+    def _verify(self, path, entry_id, expected_duration, expect_video) -> VerifyResult:
+        reason = check_file(self.ffprobe, path, expected_duration, expect_video)
+        if not reason and self.full_decode:
+            reason = decode_file(self.ffmpeg, path)
+        return VerifyResult(path, entry_id, not reason, reason)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)